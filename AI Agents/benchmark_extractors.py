@@ -0,0 +1,79 @@
+"""
+Benchmark the registered PDF extraction engines on a local corpus of resumes
+
+Compares throughput (files/s, pages/s) and extracted character counts for
+each engine, both serially and with per-page parallelism.
+
+Usage: python benchmark_extractors.py path/to/resumes [--repeat 3]
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from document_extraction import PDF_ENGINES, count_pdf_pages, extract_pdf_pages_with, extract_pdf_pages
+
+
+def load_corpus(corpus_dir: str):
+    """Load every PDF in the directory into memory as (filename, bytes)"""
+    corpus = []
+    for name in sorted(os.listdir(corpus_dir)):
+        if name.lower().endswith(".pdf"):
+            with open(os.path.join(corpus_dir, name), "rb") as f:
+                corpus.append((name, f.read()))
+    return corpus
+
+
+def run_benchmark(label: str, extract, corpus, total_pages: int, repeat: int):
+    """Time an extraction function over the whole corpus and print one result row"""
+    chars = 0
+    failures = 0
+    best = None
+    for _ in range(repeat):
+        chars = 0
+        failures = 0
+        start = time.perf_counter()
+        for name, content in corpus:
+            try:
+                chars += sum(len(page) for page in extract(content))
+            except Exception as e:
+                failures += 1
+                print(f"  {label} failed on {name}: {e}")
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    files_per_sec = len(corpus) / best if best else 0
+    pages_per_sec = total_pages / best if best else 0
+    avg_chars = chars / max(len(corpus) - failures, 1)
+    print(f"{label:<28} {best:>9.3f} {files_per_sec:>9.1f} {pages_per_sec:>9.1f} {avg_chars:>11.0f} {failures:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF text extraction engines")
+    parser.add_argument("corpus", help="Directory containing sample resume PDFs")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per engine; the fastest is reported (default: 3)")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1),
+                        help="Processes used for parallel page extraction (default: CPU count, max 4)")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        print(f"No PDF files found in {args.corpus}")
+        return
+
+    total_pages = sum(count_pdf_pages(content) for _, content in corpus)
+    print(f"Corpus: {len(corpus)} PDFs, {total_pages} pages, best of {args.repeat} run(s)\n")
+    print(f"{'Engine':<28} {'Time (s)':>9} {'Files/s':>9} {'Pages/s':>9} {'Avg chars':>11} {'Failures':>8}")
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for engine in PDF_ENGINES:
+            run_benchmark(engine, lambda c, e=engine: extract_pdf_pages_with(e, c), corpus, total_pages, args.repeat)
+            run_benchmark(f"{engine} (parallel pages)",
+                          lambda c, e=engine: extract_pdf_pages_with(e, c, executor, args.workers),
+                          corpus, total_pages, args.repeat)
+
+        run_benchmark("default (with fallback)", extract_pdf_pages, corpus, total_pages, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
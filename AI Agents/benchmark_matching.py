@@ -0,0 +1,80 @@
+"""
+Benchmark packed multi-candidate matching against the single-candidate path
+
+Screens the same resumes against one job description twice - one model call
+per candidate, then token-budgeted packs - and compares model calls, estimated
+tokens per candidate and candidates per minute. Uses the live model, so it
+needs GOOGLE_API_KEY and costs real tokens.
+
+Usage: python benchmark_matching.py job_description.txt path/to/resume_jsons [--limit 20]
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import resume_matching
+from resume_matching import CandidateResume, create_jd_context, match_candidate, match_packed, matching_stats
+
+
+def load_candidates(resume_dir: str, limit: int):
+    """Load every parsed resume JSON file in the directory as a CandidateResume"""
+    candidates = []
+    for name in sorted(os.listdir(resume_dir)):
+        if name.lower().endswith(".json"):
+            with open(os.path.join(resume_dir, name), encoding="utf-8") as f:
+                resume_json = json.dumps(json.load(f))
+            candidates.append(CandidateResume(candidate_id=str(len(candidates) + 1), candidate_resume_json=resume_json))
+    return candidates[:limit] if limit else candidates
+
+
+async def run_path(label: str, screen, jd_context: str, candidates):
+    """Run one matching path over all candidates and print one result row"""
+    for key in matching_stats:
+        matching_stats[key] = 0
+    start = time.perf_counter()
+    results = await screen(jd_context, candidates)
+    elapsed = time.perf_counter() - start
+
+    succeeded = sum(1 for result in results if result.success)
+    calls = matching_stats["single_calls"] + matching_stats["packed_calls"]
+    tokens = matching_stats["prompt_tokens"] + matching_stats["output_tokens"]
+    per_candidate = tokens / succeeded if succeeded else 0
+    per_minute = succeeded / elapsed * 60 if elapsed else 0
+    print(f"{label:<10} {calls:>6} {matching_stats['pack_splits']:>7} {per_candidate:>13.0f} "
+          f"{per_minute:>12.1f} {elapsed:>9.1f} {len(results) - succeeded:>7}")
+    return per_candidate, per_minute
+
+
+async def single_path(jd_context: str, candidates):
+    return await asyncio.gather(*(match_candidate(jd_context, candidate) for candidate in candidates))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare packed and single-candidate resume matching")
+    parser.add_argument("job_description", help="Text file with the job description")
+    parser.add_argument("resumes", help="Directory of parsed resume JSON files")
+    parser.add_argument("--limit", type=int, default=0, help="Only screen the first N resumes")
+    args = parser.parse_args()
+
+    with open(args.job_description, encoding="utf-8") as f:
+        jd_context = create_jd_context(f.read())
+    candidates = load_candidates(args.resumes, args.limit)
+    if not candidates:
+        print(f"No resume JSON files found in {args.resumes}")
+        return
+
+    print(f"{len(candidates)} candidates, pack budget {resume_matching.MATCHING_PACK_INPUT_TOKENS} input / "
+          f"{resume_matching.MATCHING_PACK_OUTPUT_TOKENS} output tokens, max {resume_matching.MATCHING_PACK_MAX_CANDIDATES} per pack")
+    print(f"{'Path':<10} {'Calls':>6} {'Splits':>7} {'Tokens/cand.':>13} {'Cand./min':>12} {'Seconds':>9} {'Failed':>7}")
+    single_tokens, single_rate = await run_path("single", single_path, jd_context, candidates)
+    packed_tokens, packed_rate = await run_path("packed", match_packed, jd_context, candidates)
+
+    if single_tokens and packed_tokens and single_rate:
+        print(f"\nPacked mode: {packed_tokens / single_tokens:.0%} of the tokens per candidate, "
+              f"{packed_rate / single_rate:.1f}x the candidates per minute")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
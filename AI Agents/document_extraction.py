@@ -0,0 +1,197 @@
+import io
+import os
+import tempfile
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional, Union
+
+import docx2txt
+import pdfplumber
+import pymupdf
+from langchain_community.document_loaders import UnstructuredWordDocumentLoader
+
+# Raw uploaded file content - bytes, bytearray or a memoryview over either
+FileContent = Union[bytes, bytearray, memoryview]
+
+# PDF engine configuration
+PDF_ENGINE = os.getenv("PDF_ENGINE", "pymupdf")
+PDF_FALLBACK_ENGINE = os.getenv("PDF_FALLBACK_ENGINE", "pdfplumber")
+PDF_MIN_CHARS_PER_PAGE = int(os.getenv("PDF_MIN_CHARS_PER_PAGE", "100"))  # Below this the fallback engine is tried
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))  # Documents this long are split across processes
+
+# Registry of PDF text extraction engines: name -> function(content, start, end) -> page texts
+PDF_ENGINES: Dict[str, Callable[[FileContent, int, Optional[int]], List[str]]] = {}
+
+
+def register_pdf_engine(name: str):
+    """Decorator that registers a PDF extraction engine under the given name"""
+    def decorator(func):
+        PDF_ENGINES[name] = func
+        return func
+    return decorator
+
+
+@register_pdf_engine("pymupdf")
+def extract_pages_pymupdf(content: FileContent, start: int = 0, end: Optional[int] = None) -> List[str]:
+    """Extract page texts with PyMuPDF (fast, handles image-heavy PDFs well)"""
+    with pymupdf.open(stream=bytes(content), filetype="pdf") as doc:
+        end = doc.page_count if end is None else min(end, doc.page_count)
+        return [doc[i].get_text() for i in range(start, end)]
+
+
+@register_pdf_engine("pdfplumber")
+def extract_pages_pdfplumber(content: FileContent, start: int = 0, end: Optional[int] = None) -> List[str]:
+    """Extract page texts with pdfplumber (slower, sometimes better on unusual layouts)"""
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        return [page.extract_text() or "" for page in pdf.pages[start:end]]
+
+
+def count_pdf_pages(content: FileContent) -> int:
+    """Return the number of pages in a PDF"""
+    with pymupdf.open(stream=bytes(content), filetype="pdf") as doc:
+        return doc.page_count
+
+
+def _extract_page_range(engine: str, content: bytes, start: int, end: int) -> List[str]:
+    """Worker entry point for parallel page extraction"""
+    return PDF_ENGINES[engine](content, start, end)
+
+
+def extract_pdf_pages_with(engine: str, content: FileContent,
+                           executor: Optional[Executor] = None, workers: int = 1) -> List[str]:
+    """
+    Extract the text of each page of a PDF with a specific engine
+
+    When a process executor is given, documents with at least
+    PDF_PARALLEL_MIN_PAGES pages are split into page ranges that are extracted
+    by separate worker processes, since both engines hold the GIL while parsing.
+    """
+    if engine not in PDF_ENGINES:
+        raise Exception(f"Unknown PDF engine '{engine}'. Available engines: {', '.join(PDF_ENGINES)}")
+
+    page_count = count_pdf_pages(content) if executor is not None and workers > 1 else 0
+    if page_count < PDF_PARALLEL_MIN_PAGES:
+        return PDF_ENGINES[engine](content, 0, None)
+
+    chunk_size = -(-page_count // workers)  # Ceiling division
+    data = bytes(content)
+    futures = [
+        executor.submit(_extract_page_range, engine, data, start, min(start + chunk_size, page_count))
+        for start in range(0, page_count, chunk_size)
+    ]
+
+    pages = []
+    for future in futures:
+        pages.extend(future.result())
+    return pages
+
+
+def extract_pdf_pages(content: FileContent, executor: Optional[Executor] = None, workers: int = 1) -> List[str]:
+    """
+    Extract the text of each page of a PDF held in memory
+
+    Uses PDF_ENGINE first and falls back to PDF_FALLBACK_ENGINE when the text
+    yield is poor (e.g. scanned pages or odd encodings), keeping whichever
+    engine extracted more text.
+    """
+    pages = extract_pdf_pages_with(PDF_ENGINE, content, executor, workers)
+    total_chars = sum(len(page.strip()) for page in pages)
+
+    if (PDF_FALLBACK_ENGINE and PDF_FALLBACK_ENGINE != PDF_ENGINE
+            and total_chars < PDF_MIN_CHARS_PER_PAGE * max(len(pages), 1)):
+        print(f"Low text yield from {PDF_ENGINE} ({total_chars} chars, {len(pages)} pages), trying {PDF_FALLBACK_ENGINE}")
+        try:
+            fallback_pages = extract_pdf_pages_with(PDF_FALLBACK_ENGINE, content, executor, workers)
+        except Exception as e:
+            print(f"Fallback PDF engine {PDF_FALLBACK_ENGINE} failed: {e}")
+            return pages
+        if sum(len(page.strip()) for page in fallback_pages) > total_chars:
+            return fallback_pages
+
+    return pages
+
+
+def extract_docx_text(content: FileContent) -> str:
+    """Extract the text of a DOCX held in memory (DOCX is a zip archive, so no path is needed)"""
+    return docx2txt.process(io.BytesIO(content)) or ""
+
+
+def extract_with_unstructured(content: FileContent, file_extension: str) -> str:
+    """
+    Extract text with UnstructuredWordDocumentLoader
+
+    The loader (and the converters it shells out to for legacy .doc files)
+    only works with a real path, so the content is written to a temporary
+    file that is removed as soon as loading finishes.
+    """
+    temp_file_path = None
+    try:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_extension}") as temp_file:
+            temp_file.write(content)
+            temp_file_path = temp_file.name
+
+        docs = UnstructuredWordDocumentLoader(temp_file_path).load()
+        return "\n\n".join(doc.page_content for doc in docs)
+    finally:
+        if temp_file_path and os.path.exists(temp_file_path):
+            try:
+                os.unlink(temp_file_path)
+            except Exception as cleanup_error:
+                print(f"Failed to cleanup temp file: {cleanup_error}")
+
+
+def extract_resume_pages(content: FileContent, file_extension: str,
+                         executor: Optional[Executor] = None, workers: int = 1) -> List[str]:
+    """
+    Extract plain text from an uploaded resume without touching the disk where possible
+
+    PDF and DOCX files are read straight from memory; only legacy DOC files
+    (and DOCX files docx2txt can't read) go through a temporary file.
+
+    Args:
+        content: Raw file content
+        file_extension: Lowercase extension without the dot (pdf, docx, doc)
+        executor: Optional process executor used to extract long PDFs page range by page range
+        workers: Number of page ranges to split long PDFs into
+
+    Returns:
+        List[str]: Text of each PDF page, or a single entry for Word documents
+
+    Raises:
+        Exception: If the format is unsupported or no text could be extracted
+    """
+    if file_extension == 'pdf':
+        try:
+            pages = extract_pdf_pages(content, executor, workers)
+        except Exception as e:
+            raise Exception(f"Failed to process PDF file: {str(e)}")
+        if not pages:
+            raise Exception("Could not extract text from PDF file")
+        return pages
+
+    elif file_extension == 'docx':
+        try:
+            text = extract_docx_text(content)
+            if not text.strip():
+                raise Exception("Could not extract text from DOCX file")
+            return [text]
+        except Exception:
+            # Fallback to UnstructuredWordDocumentLoader
+            try:
+                text = extract_with_unstructured(content, file_extension)
+                if not text:
+                    raise Exception("Could not extract text from DOCX file")
+                return [text]
+            except Exception as e:
+                raise Exception(f"Failed to process DOCX file: {str(e)}")
+
+    elif file_extension == 'doc':
+        try:
+            text = extract_with_unstructured(content, file_extension)
+            if not text:
+                raise Exception("Could not extract text from DOC file")
+            return [text]
+        except Exception as e:
+            raise Exception(f"Failed to process DOC file: {str(e)}")
+
+    raise Exception(f"Unsupported file format: .{file_extension}. Only PDF, DOC, and DOCX files are supported.")
+
@@ -11,6 +11,7 @@ import psycopg2
 from psycopg2.extras import RealDictCursor
 from datetime import datetime
 from zoom_integration import ZoomAPI
+from llm_runtime import LLMRunner, LLMTimeoutError
 
 # Load credentials from .env
 load_dotenv()
@@ -28,6 +29,9 @@ DB_CONFIG = {
 
 app = FastAPI(title="Email Service", description="Simple email service for ShortlistPro")
 
+# SMTP, database and Zoom calls are blocking, so they run on this service's thread pool
+blocking_runner = LLMRunner.from_env("email", default_timeout=300)
+
 # Add CORS middleware to allow requests from Django frontend
 app.add_middleware(
     CORSMiddleware,
@@ -644,6 +648,14 @@ def send_email(to_email: str, subject: str, body: str):
 @app.post("/send-emails")
 async def send_candidate_emails(request: EmailRequest):
     """Send emails to selected candidates with enhanced interview scheduling"""
+    try:
+        return await blocking_runner.run_blocking(process_email_request, request)
+    except LLMTimeoutError as e:
+        print(f"CRITICAL ERROR EMAIL AGENT: {str(e)}")
+        raise HTTPException(status_code=504, detail=str(e))
+
+def process_email_request(request: EmailRequest):
+    """Look up the candidates, create any Zoom meetings, send the emails and record the results"""
     try:
         print(f"DEBUG EMAIL AGENT: Received request to send emails")
         print(f"DEBUG EMAIL AGENT: Candidate IDs: {request.candidate_ids}")
@@ -1497,7 +1509,7 @@ async def send_otp_email(request: OTPEmailRequest):
         subject, body = create_otp_email(request.to_email, request.otp_code, request.user_name)
         
         # Send using existing SMTP setup
-        if send_email(request.to_email, subject, body):
+        if await blocking_runner.run_blocking(send_email, request.to_email, subject, body):
             print(f"DEBUG EMAIL AGENT: OTP email sent successfully to {request.to_email}")
             return {
                 "status": "success", 
@@ -1514,7 +1526,7 @@ async def send_otp_email(request: OTPEmailRequest):
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "Email Service"}
+    return {"status": "healthy", "service": "Email Service", "blocking_io": blocking_runner.stats()}
 
 if __name__ == "__main__":
     import uvicorn
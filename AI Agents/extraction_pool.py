@@ -0,0 +1,117 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List
+
+from document_extraction import PDF_PARALLEL_MIN_PAGES, FileContent, count_pdf_pages, extract_resume_pages
+
+
+def _init_worker():
+    """
+    Import the document loaders once when a worker process starts
+
+    unstructured in particular takes seconds to import, so paying that cost
+    up front keeps it out of the first request each worker handles.
+    """
+    import docx2txt  # noqa: F401
+    import pdfplumber  # noqa: F401
+    import pymupdf  # noqa: F401
+    try:
+        from unstructured.partition.doc import partition_doc  # noqa: F401
+        from unstructured.partition.docx import partition_docx  # noqa: F401
+    except ImportError as e:
+        print(f"unstructured is not available in extraction worker: {e}")
+
+
+def _ping() -> bool:
+    """No-op task used to start every worker during warm-up"""
+    return True
+
+
+class ExtractionPool:
+    """
+    Pre-warmed process pool for CPU-bound resume text extraction.
+
+    Keeps PDF/DOCX parsing off the event loop and out of the GIL. Workers are
+    replaced after `recycle_after` jobs to bound memory growth from leaky
+    native parsers; long PDFs are split into page ranges across all workers.
+    """
+
+    def __init__(self, size: int, recycle_after: int):
+        self.size = max(1, size)
+        self.recycle_after = recycle_after
+        self.jobs = 0
+        self.recycles = 0
+        self._jobs_since_recycle = 0
+        self._lock = threading.Lock()
+        self._executor = self._create_executor()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.size, initializer=_init_worker)
+
+    def _recycle(self):
+        """Swap in a fresh executor; in-flight jobs finish on the old one"""
+        old_executor = self._executor
+        self._executor = self._create_executor()
+        self._jobs_since_recycle = 0
+        self.recycles += 1
+        old_executor.shutdown(wait=False)
+
+    def submit(self, fn, *args):
+        """Submit a job, recycling the workers once they have handled recycle_after jobs"""
+        with self._lock:
+            if self.recycle_after > 0 and self._jobs_since_recycle >= self.recycle_after:
+                self._recycle()
+            self.jobs += 1
+            self._jobs_since_recycle += 1
+            try:
+                return self._executor.submit(fn, *args)
+            except BrokenProcessPool:
+                # A worker died (e.g. crashed on a malformed file) - start over
+                self._recycle()
+                return self._executor.submit(fn, *args)
+
+    def warm_up(self):
+        """Start every worker now so the loader imports happen before the first request"""
+        with self._lock:
+            executor = self._executor
+        futures = [executor.submit(_ping) for _ in range(self.size)]
+        for future in futures:
+            future.result()
+
+    async def extract(self, content: FileContent, file_extension: str) -> List[str]:
+        """
+        Extract resume text page by page in the pool without blocking the event loop
+
+        Long PDFs are split into page ranges that run on all workers; any
+        other file is extracted by a single worker.
+        """
+        split_pages = False
+        if self.size > 1 and file_extension == 'pdf':
+            try:
+                # Opening the PDF to count pages is blocking work too; keep it off the event loop
+                split_pages = await asyncio.to_thread(count_pdf_pages, content) >= PDF_PARALLEL_MIN_PAGES
+            except Exception:
+                pass  # Unreadable PDF - let the worker report the real error
+
+        try:
+            if split_pages:
+                return await asyncio.to_thread(extract_resume_pages, content, file_extension, self, self.size)
+            return await asyncio.wrap_future(self.submit(extract_resume_pages, bytes(content), file_extension))
+        except BrokenProcessPool:
+            raise Exception("Extraction worker crashed while processing the file")
+
+    def shutdown(self):
+        with self._lock:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool configuration and counters for the health endpoint"""
+        with self._lock:
+            return {
+                "size": self.size,
+                "recycle_after": self.recycle_after,
+                "jobs": self.jobs,
+                "recycles": self.recycles,
+            }
@@ -1,5 +1,7 @@
 # Import required libraries
+import asyncio
 import json
+import re
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -10,9 +12,22 @@ from dotenv import load_dotenv
 import uvicorn
 import os
 
+from llm_runtime import LLMRunner
+from text_compaction import count_tokens, truncate_to_budget
+
 # Load environment variables
 load_dotenv()
 
+# Transcripts up to this size are evaluated in one prompt; longer ones are
+# segmented by question turn, summarized concurrently, and scored from the notes
+EVALUATION_DIRECT_TOKEN_BUDGET = int(os.getenv("EVALUATION_DIRECT_TOKEN_BUDGET", "3000"))
+EVALUATION_SEGMENT_TOKENS = int(os.getenv("EVALUATION_SEGMENT_TOKENS", "1500"))
+EVALUATION_MAX_SEGMENTS = int(os.getenv("EVALUATION_MAX_SEGMENTS", "12"))
+# Total size of the evidence notes in the final scoring prompt, shared by all segments
+EVALUATION_NOTES_TOKEN_BUDGET = int(os.getenv("EVALUATION_NOTES_TOKEN_BUDGET", "2000"))
+# Job description text in each segment summary prompt
+EVALUATION_SEGMENT_JD_TOKEN_BUDGET = int(os.getenv("EVALUATION_SEGMENT_JD_TOKEN_BUDGET", "300"))
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Interview Evaluation API",
@@ -63,6 +78,16 @@ class InterviewEvaluationResult(BaseModel):
     concerns_for_next_round: List[str] = Field(..., description="Specific concerns to address (max 2)")
 
 
+class SegmentNotes(BaseModel):
+    """Compact evidence notes for one segment of an interview transcript"""
+    questions_covered: List[str] = Field(..., description="The interviewer's questions in this segment, shortened")
+    answer_evidence: List[str] = Field(..., description="Concrete facts, examples and short quotes from the candidate's answers")
+    experience_claims: List[str] = Field(..., description="Experience, skills or projects the candidate claimed")
+    communication: str = Field(..., description="How clearly and confidently the candidate communicated (max 30 words)")
+    interest_signals: List[str] = Field(..., description="Signs of interest in or understanding of the role, positive or negative")
+    red_flags: List[str] = Field(..., description="Evasive, inconsistent or concerning answers; empty if none")
+
+
 # Request and Response Models for FastAPI
 class EvaluationRequest(BaseModel):
     """Request model for interview evaluation endpoint"""
@@ -94,10 +119,22 @@ model = ChatGoogleGenerativeAI(
 )
 
 structured_evaluator = model.with_structured_output(InterviewEvaluationResult)
+structured_segment_summarizer = model.with_structured_output(SegmentNotes)
+
+# Async model calls with this service's concurrency limit and timeout
+llm_runner = LLMRunner.from_env("evaluation", default_timeout=180)
+
+# Evaluations by path and segment summaries (reported by /health)
+evaluation_stats = {"direct": 0, "map_reduce": 0, "segments": 0, "segment_failures": 0}
+
+# "Speaker: text" lines as sent by Django, optionally prefixed with a [timestamp]
+SPEAKER_LINE = re.compile(r"^\s*(?:\[[^\]]*\]\s*)?(agent|assistant|interviewer|ai|user|candidate|system)\s*:", re.IGNORECASE)
+INTERVIEWER_SPEAKERS = {"agent", "assistant", "interviewer", "ai"}
 
 
 def create_evaluation_prompt(job_description: str, candidate_resume_data: str, interview_transcript: str, 
-                           duration_minutes: Optional[int] = None, resume_context: Optional[Dict[str, Any]] = None) -> str:
+                           duration_minutes: Optional[int] = None, resume_context: Optional[Dict[str, Any]] = None,
+                           transcript_heading: str = "INTERVIEW TRANSCRIPT") -> str:
     """Create a comprehensive evaluation prompt for interview transcript analysis"""
     duration_info = f"(Duration: {duration_minutes} minutes)" if duration_minutes else ""
     
@@ -127,7 +164,7 @@ JOB DESCRIPTION: {job_description}
 CANDIDATE RESUME: {candidate_resume_data}
 {resume_info}
 
-INTERVIEW TRANSCRIPT {duration_info}: {interview_transcript}
+{transcript_heading} {duration_info}: {interview_transcript}
 
 📊 SIMPLIFIED PRE-SCREENING EVALUATION (0-10 scale):
 
@@ -256,6 +293,137 @@ Remember: This is an INITIAL SCREENING. Focus on basic qualifications, communica
 """
 
 
+def split_question_turns(transcript: str) -> List[str]:
+    """
+    Split a transcript into question turns
+    
+    A turn starts with an interviewer message that follows the candidate's
+    answer, so each turn holds one question (plus any follow-ups) and the
+    answers to it. Transcripts without speaker labels are split by paragraph.
+    """
+    turns, current, answered = [], [], False
+    for line in transcript.splitlines():
+        speaker = SPEAKER_LINE.match(line)
+        if speaker:
+            role = speaker.group(1).lower()
+            if role in INTERVIEWER_SPEAKERS and answered:
+                turns.append("\n".join(current).strip())
+                current, answered = [], False
+            elif role not in INTERVIEWER_SPEAKERS and role != "system":
+                answered = True
+        current.append(line)
+    if current:
+        turns.append("\n".join(current).strip())
+    turns = [turn for turn in turns if turn]
+    if len(turns) <= 1:
+        turns = [paragraph.strip() for paragraph in re.split(r"\n\s*\n", transcript) if paragraph.strip()]
+    return turns
+
+
+def segment_transcript(transcript: str) -> List[str]:
+    """
+    Group consecutive question turns into segments for concurrent summarization
+    
+    Segments hold about EVALUATION_SEGMENT_TOKENS each; for very long
+    interviews the segment size grows instead of the count, so there are
+    never more than EVALUATION_MAX_SEGMENTS summary calls. A single turn
+    longer than a segment is split by size.
+    """
+    turns = split_question_turns(transcript)
+    budget = max(EVALUATION_SEGMENT_TOKENS, -(-count_tokens(transcript) // EVALUATION_MAX_SEGMENTS))
+    while True:
+        segments = pack_turns(turns, budget)
+        if len(segments) <= EVALUATION_MAX_SEGMENTS:
+            return segments
+        # Turns don't divide evenly; widen the segments until the count fits
+        budget = budget * 5 // 4
+
+
+def pack_turns(turns: List[str], budget: int) -> List[str]:
+    """Pack consecutive turns into segments of at most budget tokens, splitting oversized turns by size"""
+    segments, current, tokens = [], [], 0
+    for turn in turns:
+        turn_tokens = count_tokens(turn)
+        if current and tokens + turn_tokens > budget:
+            segments.append("\n\n".join(current))
+            current, tokens = [], 0
+        if turn_tokens > budget:
+            # Characters per token as estimated by count_tokens
+            step = budget * 4
+            segments.extend(turn[start:start + step] for start in range(0, len(turn), step))
+            continue
+        current.append(turn)
+        tokens += turn_tokens
+    if current:
+        segments.append("\n\n".join(current))
+    return segments
+
+
+def create_segment_prompt(job_description: str, segment: str, index: int, total: int, max_words: int) -> str:
+    """Create the prompt that condenses one transcript segment into evidence notes"""
+    return f"""
+You are an HR analyst taking notes on part {index} of {total} of a pre-screening interview transcript.
+Record only what this part shows; another reviewer scores the whole interview from everyone's notes.
+
+ROLE (for relevance):
+{truncate_to_budget(job_description, EVALUATION_SEGMENT_JD_TOKEN_BUDGET)}
+
+TRANSCRIPT PART {index}/{total}:
+{segment}
+
+NOTES:
+- Be factual and specific: names of technologies, numbers, durations, concrete examples
+- Keep short verbatim quotes for the strongest and weakest answers
+- Note vague, evasive or contradictory answers as red flags
+- Keep all notes together under {max_words} words
+"""
+
+
+def format_segment_notes(notes: SegmentNotes, index: int) -> str:
+    """Render one segment's notes for the final scoring prompt"""
+    sections = [
+        ("Questions", notes.questions_covered),
+        ("Answer evidence", notes.answer_evidence),
+        ("Experience claims", notes.experience_claims),
+        ("Interest signals", notes.interest_signals),
+        ("Red flags", notes.red_flags),
+    ]
+    lines = [f"[Part {index}]"]
+    lines.extend(f"{label}: {'; '.join(items)}" for label, items in sections if items)
+    lines.append(f"Communication: {notes.communication}")
+    return "\n".join(lines)
+
+
+async def summarize_segments(job_description: str, segments: List[str]) -> str:
+    """
+    Summarize transcript segments concurrently into evidence notes
+    
+    Every segment gets an equal share of EVALUATION_NOTES_TOKEN_BUDGET, so
+    the notes stay the same size however long the interview was. A segment
+    whose summary fails is included as a truncated excerpt instead.
+    """
+    share = max(80, EVALUATION_NOTES_TOKEN_BUDGET // len(segments))
+    max_words = share * 3 // 4
+    
+    async def summarize(index: int, segment: str) -> str:
+        try:
+            notes = await llm_runner.ainvoke(
+                structured_segment_summarizer,
+                create_segment_prompt(job_description, segment, index, len(segments), max_words)
+            )
+            if notes is None:
+                raise ValueError("Model returned no notes")
+            return truncate_to_budget(format_segment_notes(notes, index), share)
+        except Exception as e:
+            evaluation_stats["segment_failures"] += 1
+            print(f"DEBUG EVALUATION AGENT: Summary of part {index} failed, using an excerpt: {str(e)}")
+            return f"[Part {index} - transcript excerpt]\n{truncate_to_budget(segment, share)}"
+    
+    evaluation_stats["segments"] += len(segments)
+    notes = await asyncio.gather(*(summarize(index, segment) for index, segment in enumerate(segments, start=1)))
+    return "\n\n".join(notes)
+
+
 @app.post("/evaluate-interview", response_model=EvaluationResponse)
 async def evaluate_interview(request: EvaluationRequest):
     """
@@ -292,17 +460,30 @@ async def evaluate_interview(request: EvaluationRequest):
                 'experience_gap': request.experience_gap or 'N/A'
             }
         
+        # Long transcripts are condensed into evidence notes first (map), then scored (reduce)
+        transcript = request.interview_transcript
+        transcript_heading = "INTERVIEW TRANSCRIPT"
+        if count_tokens(transcript) > EVALUATION_DIRECT_TOKEN_BUDGET:
+            segments = segment_transcript(transcript)
+            print(f"DEBUG EVALUATION AGENT: Summarizing {count_tokens(transcript)}-token transcript in {len(segments)} segments")
+            transcript = await summarize_segments(request.job_description, segments)
+            transcript_heading = f"INTERVIEW EVIDENCE NOTES (condensed from the transcript in {len(segments)} parts, in interview order)"
+            evaluation_stats["map_reduce"] += 1
+        else:
+            evaluation_stats["direct"] += 1
+        
         # Create evaluation prompt with resume context
         full_prompt = create_evaluation_prompt(
             request.job_description, 
             request.candidate_resume_data,
-            request.interview_transcript,
+            transcript,
             request.interview_duration_minutes,
-            resume_context
+            resume_context,
+            transcript_heading
         )
         
         # Process the evaluation request
-        response = structured_evaluator.invoke(full_prompt)
+        response = await llm_runner.ainvoke(structured_evaluator, full_prompt)
         
         # Return successful response
         return EvaluationResponse(
@@ -324,7 +505,7 @@ async def evaluate_interview(request: EvaluationRequest):
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "interview-evaluation-api"}
+    return {"status": "healthy", "service": "interview-evaluation-api", "evaluations": evaluation_stats, "llm": llm_runner.stats()}
 
 
 @app.get("/")
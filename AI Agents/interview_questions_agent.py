@@ -6,12 +6,25 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from dotenv import load_dotenv
+import asyncio
 import os
-import json
+
+from llm_runtime import LLMRunner
+from skill_taxonomy import skill_index
+from text_compaction import truncate_to_budget
 
 # Load environment variables
 load_dotenv()
 
+# Token caps on the resume and JD text in the prompt. Django sends the resume's
+# compact digest and the JD's structured requirements, which normally fit whole;
+# the caps only guard against oversized input from other callers.
+QUESTIONS_RESUME_TOKEN_BUDGET = int(os.getenv("QUESTIONS_RESUME_TOKEN_BUDGET", "800"))
+QUESTIONS_JD_TOKEN_BUDGET = int(os.getenv("QUESTIONS_JD_TOKEN_BUDGET", "400"))
+
+# Resume text in the short per-candidate follow-up prompt used with a question bank
+QUESTIONS_FOLLOW_UP_RESUME_TOKEN_BUDGET = int(os.getenv("QUESTIONS_FOLLOW_UP_RESUME_TOKEN_BUDGET", "300"))
+
 # Initialize FastAPI app
 app = FastAPI(title="Interview Questions Agent", description="Generate tailored interview questions for candidates")
 
@@ -31,6 +44,9 @@ llm = ChatGoogleGenerativeAI(
     temperature=0.7  # Slightly higher for more creative question generation
 )
 
+# Async model calls with this service's concurrency limit and timeout
+llm_runner = LLMRunner.from_env("questions")
+
 # Pydantic Models - SIMPLIFIED
 class QuestionItem(BaseModel):
     question: str = Field(description="Short, direct interview question (max 25 words)")
@@ -40,7 +56,7 @@ class QuestionItem(BaseModel):
     expected_duration: str = Field(description="Expected time: 1-2 min")
 
 class InterviewQuestionsRequest(BaseModel):
-    resume_data: str = Field(description="Complete resume text or structured data")
+    resume_data: str = Field(description="Resume digest text or structured data")
     job_description: str = Field(description="Job description text")
     matching_results: Dict[str, Any] = Field(description="Results from resume matching agent")
 
@@ -52,6 +68,62 @@ class InterviewQuestionsResult(BaseModel):
     focus_areas: List[str] = Field(description="Key screening focus areas")
     question_distribution: Dict[str, int] = Field(description="Questions per category")
 
+class GeneratedQuestions(BaseModel):
+    """What the model writes; counts, duration and distribution are derived locally"""
+    questions: List[QuestionItem] = Field(description="The screening questions, exactly as many as requested")
+    focus_areas: List[str] = Field(description="2-3 key screening focus areas")
+
+class BatchQuestionsCandidate(BaseModel):
+    candidate_id: str = Field(description="Caller's identifier for the candidate (e.g. matching result ID)")
+    resume_data: str = Field(description="Resume digest text or structured data")
+    matching_results: Dict[str, Any] = Field(description="Results from resume matching agent")
+
+class BankQuestion(QuestionItem):
+    skill: str = Field(description="Skill the question validates, empty for general questions")
+    level: str = Field(description="Candidate level the question suits: junior, mid, senior or any")
+
+class QuestionBank(BaseModel):
+    questions: List[BankQuestion] = Field(description="Reusable screening questions for the job")
+
+class QuestionBankRequest(BaseModel):
+    job_description: str = Field(description="Job description text")
+
+class QuestionBankResponse(BaseModel):
+    success: bool = Field(description="Whether the bank was generated")
+    data: Optional[QuestionBank] = Field(None, description="The question bank")
+    error: Optional[str] = Field(None, description="Error message if generation failed")
+
+class FollowUpQuestion(BaseModel):
+    question: str = Field(description="One short follow-up question (max 25 words)")
+    purpose: str = Field(description="Brief reason for asking (max 30 words)")
+
+class BatchQuestionsRequest(BaseModel):
+    job_description: str = Field(description="Job description text shared by every candidate")
+    candidates: List[BatchQuestionsCandidate] = Field(description="Candidates to generate questions for")
+    question_bank: Optional[QuestionBank] = Field(None, description="JD question bank; when given, questions are selected from it instead of generated")
+
+class BatchQuestionsItem(BaseModel):
+    candidate_id: str = Field(description="Identifier from the request")
+    success: bool = Field(description="Whether questions were generated")
+    data: Optional[InterviewQuestionsResult] = Field(None, description="Generated questions")
+    error: Optional[str] = Field(None, description="Error message if generation failed")
+
+class BatchQuestionsResponse(BaseModel):
+    results: List[BatchQuestionsItem] = Field(description="Per-candidate results in request order")
+    total: int = Field(description="Number of candidates in the request")
+    succeeded: int = Field(description="Number of candidates with generated questions")
+    failed: int = Field(description="Number of candidates that failed")
+
+structured_question_generator = llm.with_structured_output(GeneratedQuestions)
+structured_bank_generator = llm.with_structured_output(QuestionBank)
+structured_follow_up_generator = llm.with_structured_output(FollowUpQuestion)
+
+# Generation and selection counters (reported by /health)
+question_stats = {"full_generations": 0, "bank_generations": 0, "bank_selections": 0, "follow_ups": 0}
+
+# Categories counted in question_distribution
+QUESTION_CATEGORIES = ["background_verification", "skill_validation", "motivation_fit"]
+
 def determine_complexity_and_question_count(resume_data: str, job_description: str, matching_score: float) -> tuple:
     """Determine interview complexity and dynamic question count - SIMPLIFIED"""
     
@@ -93,9 +165,11 @@ def create_interview_questions_prompt(resume_data: str, job_description: str, ma
     prompt = f"""
 You are an expert HR screener. Generate {target_questions} SHORT, focused questions for a 5-10 minute phone screening.
 
-CANDIDATE RESUME (first 800 chars): {resume_data[:800]}
+CANDIDATE RESUME:
+{truncate_to_budget(resume_data, QUESTIONS_RESUME_TOKEN_BUDGET)}
 
-JOB POSITION: {job_description[:500]}
+JOB POSITION:
+{truncate_to_budget(job_description, QUESTIONS_JD_TOKEN_BUDGET)}
 
 MATCHING ANALYSIS:
 - Score: {matching_results.get('overall_score', 'N/A')}%
@@ -114,33 +188,217 @@ CATEGORIES (balanced distribution):
 - skill_validation: Test 1-2 most important skills  
 - motivation_fit: Assess interest and fit
 
-JSON FORMAT:
-{{
-    "questions": [
-        {{
-            "question": "Short, direct question text (max 25 words)",
-            "category": "background_verification|skill_validation|motivation_fit",
-            "purpose": "Brief reason (max 50 words)",
-            "priority": "high|medium",
-            "expected_duration": "1-2 min"
-        }}
-    ],
-    "total_questions": {target_questions},
-    "estimated_duration": "{5 if target_questions == 3 else 8}-10 minutes",
-    "complexity_level": "{complexity_level}",
-    "focus_areas": ["Quick Assessment", "Key Skills", "Cultural Fit"],
-    "question_distribution": {{
-        "background_verification": 1,
-        "skill_validation": {max(1, target_questions-2)}, 
-        "motivation_fit": 1
-    }}
-}}
+OUTPUT:
+- questions: exactly {target_questions} items, each with question, category, purpose, priority (high|medium) and expected_duration ("1-2 min")
+- focus_areas: 2-3 short focus areas for this screening
 
 Keep it SIMPLE and FAST for efficient screening!
 """
     
     return prompt
 
+def build_questions_result(generated: GeneratedQuestions, complexity_level: str) -> InterviewQuestionsResult:
+    """Turn the model's questions into the service result, counting questions per category"""
+    distribution = {category: 0 for category in QUESTION_CATEGORIES}
+    for question in generated.questions:
+        if question.category in distribution:
+            distribution[question.category] += 1
+    
+    return InterviewQuestionsResult(
+        questions=generated.questions,
+        total_questions=len(generated.questions),
+        estimated_duration="5-8 minutes" if len(generated.questions) <= 3 else "8-10 minutes",
+        complexity_level=complexity_level,
+        focus_areas=generated.focus_areas,
+        question_distribution=distribution
+    )
+
+
+async def generate_questions_for(resume_data: str, job_description: str, matching_results: Dict[str, Any]) -> InterviewQuestionsResult:
+    """
+    Generate screening questions for one candidate with a structured-output call
+    
+    Model and timeout errors propagate; a response without any questions is
+    retried once and then replaced by the fallback questions.
+    """
+    matching_score = float(matching_results.get('overall_score', 0) or 0)
+    complexity_level, target_questions = determine_complexity_and_question_count(
+        resume_data, 
+        job_description, 
+        matching_score
+    )
+    prompt = create_interview_questions_prompt(
+        resume_data,
+        job_description,
+        matching_results,
+        complexity_level,
+        target_questions
+    )
+    
+    for attempt in range(2):
+        question_stats["full_generations"] += 1
+        generated = await llm_runner.ainvoke(structured_question_generator, prompt)
+        if generated is not None and generated.questions:
+            return build_questions_result(generated, complexity_level)
+        print(f"DEBUG QUESTIONS AGENT: Model returned no questions (attempt {attempt + 1})")
+    
+    return create_fallback_questions(target_questions, complexity_level)
+
+
+def create_question_bank_prompt(job_description: str) -> str:
+    """Create the prompt for the reusable question bank of a job description"""
+    return f"""
+You are an expert HR screener. Build a reusable bank of SHORT phone-screening questions for the job below.
+Candidate-specific details will be handled separately, so every question must make sense for any applicant.
+
+JOB POSITION:
+{truncate_to_budget(job_description, QUESTIONS_JD_TOKEN_BUDGET)}
+
+BANK CONTENTS:
+- background_verification: 3 questions about recent roles, relevant projects and responsibilities (skill empty)
+- motivation_fit: 3 questions about interest in this role, work style and availability (skill empty)
+- skill_validation: one question per must-have skill (max 10) and one per nice-to-have skill (max 4), with skill set to the skill name
+- For skills central to the role, add a second skill_validation question pitched at a different level
+
+EVERY QUESTION:
+- question: max 25 words, conversational, answerable in 1-2 minutes
+- purpose: max 50 words
+- priority: high for must-have skills and background, medium otherwise
+- expected_duration: "1-2 min"
+- level: junior, mid or senior when the question only suits that level, otherwise any
+"""
+
+
+def _skill_key(skill: str) -> str:
+    """Canonical skill ID when the taxonomy knows the skill, otherwise the normalized name"""
+    return skill_index.lookup(skill) or " ".join(str(skill).lower().split())
+
+
+def select_bank_questions(bank: QuestionBank, matching_results: Dict[str, Any],
+                          complexity_level: str, target_questions: int) -> tuple:
+    """
+    Pick a candidate's questions from the JD question bank
+    
+    One background and one motivation question, then skill questions probing
+    the candidate's missing skills first and their matched skills next, all
+    preferring questions written for the candidate's level.
+    
+    Returns:
+        tuple: (selected questions, missing skills the bank has no question for)
+    """
+    def suits(question: BankQuestion) -> int:
+        level = question.level.lower()
+        return 0 if level == complexity_level else 1 if level in ("any", "") else 2
+    
+    by_category = {category: sorted((q for q in bank.questions if q.category == category), key=suits)
+                   for category in QUESTION_CATEGORIES}
+    missing = [_skill_key(skill) for skill in matching_results.get('missing_skills') or []]
+    matched = [_skill_key(skill) for skill in matching_results.get('matched_skills') or []]
+    
+    skill_questions = by_category["skill_validation"]
+    ordered = (
+        [q for key in missing for q in skill_questions if _skill_key(q.skill) == key][:2]
+        + [q for key in matched for q in skill_questions if _skill_key(q.skill) == key]
+        + skill_questions
+    )
+    covered = {_skill_key(q.skill) for q in skill_questions}
+    uncovered = [skill for skill, key in zip(matching_results.get('missing_skills') or [], missing) if key not in covered]
+    
+    selected = by_category["background_verification"][:1] + by_category["motivation_fit"][:1]
+    for question in ordered:
+        if len(selected) >= target_questions:
+            break
+        if question not in selected:
+            selected.append(question)
+    
+    # Pad from whatever is left if the bank is short on skill questions
+    for question in sorted(bank.questions, key=suits):
+        if len(selected) >= target_questions:
+            break
+        if question not in selected:
+            selected.append(question)
+    return selected, uncovered
+
+
+def create_follow_up_prompt(resume_data: str, uncovered_skills: List[str], matching_results: Dict[str, Any]) -> str:
+    """Create the short prompt for one candidate-specific follow-up question"""
+    return f"""
+Write ONE short phone-screening question (max 25 words) for this candidate.
+It should explore whether they could cover these skills the job needs but their resume doesn't show: {', '.join(uncovered_skills[:3])}.
+Ask about related experience or how they would get up to speed; be friendly, not accusatory.
+
+CANDIDATE RESUME:
+{truncate_to_budget(resume_data, QUESTIONS_FOLLOW_UP_RESUME_TOKEN_BUDGET)}
+
+MATCH SCORE: {matching_results.get('overall_score', 'N/A')}%
+"""
+
+
+async def select_questions_for(resume_data: str, job_description: str, matching_results: Dict[str, Any],
+                               bank: QuestionBank) -> InterviewQuestionsResult:
+    """
+    Build a candidate's questions from the JD question bank
+    
+    The selection itself needs no model call; only candidates with missing
+    skills the bank doesn't cover get one short follow-up call, whose
+    question replaces the last selected skill question.
+    """
+    matching_score = float(matching_results.get('overall_score', 0) or 0)
+    complexity_level, target_questions = determine_complexity_and_question_count(resume_data, job_description, matching_score)
+    selected, uncovered = select_bank_questions(bank, matching_results, complexity_level, target_questions)
+    questions = [QuestionItem(**q.model_dump(exclude={"skill", "level"})) for q in selected]
+    question_stats["bank_selections"] += 1
+    
+    if uncovered:
+        question_stats["follow_ups"] += 1
+        try:
+            follow_up = await llm_runner.ainvoke(
+                structured_follow_up_generator,
+                create_follow_up_prompt(resume_data, uncovered, matching_results)
+            )
+            if follow_up is not None and follow_up.question.strip():
+                follow_up_item = QuestionItem(
+                    question=follow_up.question,
+                    category="skill_validation",
+                    purpose=follow_up.purpose,
+                    priority="high",
+                    expected_duration="1-2 min"
+                )
+                if len(questions) >= target_questions:
+                    questions.pop()
+                questions.append(follow_up_item)
+        except Exception as e:
+            # The bank questions alone are still a complete screening
+            print(f"DEBUG QUESTIONS AGENT: Follow-up question failed: {str(e)}")
+    
+    focus_areas = ["Quick Assessment", "Key Skills", "Cultural Fit"]
+    if uncovered:
+        focus_areas.append(f"Gaps: {', '.join(uncovered[:3])}")
+    return build_questions_result(GeneratedQuestions(questions=questions, focus_areas=focus_areas), complexity_level)
+
+
+@app.post("/generate-question-bank", response_model=QuestionBankResponse)
+async def generate_question_bank(request: QuestionBankRequest):
+    """
+    Generate the reusable question bank for a job description
+    
+    Callers cache the bank per JD and pass it to /generate-questions/batch,
+    which then selects each candidate's questions instead of generating them.
+    """
+    if not request.job_description.strip():
+        raise HTTPException(status_code=400, detail="Job description cannot be empty")
+    
+    try:
+        question_stats["bank_generations"] += 1
+        bank = await llm_runner.ainvoke(structured_bank_generator, create_question_bank_prompt(request.job_description))
+        if bank is None or not bank.questions:
+            raise ValueError("Model returned an empty question bank")
+        print(f"DEBUG QUESTIONS AGENT: Generated question bank with {len(bank.questions)} questions")
+        return QuestionBankResponse(success=True, data=bank)
+    except Exception as e:
+        return QuestionBankResponse(success=False, error=f"Error generating question bank: {str(e)}")
+
+
 @app.post("/generate-questions", response_model=InterviewQuestionsResult)
 async def generate_interview_questions(request: InterviewQuestionsRequest):
     """
@@ -150,102 +408,54 @@ async def generate_interview_questions(request: InterviewQuestionsRequest):
         print(f"DEBUG QUESTIONS AGENT: Received request to generate interview questions")
         print(f"DEBUG QUESTIONS AGENT: Resume data length: {len(request.resume_data)} chars")
         print(f"DEBUG QUESTIONS AGENT: Job description length: {len(request.job_description)} chars")
-        print(f"DEBUG QUESTIONS AGENT: Matching results keys: {list(request.matching_results.keys())}")
-        
-        # Determine complexity and question count
-        matching_score = float(request.matching_results.get('overall_score', 0))
-        complexity_level, target_questions = determine_complexity_and_question_count(
-            request.resume_data, 
-            request.job_description, 
-            matching_score
-        )
         
-        print(f"DEBUG QUESTIONS AGENT: Generating {target_questions} questions for {complexity_level} level candidate")
-        print(f"DEBUG QUESTIONS AGENT: Matching score: {matching_score}%")
+        result = await generate_questions_for(request.resume_data, request.job_description, request.matching_results)
         
-        # Create comprehensive prompt
-        prompt = create_interview_questions_prompt(
-            request.resume_data,
-            request.job_description,
-            request.matching_results,
-            complexity_level,
-            target_questions
-        )
-        
-        # Generate questions using AI
-        print("DEBUG QUESTIONS AGENT: Calling AI model to generate questions...")
-        response = llm.invoke(prompt)
-        
-        # Parse AI response
-        try:
-            # Extract JSON from response
-            response_text = response.content
-            print(f"DEBUG QUESTIONS AGENT: Raw AI response length: {len(response_text)} characters")
-            
-            # Find JSON in response
-            start_idx = response_text.find('{')
-            end_idx = response_text.rfind('}') + 1
-            
-            if start_idx == -1 or end_idx == 0:
-                raise ValueError("No JSON found in AI response")
-            
-            json_text = response_text[start_idx:end_idx]
-            questions_data = json.loads(json_text)
-            
-            print(f"DEBUG QUESTIONS AGENT: Successfully parsed {questions_data.get('total_questions', 0)} questions")
-            
-            # Validate and ensure required fields
-            if 'questions' not in questions_data:
-                raise ValueError("No questions found in AI response")
-            
-            # Calculate question distribution
-            distribution = {
-                "background_verification": 0,
-                "skill_validation": 0,
-                "gap_exploration": 0,
-                "motivation_fit": 0
-            }
-            
-            for q in questions_data['questions']:
-                category = q.get('category', 'background_verification')
-                if category in distribution:
-                    distribution[category] += 1
-            
-            # Build result
-            result = InterviewQuestionsResult(
-                questions=[
-                    QuestionItem(
-                        question=q.get('question', ''),
-                        category=q.get('category', 'background_verification'),
-                        purpose=q.get('purpose', ''),
-                        priority=q.get('priority', 'medium'),
-                        expected_duration=q.get('expected_duration', '2-3 min')
-                    ) for q in questions_data['questions']
-                ],
-                total_questions=len(questions_data['questions']),
-                estimated_duration=questions_data.get('estimated_duration', '15-20 minutes'),
-                complexity_level=complexity_level,
-                focus_areas=questions_data.get('focus_areas', []),
-                question_distribution=distribution
-            )
-            
-            print(f"DEBUG QUESTIONS AGENT: Successfully generated interview questions")
-            print(f"DEBUG QUESTIONS AGENT: Distribution: {distribution}")
-            
-            return result
-            
-        except (json.JSONDecodeError, KeyError, ValueError) as parse_error:
-            print(f"DEBUG QUESTIONS AGENT: Error parsing AI response: {parse_error}")
-            print(f"DEBUG QUESTIONS AGENT: Raw response: {response.content[:500]}...")
-            
-            # Fallback: create basic questions
-            fallback_questions = create_fallback_questions(target_questions, complexity_level)
-            return fallback_questions
+        print(f"DEBUG QUESTIONS AGENT: Generated {result.total_questions} {result.complexity_level} questions")
+        print(f"DEBUG QUESTIONS AGENT: Distribution: {result.question_distribution}")
+        return result
             
     except Exception as e:
         print(f"ERROR QUESTIONS AGENT: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error generating interview questions: {str(e)}")
 
+
+@app.post("/generate-questions/batch", response_model=BatchQuestionsResponse)
+async def generate_interview_questions_batch(request: BatchQuestionsRequest):
+    """
+    Generate interview questions for many candidates of one job description
+    
+    Candidates are processed concurrently, bounded by the service's LLM
+    concurrency limit; one failure doesn't affect the others. With a
+    question_bank, questions are selected from the bank (plus at most one
+    short follow-up call per candidate) instead of generated in full.
+    """
+    async def generate_one(candidate: BatchQuestionsCandidate) -> BatchQuestionsItem:
+        try:
+            if request.question_bank and request.question_bank.questions:
+                result = await select_questions_for(candidate.resume_data, request.job_description,
+                                                    candidate.matching_results, request.question_bank)
+            else:
+                result = await generate_questions_for(candidate.resume_data, request.job_description, candidate.matching_results)
+            return BatchQuestionsItem(candidate_id=candidate.candidate_id, success=True, data=result)
+        except Exception as e:
+            return BatchQuestionsItem(
+                candidate_id=candidate.candidate_id,
+                success=False,
+                error=f"Error generating interview questions: {str(e)}"
+            )
+    
+    print(f"DEBUG QUESTIONS AGENT: Generating questions for {len(request.candidates)} candidates")
+    results = await asyncio.gather(*(generate_one(candidate) for candidate in request.candidates))
+    succeeded = sum(1 for result in results if result.success)
+    
+    return BatchQuestionsResponse(
+        results=results,
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded
+    )
+
 def create_fallback_questions(target_questions: int, complexity_level: str) -> InterviewQuestionsResult:
     """Create simplified fallback questions if AI generation fails"""
     
@@ -304,7 +514,7 @@ def create_fallback_questions(target_questions: int, complexity_level: str) -> I
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "Interview Questions Agent"}
+    return {"status": "healthy", "service": "Interview Questions Agent", "questions": question_stats, "llm": llm_runner.stats()}
 
 @app.get("/")
 async def root():
@@ -314,6 +524,8 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "generate": "/generate-questions",
+            "generate_batch": "/generate-questions/batch",
+            "question_bank": "/generate-question-bank",
             "health": "/health",
             "docs": "/docs"
         }
@@ -0,0 +1,88 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+# Defaults for every service; override per service with <SERVICE>_LLM_CONCURRENCY / <SERVICE>_LLM_TIMEOUT
+DEFAULT_LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))
+DEFAULT_LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+
+
+class LLMTimeoutError(Exception):
+    """Raised when a model call (or blocking task) takes longer than the service timeout"""
+
+
+class LLMRunner:
+    """
+    Runs a service's model calls and blocking I/O without stalling the event loop.
+
+    Model calls go through the LangChain `ainvoke` API; synchronous work (SMTP,
+    database access, third-party SDKs) runs on a dedicated thread pool. Both
+    share a per-service concurrency limit and timeout, so one slow Gemini call
+    only occupies a slot instead of freezing every other request.
+    """
+
+    def __init__(self, service: str, max_concurrency: int, timeout: float):
+        self.service = service
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.calls = 0
+        self.in_flight = 0
+        self.timeouts = 0
+        self.errors = 0
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix=f"{service}-blocking")
+
+    @classmethod
+    def from_env(cls, service: str, default_concurrency: int = None, default_timeout: float = None) -> "LLMRunner":
+        """Create a runner configured from <SERVICE>_LLM_CONCURRENCY and <SERVICE>_LLM_TIMEOUT"""
+        prefix = service.upper()
+        concurrency = os.getenv(f"{prefix}_LLM_CONCURRENCY")
+        timeout = os.getenv(f"{prefix}_LLM_TIMEOUT")
+        return cls(
+            service=service,
+            max_concurrency=int(concurrency) if concurrency else (default_concurrency or DEFAULT_LLM_CONCURRENCY),
+            timeout=float(timeout) if timeout else (default_timeout or DEFAULT_LLM_TIMEOUT),
+        )
+
+    async def _run(self, awaitable_factory: Callable[[], Any], label: str):
+        async with self._semaphore:
+            self.calls += 1
+            self.in_flight += 1
+            try:
+                return await asyncio.wait_for(awaitable_factory(), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise LLMTimeoutError(f"{self.service} {label} timed out after {self.timeout:g}s")
+            except Exception:
+                self.errors += 1
+                raise
+            finally:
+                self.in_flight -= 1
+
+    async def ainvoke(self, runnable, prompt: Any) -> Any:
+        """Call a LangChain model/runnable asynchronously under the service limits"""
+        return await self._run(lambda: runnable.ainvoke(prompt), "model call")
+
+    async def run_blocking(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a synchronous function on the service's thread pool under the same limits
+
+        On timeout the caller gets LLMTimeoutError straight away; the thread
+        itself can't be interrupted and finishes in the background.
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        return await self._run(lambda: loop.run_in_executor(self._executor, call), getattr(func, "__name__", "task"))
+
+    def stats(self) -> Dict[str, Any]:
+        """Limits and counters for the health endpoint"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "timeout_seconds": self.timeout,
+            "calls": self.calls,
+            "in_flight": self.in_flight,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+        }
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+
+class ParseCache:
+    """
+    Disk-backed, size-bounded LRU cache for parsed resume data.
+
+    Entries are keyed by the SHA-256 of the uploaded file bytes combined with a
+    pipeline version tag (model + prompt version), so changing the model or the
+    prompts automatically invalidates previously stored results.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int, version_tag: str):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.version_tag = version_tag
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> size in bytes, oldest first
+        self._total_bytes = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        """Rebuild the LRU order from the files already on disk (oldest access first)."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, name[:-len(".json")], stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._total_bytes += size
+
+        self._evict()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def make_key(self, content: bytes) -> str:
+        """Build the cache key for the given file content"""
+        digest = hashlib.sha256()
+        digest.update(self.version_tag.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(content)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached data for a key, or None on a miss"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+
+            path = self._path(key)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                os.utime(path, None)  # Record the access so the order survives restarts
+            except (OSError, ValueError):
+                # Entry vanished or is corrupt - drop it and treat as a miss
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: str, data: Dict[str, Any]):
+        """Store data for a key, evicting least recently used entries if over budget"""
+        payload = json.dumps(data).encode("utf-8")
+        if len(payload) > self.max_bytes:
+            return
+
+        with self._lock:
+            path = self._path(key)
+            temp_path = f"{path}.tmp"
+            try:
+                with open(temp_path, "wb") as f:
+                    f.write(payload)
+                os.replace(temp_path, path)
+            except OSError as e:
+                print(f"Failed to write parse cache entry: {e}")
+                return
+
+            if key in self._entries:
+                self._total_bytes -= self._entries[key]
+            self._entries[key] = len(payload)
+            self._entries.move_to_end(key)
+            self._total_bytes += len(payload)
+            self._evict()
+
+    def _remove(self, key: str):
+        size = self._entries.pop(key, 0)
+        self._total_bytes -= size
+        try:
+            os.unlink(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size for the health endpoint"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "version": self.version_tag,
+            }
@@ -1,5 +1,6 @@
 # Import required libraries
 import json
+import asyncio
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -10,9 +11,29 @@ from dotenv import load_dotenv
 import uvicorn
 import os
 
+from llm_runtime import LLMRunner
+from skill_taxonomy import skill_index
+from text_compaction import count_tokens
+
 # Load environment variables
 load_dotenv()
 
+# Matching pipeline version - bump MATCHING_PROMPT_VERSION whenever the matching prompt or the
+# SimpleMatchResult schema change; callers use it with the model name to tell stale results apart
+MATCHING_MODEL_NAME = "gemini-2.5-flash"
+MATCHING_PROMPT_VERSION = "1"
+
+# Packed mode: /match-resumes scores several candidates for the same JD in one structured-output
+# call. Packs grow until the input or output token budget (or the candidate cap) is reached.
+# Bump PACKED_PROMPT_VERSION whenever the packed prompt or PackedMatchResults change.
+MATCHING_PACKED_MODE = os.getenv("MATCHING_PACKED_MODE", "0") == "1"
+PACKED_PROMPT_VERSION = "1"
+CROSS_JOB_PROMPT_VERSION = "1"  # One resume against several JDs (/match-resume/jobs), packed with the same budgets
+MATCHING_PACK_INPUT_TOKENS = int(os.getenv("MATCHING_PACK_INPUT_TOKENS", "12000"))
+MATCHING_PACK_OUTPUT_TOKENS = int(os.getenv("MATCHING_PACK_OUTPUT_TOKENS", "8000"))
+MATCHING_PACK_MAX_CANDIDATES = int(os.getenv("MATCHING_PACK_MAX_CANDIDATES", "8"))
+OUTPUT_TOKENS_PER_CANDIDATE = 500  # Rough size of one SimpleMatchResult
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Resume Screening API",
@@ -73,26 +94,159 @@ class MatchingResponse(BaseModel):
     data: Optional[SimpleMatchResult] = Field(None, description="Matching analysis results")
     error: Optional[str] = Field(None, description="Error message if matching failed")
 
+class CandidateResume(BaseModel):
+    """One candidate in a batch matching request"""
+    candidate_id: str = Field(..., description="Caller's identifier for the candidate (e.g. resume ID)")
+    candidate_resume_json: str = Field(..., description="Parsed resume data in JSON format")
+
+class BatchMatchingRequest(BaseModel):
+    """Request model for matching many resumes against one job description"""
+    job_description: str = Field(..., description="Job description text")
+    candidates: List[CandidateResume] = Field(..., description="Candidates to screen against the job description")
+
+class BatchMatchingItem(MatchingResponse):
+    """Matching result for one candidate of a batch"""
+    candidate_id: str = Field(..., description="Identifier from the request")
+
+class BatchMatchingResponse(BaseModel):
+    """Response model for the batch matching endpoint"""
+    results: List[BatchMatchingItem] = Field(..., description="Per-candidate results in request order")
+    total: int = Field(..., description="Number of candidates in the request")
+    succeeded: int = Field(..., description="Number of candidates matched successfully")
+    failed: int = Field(..., description="Number of candidates that failed")
+
+class PackedMatchResult(SimpleMatchResult):
+    """Screening result for one candidate of a packed prompt"""
+    candidate_id: str = Field(..., description="Candidate ID exactly as given in the candidate's header")
+
+class PackedMatchResults(BaseModel):
+    """Screening results for every candidate of a packed prompt"""
+    results: List[PackedMatchResult] = Field(..., description="One result per candidate, in the order given")
+
+class JobToMatch(BaseModel):
+    """One job description in a cross-job matching request"""
+    job_id: str = Field(..., description="Caller's identifier for the job description")
+    job_description: str = Field(..., description="Job description text")
+
+class CrossJobMatchingRequest(BaseModel):
+    """Request model for matching one resume against several job descriptions"""
+    candidate_resume_json: str = Field(..., description="Parsed resume data in JSON format")
+    jobs: List[JobToMatch] = Field(..., description="Job descriptions to screen the candidate against")
+
+class CrossJobMatchingItem(MatchingResponse):
+    """Matching result for one job description of a cross-job request"""
+    job_id: str = Field(..., description="Identifier from the request")
+
+class CrossJobMatchingResponse(BaseModel):
+    """Response model for the cross-job matching endpoint"""
+    results: List[CrossJobMatchingItem] = Field(..., description="Per-job results in request order")
+    total: int = Field(..., description="Number of job descriptions in the request")
+    succeeded: int = Field(..., description="Number of job descriptions matched successfully")
+    failed: int = Field(..., description="Number of job descriptions that failed")
+
+class CrossJobMatchResult(SimpleMatchResult):
+    """Screening result of the candidate for one job of a cross-job prompt"""
+    job_id: str = Field(..., description="Job ID exactly as given in the job's header")
+
+class CrossJobMatchResults(BaseModel):
+    """Screening results of the candidate for every job of a cross-job prompt"""
+    results: List[CrossJobMatchResult] = Field(..., description="One result per job, in the order given")
+
+
+class JDRequirements(BaseModel):
+    """Structured requirements extracted once from a job description"""
+    role_summary: str = Field(..., description="One sentence describing the role (max 200 chars)")
+    must_have_skills: List[str] = Field(..., description="Skills the JD explicitly requires (max 15)")
+    nice_to_have_skills: List[str] = Field(..., description="Skills the JD lists as preferred or a plus (max 10)")
+    seniority: str = Field(..., description="Intern/Junior/Mid/Senior/Lead/Principal/Manager")
+    min_years_experience: float = Field(..., description="Minimum years of experience required, 0 if not stated")
+    degree_level: str = Field(..., description="None/Diploma/Bachelor's/Master's/PhD - minimum degree required")
+    key_responsibilities: List[str] = Field(..., description="Top 5 responsibilities, max 100 chars each")
+
+class JDAnalysis(JDRequirements):
+    """JD requirements plus canonical skill IDs resolved locally through the skill taxonomy"""
+    must_have_skill_ids: List[str] = Field(default_factory=list, description="Taxonomy IDs of the must-have skills")
+    nice_to_have_skill_ids: List[str] = Field(default_factory=list, description="Taxonomy IDs of the nice-to-have skills")
+    skill_names: Dict[str, str] = Field(default_factory=dict, description="Display name of every skill ID above")
+    unresolved_must_have_skills: List[str] = Field(default_factory=list, description="Must-have skills outside the taxonomy")
+    unresolved_nice_to_have_skills: List[str] = Field(default_factory=list, description="Nice-to-have skills outside the taxonomy")
+
+    @classmethod
+    def from_requirements(cls, requirements: JDRequirements) -> "JDAnalysis":
+        must_have = skill_index.skill_ids(requirements.must_have_skills)
+        nice_to_have = [skill_id for skill_id in skill_index.skill_ids(requirements.nice_to_have_skills)
+                        if skill_id not in must_have]
+        return cls(
+            **requirements.model_dump(),
+            must_have_skill_ids=must_have,
+            nice_to_have_skill_ids=nice_to_have,
+            skill_names={skill_id: skill_index.name(skill_id) for skill_id in must_have + nice_to_have},
+            # Skills the taxonomy doesn't know are kept so they are still matched by name
+            unresolved_must_have_skills=[skill for skill in requirements.must_have_skills
+                                         if skill and not skill_index.skill_ids([skill])],
+            unresolved_nice_to_have_skills=[skill for skill in requirements.nice_to_have_skills
+                                            if skill and not skill_index.skill_ids([skill])],
+        )
+
+class JDAnalysisRequest(BaseModel):
+    """Request model for the job description analysis endpoint"""
+    job_description: str = Field(..., description="Job description text")
+
+class JDAnalysisResponse(BaseModel):
+    """Response model for the job description analysis endpoint"""
+    success: bool = Field(..., description="Whether the analysis was successful")
+    data: Optional[JDAnalysis] = Field(None, description="Structured job requirements")
+    error: Optional[str] = Field(None, description="Error message if analysis failed")
+
 
 # Initialize the AI model
 model = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",  # Using Gemini 1.5 Flash for fast analysis
+    model=MATCHING_MODEL_NAME,  # Using Gemini Flash for fast analysis
     temperature=0,  # Low temperature for consistent, analytical responses
 )
 
 structured_matcher = model.with_structured_output(SimpleMatchResult)
-
-
-def create_matching_prompt(job_description: str, candidate_resume_json: str) -> str:
-    """Create a simplified matching prompt focused on initial interview screening"""
+structured_packed_matcher = model.with_structured_output(PackedMatchResults)
+structured_cross_job_matcher = model.with_structured_output(CrossJobMatchResults)
+structured_jd_analyzer = model.with_structured_output(JDRequirements)
+
+# Async model calls with this service's concurrency limit and timeout
+llm_runner = LLMRunner.from_env("matching")
+
+# Matching call counters and estimated token usage (reported by /health, read by benchmark_matching.py)
+matching_stats = {
+    "single_calls": 0,
+    "packed_calls": 0,
+    "cross_job_calls": 0,
+    "pack_splits": 0,
+    "candidates": 0,
+    "prompt_tokens": 0,
+    "output_tokens": 0,
+}
+
+
+def create_jd_analysis_prompt(job_description: str) -> str:
+    """Create the prompt that turns a job description into structured requirements"""
     return f"""
-You are an expert HR screening specialist. Your task is to quickly assess if a candidate should be invited for an initial interview (informal conversation, not technical).
+You are an expert technical recruiter. Extract the hiring requirements from the job description below.
+
+RULES:
+- must_have_skills: only skills the JD states as required, mandatory or essential
+- nice_to_have_skills: skills described as preferred, a plus, bonus or desirable
+- Use short canonical skill names (e.g. "Python", "AWS", "Stakeholder Management"), no duplicates
+- seniority: infer from the title and responsibilities when not stated
+- min_years_experience: the lowest number of years mentioned, 0 if none
+- degree_level: the minimum degree required, "None" if not mentioned
+- Do not invent requirements that are not supported by the text
 
 JOB DESCRIPTION:
 {job_description}
+"""
 
-CANDIDATE RESUME (Parsed JSON):
-{candidate_resume_json}
+
+# Screening methodology shared by every matching prompt
+SCREENING_INSTRUCTIONS = """
+You are an expert HR screening specialist. Your task is to quickly assess if a candidate should be invited for an initial interview (informal conversation, not technical).
 
 🎯 SIMPLIFIED SCREENING METHODOLOGY:
 
@@ -214,6 +368,263 @@ REMEMBER: This screening is to identify candidates worth a brief conversation, n
 """
 
 
+def create_jd_context(job_description: str) -> str:
+    """
+    Build the candidate-independent part of the matching prompt
+    
+    The screening instructions and the job description come first so every
+    candidate scored against the same JD shares an identical prompt prefix.
+    """
+    return f"""{SCREENING_INSTRUCTIONS}
+JOB DESCRIPTION:
+{job_description}
+"""
+
+
+def create_candidate_prompt(jd_context: str, candidate_resume_json: str) -> str:
+    """Append one candidate's resume to a prepared JD context"""
+    return f"""{jd_context}
+CANDIDATE RESUME (Parsed JSON):
+{candidate_resume_json}
+"""
+
+
+def create_matching_prompt(job_description: str, candidate_resume_json: str) -> str:
+    """Create a simplified matching prompt focused on initial interview screening"""
+    return create_candidate_prompt(create_jd_context(job_description), candidate_resume_json)
+
+
+def create_packed_prompt(jd_context: str, candidates: List[CandidateResume]) -> str:
+    """Append several candidates' resumes to a prepared JD context, each under its own ID header"""
+    sections = [
+        f"=== CANDIDATE candidate_id: {candidate.candidate_id} ===\n{candidate.candidate_resume_json}"
+        for candidate in candidates
+    ]
+    return f"""{jd_context}
+CANDIDATES TO SCREEN: {len(candidates)}
+Screen every candidate below independently against the job description, applying the methodology above to each one as if it were the only candidate. Do not compare or rank the candidates against each other.
+Return exactly one result per candidate, in the order given, with candidate_id copied exactly from the candidate's header.
+
+""" + "\n\n".join(sections) + "\n"
+
+
+def pack_by_budget(items: list, base_tokens: int, item_tokens) -> List[list]:
+    """
+    Split items into consecutive packs that fit the packed prompt budgets
+    
+    A pack closes when the next item would push the prompt past
+    MATCHING_PACK_INPUT_TOKENS, or when one more result would exceed the
+    output budget or MATCHING_PACK_MAX_CANDIDATES. Large items therefore
+    give smaller packs; an item that is too large on its own gets a pack
+    of one.
+    
+    Args:
+        items: Candidates or jobs to pack
+        base_tokens: Tokens of the prompt without any items
+        item_tokens: Function returning the prompt tokens one item adds
+    """
+    max_size = max(1, min(MATCHING_PACK_MAX_CANDIDATES, MATCHING_PACK_OUTPUT_TOKENS // OUTPUT_TOKENS_PER_CANDIDATE))
+    packs, current, tokens = [], [], base_tokens
+    for item in items:
+        cost = item_tokens(item) + 15  # Header line
+        if current and (tokens + cost > MATCHING_PACK_INPUT_TOKENS or len(current) >= max_size):
+            packs.append(current)
+            current, tokens = [], base_tokens
+        current.append(item)
+        tokens += cost
+    if current:
+        packs.append(current)
+    return packs
+
+
+def pack_candidates(jd_context: str, candidates: List[CandidateResume]) -> List[List[CandidateResume]]:
+    """Split candidates into packs for one JD (see pack_by_budget)"""
+    base_tokens = count_tokens(create_packed_prompt(jd_context, []))
+    return pack_by_budget(candidates, base_tokens, lambda candidate: count_tokens(candidate.candidate_resume_json))
+
+
+def check_packed_results(response: PackedMatchResults, candidates: List[CandidateResume]) -> Dict[str, SimpleMatchResult]:
+    """
+    Validate a packed response against its candidates
+    
+    Raises:
+        ValueError: if a candidate is missing, duplicated or unknown
+    """
+    if response is None:
+        raise ValueError("Model returned no packed results")
+    expected = [candidate.candidate_id for candidate in candidates]
+    found = {}
+    for item in response.results:
+        candidate_id = item.candidate_id.strip()
+        if candidate_id not in expected:
+            raise ValueError(f"Unknown candidate_id {candidate_id!r} in packed results")
+        if candidate_id in found:
+            raise ValueError(f"Duplicate result for candidate_id {candidate_id!r}")
+        found[candidate_id] = SimpleMatchResult(**item.model_dump(exclude={"candidate_id"}))
+    missing = [candidate_id for candidate_id in expected if candidate_id not in found]
+    if missing:
+        raise ValueError(f"Packed results missing candidates {missing}")
+    return found
+
+
+async def match_candidate(jd_context: str, candidate: CandidateResume) -> BatchMatchingItem:
+    """Screen one candidate with its own model call"""
+    try:
+        if not candidate.candidate_resume_json.strip():
+            raise ValueError("Candidate resume JSON cannot be empty")
+        prompt = create_candidate_prompt(jd_context, candidate.candidate_resume_json)
+        matching_stats["single_calls"] += 1
+        matching_stats["prompt_tokens"] += count_tokens(prompt)
+        response = await llm_runner.ainvoke(structured_matcher, prompt)
+        matching_stats["candidates"] += 1
+        matching_stats["output_tokens"] += count_tokens(response.model_dump_json())
+        return BatchMatchingItem(candidate_id=candidate.candidate_id, success=True, data=response)
+    except Exception as e:
+        return BatchMatchingItem(
+            candidate_id=candidate.candidate_id,
+            success=False,
+            error=f"Error processing resume matching: {str(e)}"
+        )
+
+
+async def match_pack(jd_context: str, candidates: List[CandidateResume]) -> List[BatchMatchingItem]:
+    """
+    Screen a pack of candidates with one structured-output call
+    
+    If the call fails or the results don't validate (missing, duplicate or
+    unknown candidate IDs), the pack is split in half and each half retried;
+    single candidates fall back to the one-candidate prompt.
+    
+    Returns:
+        list: One BatchMatchingItem per candidate, in pack order
+    """
+    if len(candidates) == 1:
+        return [await match_candidate(jd_context, candidates[0])]
+    
+    prompt = create_packed_prompt(jd_context, candidates)
+    matching_stats["packed_calls"] += 1
+    matching_stats["prompt_tokens"] += count_tokens(prompt)
+    try:
+        response = await llm_runner.ainvoke(structured_packed_matcher, prompt)
+        results = check_packed_results(response, candidates)
+    except Exception as e:
+        matching_stats["pack_splits"] += 1
+        print(f"Packed matching of {len(candidates)} candidates failed ({str(e)}); splitting and retrying")
+        middle = len(candidates) // 2
+        first, second = await asyncio.gather(
+            match_pack(jd_context, candidates[:middle]),
+            match_pack(jd_context, candidates[middle:]),
+        )
+        return first + second
+    
+    matching_stats["candidates"] += len(candidates)
+    matching_stats["output_tokens"] += count_tokens(response.model_dump_json())
+    return [
+        BatchMatchingItem(candidate_id=candidate.candidate_id, success=True, data=results[candidate.candidate_id])
+        for candidate in candidates
+    ]
+
+
+async def match_packed(jd_context: str, candidates: List[CandidateResume]) -> List[BatchMatchingItem]:
+    """Screen candidates in token-budgeted packs, concurrently; results keep the request order"""
+    valid = [candidate for candidate in candidates if candidate.candidate_resume_json.strip()]
+    packs = pack_candidates(jd_context, valid)
+    print(f"Packed {len(valid)} candidates into {len(packs)} prompt(s)")
+    packed_results = iter([item for pack in await asyncio.gather(*(match_pack(jd_context, pack) for pack in packs))
+                           for item in pack])
+    return [
+        next(packed_results) if candidate.candidate_resume_json.strip()
+        else BatchMatchingItem(
+            candidate_id=candidate.candidate_id,
+            success=False,
+            error="Error processing resume matching: Candidate resume JSON cannot be empty"
+        )
+        for candidate in candidates
+    ]
+
+
+def create_cross_job_prompt(candidate_resume_json: str, jobs: List[JobToMatch]) -> str:
+    """Screen one candidate against several job descriptions, each under its own ID header"""
+    sections = [f"=== JOB job_id: {job.job_id} ===\n{job.job_description}" for job in jobs]
+    return f"""{SCREENING_INSTRUCTIONS}
+CANDIDATE RESUME (Parsed JSON):
+{candidate_resume_json}
+
+JOBS TO SCREEN AGAINST: {len(jobs)}
+Screen the candidate against every job below independently, applying the methodology above to each job as if it were the only one. Do not compare the jobs with each other; score each on its own requirements.
+Return exactly one result per job, in the order given, with job_id copied exactly from the job's header.
+
+""" + "\n\n".join(sections) + "\n"
+
+
+def check_cross_job_results(response: CrossJobMatchResults, jobs: List[JobToMatch]) -> Dict[str, SimpleMatchResult]:
+    """
+    Validate a cross-job response against its jobs
+    
+    Raises:
+        ValueError: if a job is missing, duplicated or unknown
+    """
+    if response is None:
+        raise ValueError("Model returned no cross-job results")
+    expected = [job.job_id for job in jobs]
+    found = {}
+    for item in response.results:
+        job_id = item.job_id.strip()
+        if job_id not in expected:
+            raise ValueError(f"Unknown job_id {job_id!r} in cross-job results")
+        if job_id in found:
+            raise ValueError(f"Duplicate result for job_id {job_id!r}")
+        found[job_id] = SimpleMatchResult(**item.model_dump(exclude={"job_id"}))
+    missing = [job_id for job_id in expected if job_id not in found]
+    if missing:
+        raise ValueError(f"Cross-job results missing jobs {missing}")
+    return found
+
+
+async def match_job_pack(candidate_resume_json: str, jobs: List[JobToMatch]) -> List[CrossJobMatchingItem]:
+    """
+    Screen the candidate against a pack of jobs with one structured-output call
+    
+    Splits and retries like match_pack; a single job falls back to the
+    regular one-candidate prompt.
+    
+    Returns:
+        list: One CrossJobMatchingItem per job, in pack order
+    """
+    if len(jobs) == 1:
+        job = jobs[0]
+        result = await match_candidate(create_jd_context(job.job_description),
+                                       CandidateResume(candidate_id=job.job_id, candidate_resume_json=candidate_resume_json))
+        return [CrossJobMatchingItem(job_id=job.job_id, success=result.success, data=result.data, error=result.error)]
+    
+    prompt = create_cross_job_prompt(candidate_resume_json, jobs)
+    matching_stats["cross_job_calls"] += 1
+    matching_stats["prompt_tokens"] += count_tokens(prompt)
+    try:
+        response = await llm_runner.ainvoke(structured_cross_job_matcher, prompt)
+        results = check_cross_job_results(response, jobs)
+    except Exception as e:
+        matching_stats["pack_splits"] += 1
+        print(f"Cross-job matching against {len(jobs)} jobs failed ({str(e)}); splitting and retrying")
+        middle = len(jobs) // 2
+        first, second = await asyncio.gather(
+            match_job_pack(candidate_resume_json, jobs[:middle]),
+            match_job_pack(candidate_resume_json, jobs[middle:]),
+        )
+        return first + second
+    
+    matching_stats["candidates"] += len(jobs)
+    matching_stats["output_tokens"] += count_tokens(response.model_dump_json())
+    return [CrossJobMatchingItem(job_id=job.job_id, success=True, data=results[job.job_id]) for job in jobs]
+
+
+def matching_prompt_version() -> str:
+    """Prompt version reported to callers; packed results come from a different prompt"""
+    if MATCHING_PACKED_MODE:
+        return f"{MATCHING_PROMPT_VERSION}+packed.{PACKED_PROMPT_VERSION}"
+    return MATCHING_PROMPT_VERSION
+
+
 @app.post("/match-resume", response_model=MatchingResponse)
 async def match_resume(request: MatchingRequest):
     """
@@ -237,7 +648,7 @@ async def match_resume(request: MatchingRequest):
         full_prompt = create_matching_prompt(request.job_description, request.candidate_resume_json)
         
         # Process the matching request
-        response = structured_matcher.invoke(full_prompt)
+        response = await llm_runner.ainvoke(structured_matcher, full_prompt)
         
         # Return successful response
         return MatchingResponse(
@@ -256,10 +667,123 @@ async def match_resume(request: MatchingRequest):
         )
 
 
+@app.post("/analyze-jd", response_model=JDAnalysisResponse)
+async def analyze_jd(request: JDAnalysisRequest):
+    """
+    Extract structured requirements from a job description
+    
+    Callers store the result and send its compact form to the matching,
+    question and evaluation services instead of the full JD text.
+    
+    Args:
+        request: JDAnalysisRequest containing the job description text
+        
+    Returns:
+        JDAnalysisResponse with the structured requirements or error message
+    """
+    if not request.job_description.strip():
+        raise HTTPException(status_code=400, detail="Job description cannot be empty")
+    
+    try:
+        response = await llm_runner.ainvoke(structured_jd_analyzer, create_jd_analysis_prompt(request.job_description))
+        return JDAnalysisResponse(success=True, data=JDAnalysis.from_requirements(response), error=None)
+    except Exception as e:
+        return JDAnalysisResponse(
+            success=False,
+            data=None,
+            error=f"Error analyzing job description: {str(e)}"
+        )
+
+
+@app.post("/match-resumes", response_model=BatchMatchingResponse)
+async def match_resumes(request: BatchMatchingRequest):
+    """
+    Screen many candidates against one job description in a single request
+    
+    The JD side of the prompt is built once and shared by every candidate;
+    the per-candidate model calls run concurrently, bounded by the service's
+    LLM concurrency limit. With MATCHING_PACKED_MODE=1 several candidates
+    share each model call (see match_packed).
+    
+    Args:
+        request: BatchMatchingRequest with the job description and candidate JSONs
+        
+    Returns:
+        BatchMatchingResponse with one result per candidate, in request order
+    """
+    if not request.job_description.strip():
+        raise HTTPException(status_code=400, detail="Job description cannot be empty")
+    
+    jd_context = create_jd_context(request.job_description)
+    
+    print(f"Matching {len(request.candidates)} candidates against one job description")
+    if MATCHING_PACKED_MODE:
+        results = await match_packed(jd_context, request.candidates)
+    else:
+        results = await asyncio.gather(*(match_candidate(jd_context, c) for c in request.candidates))
+    succeeded = sum(1 for r in results if r.success)
+    
+    return BatchMatchingResponse(
+        results=results,
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded
+    )
+
+
+@app.post("/match-resume/jobs", response_model=CrossJobMatchingResponse)
+async def match_resume_jobs(request: CrossJobMatchingRequest):
+    """
+    Screen one candidate against several job descriptions
+    
+    The resume appears once per prompt and the jobs are packed under the
+    same token budgets as packed candidate matching, so finding the best
+    role for a candidate costs a few calls instead of one per job.
+    
+    Args:
+        request: CrossJobMatchingRequest with the resume JSON and the job descriptions
+        
+    Returns:
+        CrossJobMatchingResponse with one result per job, in request order
+    """
+    if not request.candidate_resume_json.strip():
+        raise HTTPException(status_code=400, detail="Candidate resume JSON cannot be empty")
+    
+    jobs = [job for job in request.jobs if job.job_description.strip()]
+    base_tokens = count_tokens(create_cross_job_prompt(request.candidate_resume_json, []))
+    packs = pack_by_budget(jobs, base_tokens, lambda job: count_tokens(job.job_description))
+    print(f"Matching one candidate against {len(jobs)} job descriptions in {len(packs)} prompt(s)")
+    
+    packed_results = iter([item for pack in await asyncio.gather(
+        *(match_job_pack(request.candidate_resume_json, pack) for pack in packs)) for item in pack])
+    results = [
+        next(packed_results) if job.job_description.strip()
+        else CrossJobMatchingItem(job_id=job.job_id, success=False, error="Job description cannot be empty")
+        for job in request.jobs
+    ]
+    succeeded = sum(1 for r in results if r.success)
+    
+    return CrossJobMatchingResponse(
+        results=results,
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded
+    )
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "resume-screening-api"}
+    return {
+        "status": "healthy",
+        "service": "resume-screening-api",
+        "model": MATCHING_MODEL_NAME,
+        "prompt_version": matching_prompt_version(),
+        "cross_job_prompt_version": f"{MATCHING_PROMPT_VERSION}+cross.{CROSS_JOB_PROMPT_VERSION}",
+        "packed_mode": MATCHING_PACKED_MODE,
+        "matching": matching_stats,
+        "llm": llm_runner.stats()
+    }
 
 
 @app.get("/")
@@ -271,6 +795,9 @@ async def root():
         "description": "Simplified AI screening for initial interview selection",
         "endpoints": {
             "/match-resume": "POST - Screen resume for initial interview consideration",
+            "/match-resumes": "POST - Screen many resumes against one job description",
+            "/match-resume/jobs": "POST - Screen one resume against several job descriptions",
+            "/analyze-jd": "POST - Extract structured requirements from a job description",
             "/health": "GET - Health check",
             "/docs": "GET - API documentation"
         }
@@ -0,0 +1,271 @@
+import re
+from datetime import date
+from typing import List, Optional, Tuple
+
+from skill_taxonomy import skill_index
+
+# Work experience entries that should live in other sections (matched as whole words)
+VOLUNTEER_KEYWORDS = ["volunteer", "volunteers", "volunteering", "community service", "ambassador", "student chapter"]
+# Only checked in the job title and employment type, as employers are named "Club Med" or "... Society" too
+VOLUNTEER_ROLE_KEYWORDS = ["club", "clubs", "society", "societies"]
+CERTIFICATION_KEYWORDS = ["certification", "certificate", "online course", "bootcamp"]
+
+# Job title keywords that mark an executive role regardless of tenure
+EXECUTIVE_TITLE_PATTERN = re.compile(r"\b(chief|ceo|cto|cfo|coo|cio|vice president|vp|director|head of)\b")
+
+PRESENT_WORDS = {"present", "current", "currently", "ongoing", "now", "till date", "to date", "today"}
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+
+def parse_date(value: Optional[str]) -> Optional[Tuple[int, Optional[int]]]:
+    """
+    Parse a resume date string into (year, month)
+
+    Returns (year, None) when only the year is known, and None when the
+    value can't be understood.
+    """
+    if not value:
+        return None
+
+    text = value.strip().lower().replace(",", " ").replace(".", " ")
+    if not text:
+        return None
+
+    # "11/2023", "11-2023", "1/2023"
+    match = re.fullmatch(r"(\d{1,2})\s*[/\-]\s*(\d{4})", text)
+    if match and 1 <= int(match.group(1)) <= 12:
+        return int(match.group(2)), int(match.group(1))
+
+    # "2023-11", "2023/11"
+    match = re.fullmatch(r"(\d{4})\s*[/\-]\s*(\d{1,2})", text)
+    if match and 1 <= int(match.group(2)) <= 12:
+        return int(match.group(1)), int(match.group(2))
+
+    # "Nov 2023", "November 2023"
+    match = re.fullmatch(r"([a-z]+)\s+(\d{4})", text)
+    if match and match.group(1)[:3] in MONTHS:
+        return int(match.group(2)), MONTHS[match.group(1)[:3]]
+
+    # "2023"
+    match = re.fullmatch(r"(\d{4})", text)
+    if match:
+        return int(match.group(1)), None
+
+    return None
+
+
+def is_present(value: Optional[str]) -> bool:
+    """Check if an end date means the role is still ongoing"""
+    return bool(value) and value.strip().lower() in PRESENT_WORDS
+
+
+def normalize_date(value: Optional[str]) -> Tuple[str, bool]:
+    """
+    Convert a date to MM/YYYY (or YYYY when the month is unknown)
+
+    Returns the normalized value and whether it could be understood. Values
+    that can't be parsed are returned unchanged.
+    """
+    if not value or not value.strip():
+        return "", True
+    if is_present(value):
+        return "Present", True
+
+    parsed = parse_date(value)
+    if not parsed:
+        return value, False
+
+    year, month = parsed
+    if month is None:
+        return str(year), True
+    return f"{month:02d}/{year}", True
+
+
+def _month_index(parsed: Tuple[int, Optional[int]]) -> int:
+    year, month = parsed
+    return year * 12 + ((month or 1) - 1)
+
+
+def employment_interval(start_date: str, end_date: str, today: date) -> Optional[Tuple[int, int]]:
+    """
+    Return (start, end) as month indexes, counting both endpoint months
+
+    A blank end date is unknown rather than ongoing, so the role isn't
+    counted (only "Present"-like values run until today).
+    """
+    start = parse_date(start_date)
+    if not start or not (end_date or "").strip():
+        return None
+
+    if is_present(end_date):
+        end_index = today.year * 12 + today.month - 1
+    else:
+        end = parse_date(end_date)
+        if not end:
+            return None
+        end_index = _month_index(end)
+
+    start_index = _month_index(start)
+    if end_index < start_index:
+        return None
+    return start_index, end_index
+
+
+def total_experience_months(intervals: List[Tuple[int, int]]) -> int:
+    """Total months covered by the intervals, without double counting overlaps"""
+    total = 0
+    current_start, current_end = None, None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end + 1:
+            if current_end is not None:
+                total += current_end - current_start + 1
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start + 1
+    return total
+
+
+def normalize_skill(skill: str) -> str:
+    """Map a skill to its canonical taxonomy name, or return it trimmed if unknown"""
+    cleaned = " ".join(skill.split())
+    skill_id = skill_index.lookup(cleaned)
+    return skill_index.name(skill_id) if skill_id else cleaned
+
+
+def resume_skill_ids(resume) -> List[str]:
+    """
+    Canonical skill IDs for a parsed resume
+
+    Resolves the skill lists (skills, skills used in each role, project
+    technologies) through the taxonomy and scans responsibilities and project
+    descriptions for further mentions.
+    """
+    skills = list(resume.skills)
+    texts = []
+    for exp in resume.work_experience:
+        skills.extend(exp.skills_used)
+        texts.extend(exp.responsibilities)
+    for project in resume.projects:
+        skills.extend(project.technologies_used)
+        texts.append(project.description)
+    return skill_index.skill_ids(skills, texts)
+
+
+def normalize_skills(skills: Optional[List[str]]) -> List[str]:
+    """Expand aliases and remove duplicate skills (case-insensitive, order kept)"""
+    seen = set()
+    normalized = []
+    for skill in skills or []:
+        if not skill or not skill.strip():
+            continue
+        name = normalize_skill(skill)
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            normalized.append(name)
+    return normalized
+
+
+def career_level_for(years: int, job_titles: List[str]) -> str:
+    """Assign a career level from years of experience and job titles"""
+    titles = " ".join(title.lower() for title in job_titles if title)
+    if EXECUTIVE_TITLE_PATTERN.search(titles):
+        return "Executive"
+    if years >= 8:
+        return "Senior-level"
+    if years >= 3:
+        return "Mid-level"
+    return "Entry-level"
+
+
+def _contains_keyword(text: str, keywords: List[str]) -> bool:
+    text = (text or "").lower()
+    return any(re.search(rf"\b{re.escape(keyword)}\b", text) for keyword in keywords)
+
+
+def normalize_resume(resume, today: Optional[date] = None) -> List[str]:
+    """
+    Apply the mechanical quality-control rules to parsed resume data in place
+
+    Standardizes dates, computes durations and years of experience, expands
+    skill aliases, removes duplicate skills and assigns the career level.
+
+    Args:
+        resume: ResumeData instance from the initial parse
+        today: Reference date for "Present" end dates (defaults to today)
+
+    Returns:
+        List[str]: Problems the rules can't fix (e.g. misclassified sections).
+        An empty list means no LLM refinement is needed.
+    """
+    today = today or date.today()
+    issues = []
+
+    # Skills
+    resume.skills = normalize_skills(resume.skills)
+
+    # Work experience
+    intervals = []
+    for i, exp in enumerate(resume.work_experience):
+        label = f"work_experience[{i}] ({exp.job_title or 'untitled'} at {exp.company_name or 'unknown'})"
+
+        role = f"{exp.job_title} {exp.employment_type or ''}"
+        if (_contains_keyword(f"{role} {exp.company_name}", VOLUNTEER_KEYWORDS)
+                or _contains_keyword(role, VOLUNTEER_ROLE_KEYWORDS)):
+            issues.append(f"{label} looks like volunteer/club activity and belongs in extracurricular")
+        elif _contains_keyword(exp.job_title, CERTIFICATION_KEYWORDS):
+            issues.append(f"{label} looks like a certification or course and belongs in certifications")
+        if not exp.job_title and not exp.company_name:
+            issues.append(f"work_experience[{i}] has neither a job title nor a company name")
+
+        exp.start_date, start_ok = normalize_date(exp.start_date)
+        exp.end_date, end_ok = normalize_date(exp.end_date)
+        if not (start_ok and end_ok):
+            issues.append(f"{label} has dates that could not be standardized")
+        elif exp.start_date and not exp.end_date:
+            issues.append(f"{label} has no end date (use Present if the role is ongoing)")
+
+        interval = employment_interval(exp.start_date, exp.end_date, today)
+        if interval:
+            exp.duration_months = interval[1] - interval[0] + 1
+            intervals.append(interval)
+
+        exp.skills_used = normalize_skills(exp.skills_used)
+
+    if intervals:
+        resume.professional_summary.years_of_experience = total_experience_months(intervals) // 12
+
+    resume.professional_summary.career_level = career_level_for(
+        resume.professional_summary.years_of_experience,
+        [exp.job_title for exp in resume.work_experience],
+    )
+
+    # Education
+    for i, edu in enumerate(resume.education):
+        edu.start_date, start_ok = normalize_date(edu.start_date)
+        edu.end_date, end_ok = normalize_date(edu.end_date)
+        if not (start_ok and end_ok):
+            issues.append(f"education[{i}] ({edu.degree_title or 'untitled'}) has dates that could not be standardized")
+
+    # Projects
+    for project in resume.projects:
+        project.technologies_used = normalize_skills(project.technologies_used)
+
+    # Certifications
+    for cert in resume.certifications:
+        cert.issue_date, _ = normalize_date(cert.issue_date)
+        if cert.expiry_date and cert.expiry_date.strip().lower() != "no expiry":
+            cert.expiry_date, _ = normalize_date(cert.expiry_date)
+
+    # Extracurricular
+    for activity in resume.extracurricular:
+        activity.start_date, _ = normalize_date(activity.start_date)
+        activity.end_date, _ = normalize_date(activity.end_date)
+        activity.skills_gained = normalize_skills(activity.skills_gained)
+
+    return issues
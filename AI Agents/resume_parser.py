@@ -1,20 +1,48 @@
 import json
-import tempfile
 import os
+import asyncio
 from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.prompts import PromptTemplate
 from pydantic import BaseModel, Field
 from langchain_core.output_parsers import JsonOutputParser
 from typing import List, Optional, Dict, Any
-from langchain_community.document_loaders import PDFPlumberLoader, Docx2txtLoader, UnstructuredWordDocumentLoader
 import uvicorn
 
 from dotenv import load_dotenv
+from parse_cache import ParseCache
+from extraction_pool import ExtractionPool
+from llm_runtime import LLMRunner
+from resume_normalizer import normalize_resume, resume_skill_ids
+from text_compaction import compact_resume_pages
 
 load_dotenv()  # Load .env file
 
+# Parsing pipeline version - bump PARSER_PROMPT_VERSION whenever the prompts, the text compaction,
+# the rule-based normalization or the ResumeData schema change so cached results from the old pipeline are ignored
+PARSER_MODEL_NAME = "gemini-2.5-flash"
+PARSER_PROMPT_VERSION = "4"
+
+# Parse cache configuration
+PARSE_CACHE_DIR = os.getenv("PARSE_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".parse_cache"))
+PARSE_CACHE_MAX_MB = int(os.getenv("PARSE_CACHE_MAX_MB", "256"))
+
+# Maximum number of files parsed at the same time by /parse-resumes/batch
+PARSE_BATCH_CONCURRENCY = int(os.getenv("PARSE_BATCH_CONCURRENCY", "4"))
+
+# Upload size caps - oversized files are rejected before being read into memory
+MAX_UPLOAD_FILE_MB = int(os.getenv("MAX_UPLOAD_FILE_MB", "10"))
+MAX_UPLOAD_BATCH_MB = int(os.getenv("MAX_UPLOAD_BATCH_MB", "500"))
+
+# Text extraction process pool configuration
+EXTRACTION_POOL_SIZE = int(os.getenv("EXTRACTION_POOL_SIZE", str(min(4, os.cpu_count() or 1))))
+EXTRACTION_RECYCLE_AFTER = int(os.getenv("EXTRACTION_RECYCLE_AFTER", "200"))  # 0 disables recycling
+
+# Hard limit on the estimated tokens of resume text sent to the model (0 disables it)
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", "6000"))
+
 class BasicInfo(BaseModel):
     """Basic contact and personal information"""
     full_name: str = Field("", description="Complete full name")
@@ -104,12 +132,35 @@ class ResumeData(BaseModel):
     extracurricular: List[ExtracurricularActivity] = Field(default_factory=list, description="Extracurricular activities including volunteer work")
     additional_info: AdditionalInfo = Field(default_factory=AdditionalInfo, description="Additional candidate information")
 
+class ParsedResume(ResumeData):
+    """Parsed resume data plus fields derived locally after parsing (not part of the model's schema)"""
+    skill_ids: List[str] = Field(default_factory=list, description="Canonical skill taxonomy IDs found in the resume")
+
+    @classmethod
+    def from_resume_data(cls, data: ResumeData) -> "ParsedResume":
+        return cls(**data.model_dump(), skill_ids=resume_skill_ids(data))
+
 class ParseResponse(BaseModel):
     """Response model for the API"""
     success: bool = Field(..., description="Whether parsing was successful")
-    data: Optional[ResumeData] = Field(None, description="Parsed resume data")
+    data: Optional[ParsedResume] = Field(None, description="Parsed resume data")
     error: Optional[str] = Field(None, description="Error message if parsing failed")
     filename: Optional[str] = Field(None, description="Original filename")
+    tokens_before: Optional[int] = Field(None, description="Estimated tokens of the extracted text before compaction")
+    tokens_after: Optional[int] = Field(None, description="Estimated tokens of the compacted text sent to the model")
+
+class StreamParseLine(ParseResponse):
+    """One NDJSON line of the streaming parse endpoint"""
+    index: int = Field(..., description="Position of the file in the upload")
+    completed: int = Field(..., description="Number of files finished so far, including this one")
+    total: int = Field(..., description="Number of files in the upload")
+
+class BatchParseResponse(BaseModel):
+    """Response model for the batch parsing endpoint"""
+    results: List[ParseResponse] = Field(default_factory=list, description="Per-file results in upload order")
+    total: int = Field(0, description="Number of files received")
+    succeeded: int = Field(0, description="Number of files parsed successfully")
+    failed: int = Field(0, description="Number of files that failed to parse")
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -129,18 +180,44 @@ app.add_middleware(
 
 # Initialize the AI model
 model = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash",
+    model=PARSER_MODEL_NAME,
     temperature=0.1,
 )
 
 structured_model = model.with_structured_output(ResumeData)
 
-def process_resume_file(file_path: str) -> ResumeData:
+# Async model calls with this service's concurrency limit and timeout
+llm_runner = LLMRunner.from_env("parser")
+
+# Content-addressed cache so re-uploads of the same file skip the LLM pipeline
+parse_cache = ParseCache(
+    cache_dir=PARSE_CACHE_DIR,
+    max_bytes=PARSE_CACHE_MAX_MB * 1024 * 1024,
+    version_tag=f"{PARSER_MODEL_NAME}:{PARSER_PROMPT_VERSION}:{RESUME_TOKEN_BUDGET}",
+)
+
+# Shared limit on concurrent batch parses so bulk uploads can't flood the Gemini quota
+parse_semaphore = asyncio.Semaphore(PARSE_BATCH_CONCURRENCY)
+
+# Worker processes that extract text from uploads, started (and warmed) with the app
+extraction_pool = ExtractionPool(size=EXTRACTION_POOL_SIZE, recycle_after=EXTRACTION_RECYCLE_AFTER)
+
+@app.on_event("startup")
+async def warm_extraction_pool():
+    """Start the extraction workers before the first upload arrives"""
+    await asyncio.to_thread(extraction_pool.warm_up)
+    print(f"Extraction pool ready with {extraction_pool.size} workers")
+
+@app.on_event("shutdown")
+def shutdown_extraction_pool():
+    extraction_pool.shutdown()
+
+async def process_resume_text(resume_text: str) -> ResumeData:
     """
-    Process a single resume file through the two-stage parsing pipeline
+    Run extracted resume text through the parsing pipeline
     
     Args:
-        file_path: Path to the resume file
+        resume_text: Compacted text extracted from the resume file
         
     Returns:
         ResumeData: Parsed and refined resume data
@@ -149,51 +226,13 @@ def process_resume_file(file_path: str) -> ResumeData:
         Exception: If parsing fails at any stage
     """
     try:
-        # Determine file type and use appropriate loader
-        file_extension = file_path.lower().split('.')[-1]
-        
-        if file_extension == 'pdf':
-            loader = PDFPlumberLoader(file_path)
-            docs = loader.load()
-            if not docs:
-                raise Exception("Could not extract text from PDF file")
-        elif file_extension in ['docx']:
-            try:
-                loader = Docx2txtLoader(file_path)
-                docs = loader.load()
-                if not docs:
-                    raise Exception("Could not extract text from DOCX file")
-            except Exception:
-                # Fallback to UnstructuredWordDocumentLoader
-                try:
-                    loader = UnstructuredWordDocumentLoader(file_path)
-                    docs = loader.load()
-                    if not docs:
-                        raise Exception("Could not extract text from DOCX file")
-                except Exception as e:
-                    raise Exception(f"Failed to process DOCX file: {str(e)}")
-        elif file_extension in ['doc']:
-            try:
-                loader = UnstructuredWordDocumentLoader(file_path)
-                docs = loader.load()
-                if not docs:
-                    raise Exception("Could not extract text from DOC file")
-            except Exception as e:
-                raise Exception(f"Failed to process DOC file: {str(e)}")
-        else:
-            raise Exception(f"Unsupported file format: .{file_extension}. Only PDF, DOC, and DOCX files are supported.")
-        
-        resume_text = "\n\n".join([doc.page_content for doc in docs])
-        
         if not resume_text.strip():
             raise Exception(f"File appears to be empty or contains no readable text")
         
         # Stage 1: Initial parsing
         initial_parse_prompt = f"Parse the attached resume and return JSON: {resume_text}"
         
-        initial_parse = structured_model.invoke(initial_parse_prompt)
-        initial_parse_json = json.dumps(initial_parse.model_dump(), indent=2)
-        
+        initial_parse = await llm_runner.ainvoke(structured_model, initial_parse_prompt)
         
         # Print some work experience details if available
         if initial_parse.work_experience:
@@ -205,13 +244,29 @@ def process_resume_file(file_path: str) -> ResumeData:
             for i, edu in enumerate(initial_parse.education):
                 print(f"  - Education {i+1}: {edu.degree_title} from {edu.institution_name}")
         
-        # Stage 2: Refinement and quality control
+        # Stage 2: Deterministic quality control (dates, durations, skills, career level)
+        issues = normalize_resume(initial_parse)
+        if not issues:
+            print("  - Rule-based normalization complete, no LLM refinement needed")
+            return initial_parse
+        
+        # Stage 3: LLM refinement, only for problems the rules can't fix
+        print(f"  - {len(issues)} issue(s) need LLM refinement:")
+        for issue in issues:
+            print(f"    * {issue}")
+        
+        initial_parse_json = json.dumps(initial_parse.model_dump(), indent=2)
+        flagged_issues = "\n".join(f"- {issue}" for issue in issues)
+        
         final_parse_prompt = f"""
 You are a professional resume data quality controller. Your task is to review and correct the initially parsed resume data, fixing any parsing errors, inconsistencies, or misclassifications while maintaining strict data fidelity.
 
 Initially Parsed Data:
 {initial_parse_json}
 
+ISSUES FLAGGED BY AUTOMATED VALIDATION (fix these first):
+{flagged_issues}
+
 DATA CORRECTION OBJECTIVES:
 - Fix any obvious parsing errors or misclassifications
 - Correct data that was placed in wrong sections
@@ -289,8 +344,9 @@ IMPORTANT:
 - Ensure all corrections are based on evidence in the parsed data
 """
         
-        # Get the final refined result
-        final_parse = structured_model.invoke(final_parse_prompt)
+        # Get the final refined result and re-apply the standard formatting rules
+        final_parse = await llm_runner.ainvoke(structured_model, final_parse_prompt)
+        normalize_resume(final_parse)
         
         # Print some work experience details if available
         if final_parse.work_experience:
@@ -302,6 +358,77 @@ IMPORTANT:
     except Exception as e:
         raise Exception(f"Resume processing failed: {str(e)}")
 
+SUPPORTED_EXTENSIONS = ['pdf', 'doc', 'docx']
+
+def get_file_extension(filename: str) -> str:
+    """Return the lowercase extension of a filename without the dot"""
+    return filename.lower().split('.')[-1] if '.' in filename else ''
+
+async def parse_resume_content(filename: str, content: bytes) -> ParseResponse:
+    """
+    Parse the raw bytes of an uploaded resume, using the parse cache when possible
+    
+    Args:
+        filename: Original filename (used for the extension and the response)
+        content: Uploaded file bytes
+        
+    Returns:
+        ParseResponse: Contains parsed data or error information
+    """
+    file_extension = get_file_extension(filename)
+    try:
+        if file_extension not in SUPPORTED_EXTENSIONS:
+            raise Exception(f"Unsupported file format: .{file_extension}. Only PDF, DOC, and DOCX files are supported.")
+        
+        if not content:
+            raise Exception("Uploaded file is empty")
+        
+        # Return the stored result if this exact file was parsed before (cache file I/O runs off the event loop)
+        cache_key = parse_cache.make_key(content)
+        cached_data = await asyncio.to_thread(parse_cache.get, cache_key)
+        if cached_data is not None:
+            print(f"Parse cache hit for {filename}")
+            return ParseResponse(
+                success=True,
+                data=ParsedResume.from_resume_data(ResumeData.model_validate(cached_data["data"])),
+                filename=filename,
+                tokens_before=cached_data.get("tokens_before"),
+                tokens_after=cached_data.get("tokens_after")
+            )
+        
+        print(f"Processing file: {filename}")
+        
+        # Extract the text in the process pool, then run the LLM stages on the event loop
+        pages = await extraction_pool.extract(content, file_extension)
+        compacted = compact_resume_pages(pages, RESUME_TOKEN_BUDGET)
+        print(f"Compacted {filename}: {compacted.tokens_before} -> {compacted.tokens_after} tokens"
+              f"{' (truncated to budget)' if compacted.truncated else ''}")
+        
+        parsed_data = await process_resume_text(compacted.text)
+        await asyncio.to_thread(parse_cache.put, cache_key, {
+            "data": parsed_data.model_dump(),
+            "tokens_before": compacted.tokens_before,
+            "tokens_after": compacted.tokens_after,
+        })
+        
+        print(f"Successfully parsed resume: {filename}")
+        
+        return ParseResponse(
+            success=True,
+            data=ParsedResume.from_resume_data(parsed_data),
+            filename=filename,
+            tokens_before=compacted.tokens_before,
+            tokens_after=compacted.tokens_after
+        )
+        
+    except Exception as e:
+        print(f"Error processing {filename}: {str(e)}")
+        return ParseResponse(
+            success=False,
+            error=str(e),
+            filename=filename if filename else "unknown"
+        )
+
 @app.post("/parse-resumes", response_model=ParseResponse)
 async def parse_resume(file: UploadFile = File(...)):
     """
@@ -323,62 +450,130 @@ async def parse_resume(file: UploadFile = File(...)):
             detail="No filename provided"
         )
     
-    file_extension = file.filename.lower().split('.')[-1] if '.' in file.filename else ''
-    supported_extensions = ['pdf', 'doc', 'docx']
+    file_extension = get_file_extension(file.filename)
     
-    if file_extension not in supported_extensions:
+    if file_extension not in SUPPORTED_EXTENSIONS:
         raise HTTPException(
             status_code=400, 
             detail=f"Unsupported file format: .{file_extension}. Only PDF, DOC, and DOCX files are supported."
         )
     
-    # Create a temporary file to store the uploaded content
-    temp_file = None
-    temp_file_path = None
-    try:
-        # Create temporary file with appropriate extension
-        suffix = f'.{file_extension}'
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
-            content = await file.read()
-            if not content:
-                raise Exception("Uploaded file is empty")
-            temp_file.write(content)
-            temp_file_path = temp_file.name
-        
-        print(f"Processing file: {temp_file_path}")
-        
-        # Process the resume
-        parsed_data = process_resume_file(temp_file_path)
-        
-        print(f"Successfully parsed resume: {file.filename}")
-        
-        return ParseResponse(
-            success=True,
-            data=parsed_data,
-            filename=file.filename
+    size_error = upload_size_error(file)
+    if size_error:
+        raise HTTPException(status_code=413, detail=size_error)
+    
+    content = await file.read()
+    return await parse_resume_content(file.filename, content)
+
+def upload_size_error(file: UploadFile) -> Optional[str]:
+    """Return an error message if an uploaded file is over the per-file size cap"""
+    if file.size is not None and file.size > MAX_UPLOAD_FILE_MB * 1024 * 1024:
+        return f"File is larger than the {MAX_UPLOAD_FILE_MB} MB limit"
+    return None
+
+def check_batch_size(files: List[UploadFile]):
+    """Reject a multi-file upload whose total size is over the per-batch cap"""
+    total_bytes = sum(file.size or 0 for file in files)
+    if total_bytes > MAX_UPLOAD_BATCH_MB * 1024 * 1024:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Upload of {total_bytes / (1024 * 1024):.1f} MB is larger than the {MAX_UPLOAD_BATCH_MB} MB batch limit"
         )
+
+async def parse_upload(file: UploadFile) -> ParseResponse:
+    """
+    Parse one file of a multi-file upload, sharing the batch concurrency limit
+    
+    The upload stays in its spooled temporary file until a parse slot is free,
+    so at most PARSE_BATCH_CONCURRENCY files are held in memory at once.
+    """
+    filename = file.filename or "unknown"
+    size_error = upload_size_error(file)
+    if size_error:
+        return ParseResponse(success=False, error=size_error, filename=filename)
+    
+    async with parse_semaphore:
+        try:
+            content = await file.read()
+        except Exception as e:
+            return ParseResponse(success=False, error=f"Failed to read upload: {str(e)}", filename=filename)
+        finally:
+            await file.close()
+        return await parse_resume_content(filename, content)
+
+@app.post("/parse-resumes/batch", response_model=BatchParseResponse)
+async def parse_resumes_batch(files: List[UploadFile] = File(...)):
+    """
+    Parse many resume files from one multipart request concurrently
+    
+    Text extraction runs in the process pool and the LLM stages as async model calls,
+    at most PARSE_BATCH_CONCURRENCY files at a time across all in-flight batch requests.
+    
+    Args:
+        files: The uploaded resume files (PDF, DOC, or DOCX)
         
-    except Exception as e:
-        print(f"Error processing {file.filename}: {str(e)}")
-        return ParseResponse(
-            success=False,
-            error=str(e),
-            filename=file.filename if file.filename else "unknown"
-        )
+    Returns:
+        BatchParseResponse: Per-file ParseResponse results in upload order
+    """
+    print(f"Received batch of {len(files)} files (concurrency limit: {PARSE_BATCH_CONCURRENCY})")
+    check_batch_size(files)
+    
+    # gather() preserves the input order, so results line up with the uploaded files
+    results = await asyncio.gather(*(parse_upload(file) for file in files))
+    succeeded = sum(1 for r in results if r.success)
+    
+    return BatchParseResponse(
+        results=results,
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded
+    )
+
+@app.post("/parse-resumes/stream")
+async def parse_resumes_stream(files: List[UploadFile] = File(...)):
+    """
+    Parse many resume files and stream each result as soon as it is ready
+    
+    The response is NDJSON: one StreamParseLine per file, in completion order
+    rather than upload order (use `index` to map a line back to its file).
+    
+    Args:
+        files: The uploaded resume files (PDF, DOC, or DOCX)
         
-    finally:
-        # Clean up temporary file
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.unlink(temp_file_path)
-            except Exception as cleanup_error:
-                print(f"Failed to cleanup temp file: {cleanup_error}")
-                pass  # Ignore cleanup errors
+    Returns:
+        StreamingResponse: application/x-ndjson body with one line per file
+    """
+    print(f"Received streaming batch of {len(files)} files (concurrency limit: {PARSE_BATCH_CONCURRENCY})")
+    check_batch_size(files)
+    
+    # The spooled uploads stay open until the response has been sent
+    async def parse_indexed(index: int, file: UploadFile):
+        return index, await parse_upload(file)
+    
+    async def generate_lines():
+        tasks = [asyncio.create_task(parse_indexed(index, file)) for index, file in enumerate(files)]
+        try:
+            for completed, next_done in enumerate(asyncio.as_completed(tasks), start=1):
+                index, result = await next_done
+                line = StreamParseLine(**result.model_dump(), index=index, completed=completed, total=len(tasks))
+                yield line.model_dump_json() + "\n"
+        finally:
+            # Client went away - stop parsing the files nobody is waiting for
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(generate_lines(), media_type="application/x-ndjson")
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "Resume Parser API"}
+    return {
+        "status": "healthy",
+        "service": "Resume Parser API",
+        "parse_cache": parse_cache.stats(),
+        "extraction_pool": extraction_pool.stats(),
+        "llm": llm_runner.stats()
+    }
 
 @app.post("/test-upload")
 async def test_upload(file: UploadFile = File(...)):
@@ -405,6 +600,8 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "parse": "/parse-resumes",
+            "parse_batch": "/parse-resumes/batch",
+            "parse_stream": "/parse-resumes/stream",
             "test": "/test-upload",
             "health": "/health",
             "docs": "/docs"
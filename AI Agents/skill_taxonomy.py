@@ -0,0 +1,240 @@
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+# Canonical skill dictionary: skill ID -> (display name, aliases).
+# IDs are stable and stored in the database; display names and aliases can change freely.
+# The display name and the ID are indexed as aliases automatically.
+SKILLS = {
+    # Programming languages
+    "python": ("Python", ["py", "python3", "python 3"]),
+    "javascript": ("JavaScript", ["js", "ecmascript", "es6"]),
+    "typescript": ("TypeScript", ["ts"]),
+    "java": ("Java", ["core java", "java 8", "java se"]),
+    "c": ("C", []),
+    "cpp": ("C++", ["c plus plus"]),
+    "csharp": ("C#", ["c sharp", "c#.net"]),
+    "go": ("Go", ["golang"]),
+    "rust": ("Rust", []),
+    "ruby": ("Ruby", []),
+    "php": ("PHP", []),
+    "kotlin": ("Kotlin", []),
+    "swift": ("Swift", []),
+    "scala": ("Scala", []),
+    "r": ("R", ["r programming", "rstudio"]),
+    "matlab": ("MATLAB", []),
+    "sql": ("SQL", ["structured query language"]),
+    "bash": ("Bash", ["shell scripting", "shell script", "bash scripting"]),
+    "html": ("HTML", ["html5"]),
+    "css": ("CSS", ["css3"]),
+    # Frameworks and libraries
+    "django": ("Django", ["django rest framework", "drf"]),
+    "flask": ("Flask", []),
+    "fastapi": ("FastAPI", ["fast api"]),
+    "spring": ("Spring Boot", ["spring", "springboot", "spring framework"]),
+    "dotnet": (".NET", ["dotnet", "asp.net", ".net core", "asp.net core"]),
+    "rails": ("Ruby on Rails", ["rails", "ror"]),
+    "laravel": ("Laravel", []),
+    "react": ("React", ["reactjs", "react.js"]),
+    "react-native": ("React Native", []),
+    "angular": ("Angular", ["angularjs", "angular.js"]),
+    "vue": ("Vue.js", ["vue", "vuejs"]),
+    "nextjs": ("Next.js", ["nextjs", "next js"]),
+    "nodejs": ("Node.js", ["node", "nodejs", "node js"]),
+    "express": ("Express.js", ["expressjs", "express"]),
+    "tailwind": ("Tailwind CSS", ["tailwind", "tailwindcss"]),
+    "bootstrap": ("Bootstrap", []),
+    "jquery": ("jQuery", []),
+    "flutter": ("Flutter", []),
+    "langchain": ("LangChain", []),
+    # Data and machine learning
+    "machine-learning": ("Machine Learning", ["ml"]),
+    "deep-learning": ("Deep Learning", ["dl"]),
+    "artificial-intelligence": ("Artificial Intelligence", ["ai"]),
+    "nlp": ("Natural Language Processing", ["nlp"]),
+    "computer-vision": ("Computer Vision", ["cv"]),
+    "generative-ai": ("Generative AI", ["genai", "gen ai", "llm", "llms", "large language models"]),
+    "tensorflow": ("TensorFlow", ["tf"]),
+    "pytorch": ("PyTorch", ["torch"]),
+    "scikit-learn": ("scikit-learn", ["sklearn", "scikit learn"]),
+    "pandas": ("Pandas", []),
+    "numpy": ("NumPy", []),
+    "data-analysis": ("Data Analysis", ["data analytics"]),
+    "data-visualization": ("Data Visualization", ["data viz"]),
+    "power-bi": ("Power BI", ["powerbi"]),
+    "tableau": ("Tableau", []),
+    "spark": ("Apache Spark", ["spark", "pyspark"]),
+    "hadoop": ("Hadoop", []),
+    "airflow": ("Apache Airflow", ["airflow"]),
+    "kafka": ("Apache Kafka", ["kafka"]),
+    "statistics": ("Statistics", []),
+    # Databases
+    "postgresql": ("PostgreSQL", ["postgres", "psql"]),
+    "mysql": ("MySQL", []),
+    "sqlite": ("SQLite", []),
+    "mongodb": ("MongoDB", ["mongo"]),
+    "redis": ("Redis", []),
+    "elasticsearch": ("Elasticsearch", ["elastic search"]),
+    "oracle-db": ("Oracle Database", ["oracle db", "pl/sql"]),
+    "sql-server": ("Microsoft SQL Server", ["sql server", "mssql", "ms sql"]),
+    "dynamodb": ("DynamoDB", []),
+    # Cloud and DevOps
+    "aws": ("Amazon Web Services", ["aws"]),
+    "azure": ("Microsoft Azure", ["azure"]),
+    "gcp": ("Google Cloud Platform", ["gcp", "google cloud"]),
+    "docker": ("Docker", []),
+    "kubernetes": ("Kubernetes", ["k8s"]),
+    "terraform": ("Terraform", []),
+    "ansible": ("Ansible", []),
+    "jenkins": ("Jenkins", []),
+    "ci-cd": ("CI/CD", ["cicd", "ci cd", "continuous integration", "continuous delivery", "continuous deployment"]),
+    "linux": ("Linux", ["unix"]),
+    "git": ("Git", []),
+    "github": ("GitHub", []),
+    "microservices": ("Microservices", ["microservice architecture"]),
+    "rest-api": ("REST APIs", ["rest", "rest api", "restful api", "restful apis", "restful services"]),
+    "graphql": ("GraphQL", []),
+    # Practices and design
+    "oop": ("Object-Oriented Programming", ["oop", "object oriented programming"]),
+    "data-structures": ("Data Structures and Algorithms", ["dsa", "data structures", "algorithms"]),
+    "system-design": ("System Design", []),
+    "agile": ("Agile", ["scrum", "kanban"]),
+    "testing": ("Software Testing", ["unit testing", "test automation", "qa testing"]),
+    "ux-design": ("UX Design", ["ux", "user experience"]),
+    "ui-design": ("UI Design", ["ui", "user interface design"]),
+    "figma": ("Figma", []),
+    # Business and office
+    "excel": ("Microsoft Excel", ["excel", "ms excel", "advanced excel"]),
+    "ms-office": ("Microsoft Office", ["ms office", "office 365", "microsoft 365"]),
+    "seo": ("Search Engine Optimization", ["seo"]),
+    "digital-marketing": ("Digital Marketing", []),
+    "project-management": ("Project Management", []),
+    "stakeholder-management": ("Stakeholder Management", []),
+    "communication": ("Communication", ["communication skills"]),
+    "leadership": ("Leadership", ["team leadership"]),
+    "salesforce": ("Salesforce", []),
+    "sap": ("SAP", []),
+}
+
+# Aliases that are ordinary words (or too short) to trust when scanning free text;
+# they still resolve when a skill list entry is exactly the alias
+LOOKUP_ONLY_ALIASES = {
+    "c", "r", "go", "ai", "ml", "dl", "cv", "ts", "tf", "js", "py", "ui", "ux",
+    "rest", "node", "react", "express", "spring", "swift", "rust", "excel", "torch",
+    "communication", "leadership", "statistics", "testing", "agile", "unix",
+}
+
+
+class SkillMatch(NamedTuple):
+    """One skill occurrence found in scanned text"""
+    skill_id: str
+    start: int
+    end: int
+
+
+def normalize_alias(text: str) -> str:
+    """Lowercase and collapse whitespace so aliases and scanned text compare equal"""
+    return " ".join(str(text).lower().split())
+
+
+class SkillIndex:
+    """
+    Alias index plus an Aho-Corasick automaton over the skill taxonomy.
+
+    `lookup` resolves a single skill string in O(1); `scan` finds every skill
+    mentioned in a piece of text in one pass, whatever the number of aliases.
+    Matches must start and end on word boundaries, so "java" is not found in
+    "javascript".
+    """
+
+    def __init__(self, skills: Dict[str, tuple]):
+        self.names = {skill_id: name for skill_id, (name, _) in skills.items()}
+        self.aliases: Dict[str, str] = {}
+        for skill_id, (name, aliases) in skills.items():
+            for alias in [skill_id, name, *aliases]:
+                self.aliases.setdefault(normalize_alias(alias), skill_id)
+
+        # Trie as parallel lists: goto transitions, failure links and outputs (alias length, skill ID)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[tuple]] = [[]]
+        for alias, skill_id in self.aliases.items():
+            if alias not in LOOKUP_ONLY_ALIASES and len(alias) > 1:
+                self._add_pattern(alias, skill_id)
+        self._build_failure_links()
+
+    def _add_pattern(self, pattern: str, skill_id: str):
+        state = 0
+        for char in pattern:
+            if char not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = len(self._goto) - 1
+            state = self._goto[state][char]
+        self._output[state].append((len(pattern), skill_id))
+
+    def _build_failure_links(self):
+        """Breadth-first pass that links each state to its longest proper suffix state"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def lookup(self, skill: str) -> Optional[str]:
+        """Resolve one skill string (name or alias) to its skill ID, or None if unknown"""
+        return self.aliases.get(normalize_alias(skill))
+
+    def name(self, skill_id: str) -> str:
+        """Display name of a skill ID (the ID itself if unknown)"""
+        return self.names.get(skill_id, skill_id)
+
+    def scan(self, text: str) -> List[SkillMatch]:
+        """Find every skill alias in the text that sits on word boundaries"""
+        text = normalize_alias(text)
+        matches = []
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, skill_id in self._output[state]:
+                start, end = position - length + 1, position + 1
+                if _is_boundary(text, start - 1) and _is_boundary(text, end):
+                    matches.append(SkillMatch(skill_id, start, end))
+        return matches
+
+    def skill_ids(self, skills: Iterable[str] = (), texts: Iterable[str] = ()) -> List[str]:
+        """
+        Canonical skill IDs for skill list entries and free text, in first-seen order
+
+        Each skill entry is resolved as a whole first ("JS" -> javascript) and
+        otherwise scanned ("AWS Lambda" -> aws); free text is only scanned.
+        """
+        found: Dict[str, None] = {}
+        for skill in skills:
+            if not skill:
+                continue
+            skill_id = self.lookup(skill)
+            if skill_id:
+                found.setdefault(skill_id)
+            else:
+                for match in self.scan(skill):
+                    found.setdefault(match.skill_id)
+        for text in texts:
+            for match in self.scan(text or ""):
+                found.setdefault(match.skill_id)
+        return list(found)
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    """True when text[index] is outside the text or not part of a word"""
+    return index < 0 or index >= len(text) or not (text[index].isalnum() or text[index] in "+#")
+
+
+skill_index = SkillIndex(SKILLS)
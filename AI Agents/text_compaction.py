@@ -0,0 +1,211 @@
+import re
+import unicodedata
+from collections import Counter
+from typing import List, NamedTuple
+
+# Rough characters-per-token ratio for English resume text; close enough to
+# Gemini's tokenizer for budgeting without a network round trip per file
+CHARS_PER_TOKEN = 4
+
+# Lines this close to the top/bottom of a page are checked for repeated headers/footers
+FURNITURE_LINES_PER_EDGE = 3
+
+# "3", "- 3 -", "Page 3", "Page 3 of 5", "3/5"
+PAGE_NUMBER_PATTERN = re.compile(r"^[-–—\s]*(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?[-–—\s]*$", re.IGNORECASE)
+
+# Lines made only of separators/decoration, e.g. "______" or "• • •"
+DECORATION_PATTERN = re.compile(r"^[\W_]+$")
+
+# Bullet glyphs replaced with a plain dash so list structure survives
+BULLET_CHARS = "•●○◦▪▫■□►▸▶➢➤✓✔❖◆◇➔→"
+BULLET_PATTERN = re.compile(f"^[{BULLET_CHARS}]\\s*")
+
+# Section headings in priority order - when the budget is exceeded, sections
+# are kept from the top of this list down and the rest are truncated
+SECTION_PRIORITY = [
+    ("experience", re.compile(r"^(work |professional |employment )?(experience|history|employment)\b")),
+    ("skills", re.compile(r"^(technical |core |key )?(skills|competencies|technologies|tech stack)\b")),
+    ("education", re.compile(r"^(education|academic|qualifications)\b")),
+    ("summary", re.compile(r"^(professional )?(summary|profile|objective|about me)\b")),
+    ("projects", re.compile(r"^(personal |academic |key )?projects?\b")),
+    ("certifications", re.compile(r"^(certifications?|licenses?|courses)\b")),
+    ("extracurricular", re.compile(r"^(extracurricular|volunteer|activities|leadership)\b")),
+]
+
+# Headings are short lines; longer lines that start with a keyword are content
+MAX_HEADING_LENGTH = 40
+
+
+class CompactedText(NamedTuple):
+    """Compacted resume text with the token counts before and after compaction"""
+    text: str
+    tokens_before: int
+    tokens_after: int
+    truncated: bool
+
+
+def count_tokens(text: str) -> int:
+    """Estimate the number of prompt tokens for a piece of text"""
+    return -(-len(text) // CHARS_PER_TOKEN)  # Ceiling division
+
+
+def _furniture_key(line: str) -> str:
+    """Normalize a line so headers/footers that only differ by page number compare equal"""
+    return re.sub(r"\d+", "#", " ".join(line.lower().split()))
+
+
+def _edge_indexes(lines: List[str]) -> List[int]:
+    """Indexes of the first and last few non-empty lines of a page"""
+    content = [i for i, line in enumerate(lines) if line.strip()]
+    return content[:FURNITURE_LINES_PER_EDGE] + content[-FURNITURE_LINES_PER_EDGE:]
+
+
+def remove_page_furniture(pages: List[str]) -> List[str]:
+    """
+    Drop page numbers and headers/footers repeated across pages
+
+    Only the first and last few lines of a page are checked. A line near the top or bottom of a page counts as furniture when it
+    (ignoring digits) shows up at the edge of at least half of the pages.
+    The first occurrence is kept, since page headers often carry the
+    candidate's name.
+    """
+    page_lines = [page.splitlines() for page in pages]
+
+    repeated = set()
+    if len(pages) > 1:
+        edge_counts = Counter()
+        for lines in page_lines:
+            edge_counts.update({_furniture_key(lines[i]) for i in _edge_indexes(lines)})
+        threshold = max(2, (len(pages) + 1) // 2)
+        repeated = {key for key, count in edge_counts.items() if count >= threshold}
+
+    seen = set()
+    cleaned_pages = []
+    for lines in page_lines:
+        drop = set()
+        for i in _edge_indexes(lines):
+            # Bare numbers in the body ("2019", a skills table count) are content, not page numbers
+            if PAGE_NUMBER_PATTERN.match(lines[i].strip()):
+                drop.add(i)
+                continue
+            key = _furniture_key(lines[i])
+            if key in repeated:
+                if key in seen:
+                    drop.add(i)
+                seen.add(key)
+        kept = [line for i, line in enumerate(lines) if i not in drop]
+        cleaned_pages.append("\n".join(kept))
+    return cleaned_pages
+
+
+def strip_glyph_noise(text: str) -> str:
+    """Remove icon-font glyphs, control characters, symbols and decorative lines"""
+    cleaned_lines = []
+    for line in text.splitlines():
+        line = BULLET_PATTERN.sub("- ", line.strip())
+        line = "".join(
+            char for char in line
+            if unicodedata.category(char) not in ("Cc", "Cf", "Co", "Cs", "So") and char != "�"
+        )
+        if line and DECORATION_PATTERN.match(line) and line != "-":
+            continue
+        cleaned_lines.append(line)
+    return "\n".join(cleaned_lines)
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse runs of spaces and blank lines, and trim every line"""
+    text = re.sub(r"[^\S\n]+", " ", text)
+    text = "\n".join(line.strip() for line in text.splitlines())
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def _section_name(line: str) -> str:
+    """Return the section a heading line starts, or an empty string for content lines"""
+    heading = line.strip().lower().rstrip(":")
+    if not heading or len(heading) > MAX_HEADING_LENGTH:
+        return ""
+    for name, pattern in SECTION_PRIORITY:
+        if pattern.match(heading):
+            return name
+    return ""
+
+
+def split_sections(text: str) -> List[tuple]:
+    """Split resume text into (section name, text) blocks; the leading block is 'header'"""
+    sections = [["header", []]]
+    for line in text.splitlines():
+        name = _section_name(line)
+        if name:
+            sections.append([name, []])
+        sections[-1][1].append(line)
+    return [(name, "\n".join(lines)) for name, lines in sections if lines]
+
+
+def _cut_to_chars(text: str, max_chars: int) -> str:
+    """Keep text up to max_chars characters, cutting the last line at a word boundary"""
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    if not text[max_chars].isspace() and " " in cut:
+        cut = cut[:cut.rindex(" ")]
+    return cut.rstrip()
+
+
+def truncate_to_budget(text: str, max_tokens: int) -> str:
+    """
+    Cut text down to a token budget, trimming the least important sections first
+
+    Every section first gets a small share of the budget so its heading and
+    opening lines survive; the rest is handed out in priority order (header
+    with the contact details, then SECTION_PRIORITY). Sections are cut at
+    word boundaries and reassembled in their original order.
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    sections = split_sections(text)
+    priority = {name: rank for rank, (name, _) in enumerate(SECTION_PRIORITY)}
+    order = sorted(
+        range(len(sections)),
+        key=lambda i: -1 if sections[i][0] == "header" else priority.get(sections[i][0], len(priority)),
+    )
+
+    budget = max_tokens * CHARS_PER_TOKEN - len(sections)  # Newlines joining the sections
+    floor = budget // (2 * len(sections))
+    allocation = {i: min(len(sections[i][1]), floor) for i in order}
+    remaining = budget - sum(allocation.values())
+    for i in order:
+        extra = min(len(sections[i][1]) - allocation[i], remaining)
+        allocation[i] += extra
+        remaining -= extra
+
+    kept = [_cut_to_chars(sections[i][1], allocation[i]) for i in range(len(sections))]
+    return "\n".join(section for section in kept if section)
+
+
+def compact_resume_pages(pages: List[str], max_tokens: int) -> CompactedText:
+    """
+    Shrink extracted resume pages into the text sent to the model
+
+    Removes repeated page furniture and glyph noise, normalizes whitespace and
+    enforces a hard token budget (0 disables the budget).
+
+    Args:
+        pages: Extracted text of each page (a single entry for Word documents)
+        max_tokens: Maximum estimated tokens of the compacted text
+
+    Returns:
+        CompactedText: The compacted text and token counts before/after
+    """
+    tokens_before = count_tokens("\n\n".join(pages))
+
+    text = "\n\n".join(remove_page_furniture(pages))
+    text = normalize_whitespace(strip_glyph_noise(text))
+
+    truncated = False
+    if max_tokens > 0 and count_tokens(text) > max_tokens:
+        text = truncate_to_budget(text, max_tokens)
+        truncated = True
+
+    return CompactedText(text, tokens_before, count_tokens(text), truncated)
@@ -0,0 +1,351 @@
+import logging
+import os
+import socket
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import InterviewEvaluation
+
+logger = logging.getLogger(__name__)
+
+# Key of the PostgreSQL advisory lock that serializes claims across processes
+CLAIM_LOCK_KEY = 724_130_024
+
+
+def enqueue_evaluation(interview_recording):
+    """
+    Queue the AI evaluation of a completed interview
+
+    The pending row is the queue entry; a worker pool (in-process or the
+    run_evaluation_worker command) claims it. Nothing is lost if the process
+    restarts before the evaluation runs.
+
+    Returns:
+        InterviewEvaluation: The pending evaluation, or the existing one for this recording
+    """
+    evaluation, created = InterviewEvaluation.objects.get_or_create(
+        interview_recording=interview_recording,
+        defaults={'status': 'pending'}
+    )
+    if created:
+        logger.info(f"Queued evaluation {evaluation.id} for interview recording {interview_recording.id}")
+        # Wake this server's pool (if it runs one) once the row is committed so a worker can see it
+        transaction.on_commit(notify_in_process_pool)
+    return evaluation
+
+
+def requeue_evaluation(interview_recording):
+    """
+    Queue the evaluation of an interview again with a fresh attempt budget (HR's retry)
+
+    An evaluation that a worker is running under a live lease is left alone,
+    so the same interview is never evaluated twice at once.
+
+    Returns:
+        bool: Whether the evaluation was queued
+    """
+    now = timezone.now()
+    evaluation = enqueue_evaluation(interview_recording)
+    queued = (
+        InterviewEvaluation.objects.filter(id=evaluation.id)
+        .exclude(status='in_progress', lease_expires_at__gt=now)
+        .update(status='pending', attempts=0, lease_owner='', lease_expires_at=None,
+                next_attempt_at=None, last_error='', updated_at=now)
+    )
+    if queued:
+        logger.info(f"Re-queued evaluation {evaluation.id} for interview recording {interview_recording.id}")
+        transaction.on_commit(notify_in_process_pool)
+    return bool(queued)
+
+
+def claim_evaluation(worker_name):
+    """
+    Lease the oldest due evaluation to this worker
+
+    Rows are locked with SELECT ... FOR UPDATE SKIP LOCKED, so workers in any
+    number of processes never claim the same evaluation. Nothing is claimed
+    while EVALUATION_MAX_IN_FLIGHT evaluations already hold a lease, which
+    caps the concurrent model calls across all pools; claims take an
+    advisory lock first so two workers can't both pass the count check
+    (other databases, such as SQLite, serialize writers already).
+
+    Returns:
+        InterviewEvaluation or None when nothing is due
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_xact_lock(%s)', [CLAIM_LOCK_KEY])
+        in_flight = InterviewEvaluation.objects.filter(status='in_progress', lease_expires_at__gt=now).count()
+        if in_flight >= settings.EVALUATION_MAX_IN_FLIGHT:
+            return None
+        evaluation = (
+            InterviewEvaluation.objects.select_for_update(skip_locked=True)
+            .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now), status='pending')
+            .order_by('created_at')
+            .first()
+        )
+        if evaluation is None:
+            return None
+        evaluation.status = 'in_progress'
+        evaluation.attempts += 1
+        evaluation.lease_owner = worker_name
+        evaluation.lease_expires_at = now + timedelta(seconds=settings.EVALUATION_LEASE_SECONDS)
+        evaluation.save(update_fields=['status', 'attempts', 'lease_owner', 'lease_expires_at', 'updated_at'])
+    return evaluation
+
+
+def _retry_delay(attempts):
+    """Exponential back-off after the given number of failed attempts"""
+    return timedelta(seconds=settings.EVALUATION_RETRY_BACKOFF_SECONDS * 2 ** max(0, attempts - 1))
+
+
+def release_failed_attempt(evaluation, error, owner=None):
+    """
+    Schedule a retry with back-off, or mark the evaluation failed after EVALUATION_MAX_ATTEMPTS
+
+    With owner, nothing changes unless that worker still holds the lease, so
+    a worker whose lease was reaped can't overwrite the new owner's state.
+    """
+    now = timezone.now()
+    if evaluation.attempts >= settings.EVALUATION_MAX_ATTEMPTS:
+        changes = {'status': 'failed', 'next_attempt_at': None}
+    else:
+        changes = {'status': 'pending', 'next_attempt_at': now + _retry_delay(evaluation.attempts)}
+    rows = InterviewEvaluation.objects.filter(id=evaluation.id, status='in_progress')
+    if owner is not None:
+        rows = rows.filter(lease_owner=owner)
+    updated = rows.update(lease_owner='', lease_expires_at=None, last_error=str(error)[:2000], updated_at=now, **changes)
+    if updated:
+        logger.warning(f"Evaluation {evaluation.id} attempt {evaluation.attempts} failed ({error}); now {changes['status']}")
+    return updated
+
+
+def reap_expired_leases():
+    """
+    Return evaluations whose worker died mid-run to the queue (or fail them after the last attempt)
+
+    In-progress rows without a lease predate the worker pool and are reaped
+    once they have been untouched for a lease period.
+    """
+    now = timezone.now()
+    lease = timedelta(seconds=settings.EVALUATION_LEASE_SECONDS)
+    expired = InterviewEvaluation.objects.filter(
+        Q(lease_expires_at__lt=now) | Q(lease_expires_at__isnull=True, updated_at__lt=now - lease),
+        status='in_progress',
+    )
+    count = 0
+    for evaluation in expired:
+        count += release_failed_attempt(evaluation, f"Lease held by {evaluation.lease_owner or 'unknown worker'} expired",
+                                        owner=evaluation.lease_owner)
+    if count:
+        logger.warning(f"Reaped {count} evaluation(s) with expired leases")
+    return count
+
+
+def evaluation_result_fields(result):
+    """InterviewEvaluation fields for a successful evaluation service result"""
+    evaluation_data = result['data']
+    return {
+        # Simplified criteria (new fields)
+        'communication_clarity': evaluation_data.get('communication_clarity', 0),
+        'relevant_experience': evaluation_data.get('relevant_experience', 0),
+        'role_interest_fit': evaluation_data.get('role_interest_fit', 0),
+        'overall_score': evaluation_data.get('overall_score', 0),
+        'recommendation': evaluation_data.get('recommendation', 'INSUFFICIENT'),
+
+        # Legacy fields (for backward compatibility)
+        'communication_score': evaluation_data.get('communication_clarity', 0) * 10,  # Convert to 0-100 scale
+        'technical_knowledge_score': evaluation_data.get('relevant_experience', 0) * 10,
+        'problem_solving_score': evaluation_data.get('role_interest_fit', 0) * 10,
+        'cultural_fit_score': evaluation_data.get('overall_score', 0) * 10,
+        'enthusiasm_score': evaluation_data.get('overall_score', 0) * 10,
+
+        # Qualitative feedback
+        'confidence_level': str(evaluation_data.get('confidence_level', 'medium')).lower(),
+        'strengths': evaluation_data.get('key_strengths', []),
+        'areas_of_concern': evaluation_data.get('areas_of_concern', []),
+        'key_insights': [text for text in (evaluation_data.get('overall_impression'), evaluation_data.get('resume_alignment')) if text],
+        'communication_assessment': evaluation_data.get('communication_quality', ''),
+        'behavioral_assessment': evaluation_data.get('role_understanding', ''),
+        'questions_answered_well': evaluation_data.get('best_responses', []),
+        'recommended_next_steps': evaluation_data.get('recommended_next_steps', ''),
+        'topics_to_explore_further': evaluation_data.get('questions_to_explore', []),
+        'specific_concerns_to_address': evaluation_data.get('concerns_for_next_round', []),
+        'raw_ai_response': result.get('response'),
+    }
+
+
+def process_evaluation(evaluation, worker_name):
+    """
+    Run a leased evaluation through the AI evaluation service
+
+    The results are stored, and the lease released, only while this worker
+    still holds the lease; a failed call is recorded for a retry.
+    """
+    from .views import call_fastapi_interview_evaluation_service
+
+    recording = evaluation.interview_recording
+    if not recording.conversation_data and not recording.messages.exists():
+        InterviewEvaluation.objects.filter(id=evaluation.id, lease_owner=worker_name).update(
+            status='failed', lease_owner='', lease_expires_at=None,
+            last_error='No transcript available', updated_at=timezone.now()
+        )
+        logger.warning(f"No transcript for recording {recording.id}; evaluation {evaluation.id} failed")
+        return False
+
+    logger.info(f"{worker_name} evaluating interview recording {recording.id} (attempt {evaluation.attempts})")
+    start_time = timezone.now()
+    try:
+        result = call_fastapi_interview_evaluation_service(recording)
+    except Exception as e:
+        result = {'success': False, 'error': str(e)}
+
+    if not result.get('success'):
+        release_failed_attempt(evaluation, result.get('error', 'Unknown error'), owner=worker_name)
+        return False
+
+    now = timezone.now()
+    saved = InterviewEvaluation.objects.filter(id=evaluation.id, lease_owner=worker_name).update(
+        **evaluation_result_fields(result),
+        status='completed', evaluation_completed_at=now,
+        lease_owner='', lease_expires_at=None, next_attempt_at=None, last_error='', updated_at=now,
+        evaluation_duration_seconds=int((now - start_time).total_seconds())
+    )
+    if not saved:
+        logger.warning(f"{worker_name} lost the lease on evaluation {evaluation.id}; its result was discarded")
+        return False
+    logger.info(f"Completed evaluation {evaluation.id} for interview recording {recording.id}")
+    return True
+
+
+class EvaluationWorkerPool:
+    """
+    Fixed number of threads that claim and run queued evaluations
+
+    Concurrency is bounded by the pool size per process and by
+    EVALUATION_MAX_IN_FLIGHT across all processes, so bursts of completed
+    interviews queue up instead of all calling the model at once.
+    """
+
+    def __init__(self, size=None, poll_interval=None, name=None):
+        self.size = max(1, size or settings.EVALUATION_WORKERS)
+        self.poll_interval = poll_interval or settings.EVALUATION_POLL_INTERVAL
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self, run_once=False):
+        for index in range(self.size):
+            thread = threading.Thread(
+                target=self.work,
+                args=(f"{self.name}:{index}", run_once),
+                name=f"evaluation-worker-{index}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Started evaluation worker pool {self.name} with {self.size} thread(s)")
+        return self
+
+    def notify(self):
+        """Wake idle workers right away instead of at the next poll"""
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def join(self, timeout=None):
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def is_alive(self):
+        return any(thread.is_alive() for thread in self._threads)
+
+    def run_once(self, worker_name):
+        """Reap expired leases, then claim and run one evaluation; False when nothing was due"""
+        close_old_connections()
+        try:
+            reap_expired_leases()
+            evaluation = claim_evaluation(worker_name)
+        except Exception as e:
+            logger.error(f"Error claiming evaluation: {e}")
+            return False
+        if evaluation is None:
+            return False
+        try:
+            process_evaluation(evaluation, worker_name)
+        except Exception as e:
+            logger.exception(f"Evaluation {evaluation.id} crashed")
+            release_failed_attempt(evaluation, e, owner=worker_name)
+        return True
+
+    def work(self, worker_name, run_once=False):
+        try:
+            while not self._stop.is_set():
+                if self.run_once(worker_name):
+                    continue
+                if run_once:
+                    break
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+        finally:
+            connection.close()
+
+
+_in_process_pool = None
+_in_process_pid = None
+_in_process_enabled = False
+_in_process_lock = threading.Lock()
+
+
+def enable_in_process_pool():
+    """
+    Opt this web server into running an evaluation worker pool and start it
+
+    Called by the WSGI/ASGI entrypoint when EVALUATION_IN_PROCESS_WORKERS is
+    set, so management commands, tests and scripts never run evaluations.
+    Worker processes forked from a preloading server start their own pool.
+    """
+    global _in_process_enabled
+    _in_process_enabled = True
+    return start_in_process_pool()
+
+
+def start_in_process_pool():
+    """Start this process's evaluation worker pool if the server opted in, and return it (None otherwise)"""
+    global _in_process_pool, _in_process_pid
+    with _in_process_lock:
+        if not _in_process_enabled:
+            return None
+        # Threads don't survive fork, so a pool inherited from a parent process is replaced
+        if _in_process_pool is None or _in_process_pid != os.getpid():
+            _in_process_pool = EvaluationWorkerPool().start()
+            _in_process_pid = os.getpid()
+    return _in_process_pool
+
+
+def notify_in_process_pool():
+    """Wake this process's evaluation worker pool, if it runs one"""
+    pool = start_in_process_pool()
+    if pool is not None:
+        pool.notify()
+
+
+def _start_pool_after_fork():
+    global _in_process_lock
+    # The lock may have been held by another thread of the parent when it forked
+    _in_process_lock = threading.Lock()
+    if _in_process_enabled:
+        start_in_process_pool()
+
+
+os.register_at_fork(after_in_child=_start_pool_after_fork)
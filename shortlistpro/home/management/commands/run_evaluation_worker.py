@@ -0,0 +1,47 @@
+"""
+Background worker that runs queued AI interview evaluations
+Evaluations are leased with SELECT ... FOR UPDATE SKIP LOCKED, so any number of
+these (and the in-process pools of the web servers) can run side by side.
+Set EVALUATION_IN_PROCESS_WORKERS=False to leave evaluations to this command.
+Usage: python manage.py run_evaluation_worker [--threads 2] [--once]
+"""
+from django.core.management.base import BaseCommand
+from django.conf import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Run queued AI interview evaluations in the background'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=settings.EVALUATION_WORKERS,
+            help=f'Number of evaluations run at the same time (default: {settings.EVALUATION_WORKERS})',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=settings.EVALUATION_POLL_INTERVAL,
+            help=f'Seconds to wait when nothing is due (default: {settings.EVALUATION_POLL_INTERVAL})',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run the evaluations currently due and exit',
+        )
+
+    def handle(self, *args, **options):
+        from home.evaluation_worker import EvaluationWorkerPool
+
+        pool = EvaluationWorkerPool(size=options['threads'], poll_interval=options['poll_interval'])
+        pool.start(run_once=options['once'])
+        try:
+            while pool.is_alive():
+                pool.join(timeout=1)
+        except KeyboardInterrupt:
+            pool.stop()
+            logger.info("Evaluation worker stopped; running evaluations are reclaimed once their lease expires")
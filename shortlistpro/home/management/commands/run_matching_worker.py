@@ -0,0 +1,98 @@
+"""
+Background worker that processes queued AI matching jobs
+Run one or more of these next to the web server; jobs are claimed with
+SELECT ... FOR UPDATE SKIP LOCKED, so workers never pick up the same job.
+When the queue is empty and SPECULATIVE_QUESTIONS_ENABLED is set, idle workers
+pre-generate interview questions for likely-interview candidates.
+Usage: python manage.py run_matching_worker [--threads 2] [--once]
+"""
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.db import close_old_connections, connection
+import logging
+import os
+import socket
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Process queued AI matching jobs in the background'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=2,
+            help='Number of jobs processed at the same time (default: 2)',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds to wait when the queue is empty (default: 2)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process the jobs currently queued and exit',
+        )
+
+    def handle(self, *args, **options):
+        threads = max(1, options['threads'])
+        worker_name = f"{socket.gethostname()}:{os.getpid()}"
+        logger.info(f"Starting matching worker {worker_name} with {threads} thread(s)")
+
+        workers = [
+            threading.Thread(
+                target=self.work,
+                args=(f"{worker_name}:{index}", options['poll_interval'], options['once']),
+                name=f"matching-worker-{index}",
+                daemon=True,
+            )
+            for index in range(threads)
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                while worker.is_alive():
+                    worker.join(timeout=1)
+        except KeyboardInterrupt:
+            logger.info("Matching worker stopped; running jobs are re-queued once their heartbeat goes stale")
+
+    def work(self, worker_name, poll_interval, run_once):
+        from home.matching_jobs import claim_matching_job, requeue_stale_jobs, run_matching_job
+        from home.speculative_questions import expire_speculative_questions, generate_speculative_questions
+
+        try:
+            while True:
+                close_old_connections()
+                try:
+                    requeue_stale_jobs(settings.MATCHING_JOB_STALE_SECONDS)
+                    job = claim_matching_job(worker_name)
+                except Exception as e:
+                    logger.error(f"Error claiming matching job: {e}")
+                    job = None
+
+                if job is not None:
+                    logger.info(f"{worker_name} processing matching job {job.id} ({job.total} resumes)")
+                    run_matching_job(job)
+                    continue
+
+                # Speculative work only runs while no matching job is waiting
+                if settings.SPECULATIVE_QUESTIONS_ENABLED:
+                    try:
+                        expire_speculative_questions()
+                        if generate_speculative_questions():
+                            continue
+                    except Exception as e:
+                        logger.error(f"Error pre-generating interview questions: {e}")
+
+                if run_once:
+                    break
+                time.sleep(poll_interval)
+        finally:
+            connection.close()
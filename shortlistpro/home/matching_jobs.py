@@ -0,0 +1,364 @@
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import JobDescription, MatchingJob, MatchingResult, Resume
+from .prescreen import prescreen_resumes, skill_overlap
+from .speculative_questions import discard_stale_speculative_questions
+
+logger = logging.getLogger(__name__)
+
+# Progress fields cleared whenever a job is (re)claimed, so a re-run starts from zero
+PROGRESS_RESET = {'done': 0, 'failed': 0, 'prescreened': 0, 'unchanged': 0, 'results': [], 'errors': []}
+
+
+class MatchingJobLost(Exception):
+    """The job was re-queued and claimed by another worker while this one was still running it"""
+
+
+def enqueue_matching_job(user, job_description, resume_ids, force=False):
+    """Queue a matching run; the run_matching_worker command picks it up"""
+    return MatchingJob.objects.create(
+        user=user,
+        job_description=job_description,
+        resume_ids=[int(resume_id) for resume_id in resume_ids],
+        force=force,
+        total=len(resume_ids),
+    )
+
+
+def enqueue_all_jobs_matching(user, resume, force=False):
+    """Queue the match of one resume against all of the user's job descriptions (one cross-job call)"""
+    return MatchingJob.objects.create(
+        user=user,
+        kind='all_jobs',
+        resume_ids=[resume.id],
+        force=force,
+        total=JobDescription.objects.filter(user=user).count(),
+    )
+
+
+def claim_matching_job(worker_name):
+    """
+    Claim the oldest queued job for this worker
+
+    The row is locked with SELECT ... FOR UPDATE SKIP LOCKED, so any number of
+    workers can poll the table without blocking each other or claiming the
+    same job twice. Progress left by a worker that went stale is cleared, as
+    the job is processed again from the start.
+
+    Returns:
+        MatchingJob or None when the queue is empty
+    """
+    with transaction.atomic():
+        job = (
+            MatchingJob.objects.select_for_update(skip_locked=True)
+            .filter(status='queued')
+            .order_by('created_at')
+            .first()
+        )
+        if job is None:
+            return None
+        now = timezone.now()
+        job.status = 'running'
+        job.worker = worker_name
+        job.started_at = now
+        job.heartbeat_at = now
+        for field, value in PROGRESS_RESET.items():
+            setattr(job, field, list(value) if isinstance(value, list) else value)
+        job.save(update_fields=['status', 'worker', 'started_at', 'heartbeat_at', *PROGRESS_RESET])
+    return job
+
+
+def requeue_stale_jobs(max_age_seconds):
+    """Put running jobs whose worker stopped sending heartbeats back in the queue"""
+    cutoff = timezone.now() - timedelta(seconds=max_age_seconds)
+    count = MatchingJob.objects.filter(status='running', heartbeat_at__lt=cutoff).update(status='queued', worker='', **PROGRESS_RESET)
+    if count:
+        logger.warning(f"Re-queued {count} stale matching job(s)")
+    return count
+
+
+def save_matching_result(user, job_description, resume, requirements, result):
+    """
+    Store one matching service result and return its summary for the progress endpoint
+
+    Args:
+        user: HR user owning the job
+        job_description: JobDescription model instance
+        resume: Resume model instance
+        requirements: The JD's structured requirements (for canonical skill overlap)
+        result: Entry of the batch matching response ({'success', 'data', 'input_hash', ...})
+    """
+    matching_data = result['data']
+    # Skill sets come from the canonical skill IDs when both sides have them
+    overlap = skill_overlap(resume, requirements)
+    if overlap:
+        matching_data['matched_skills'], matching_data['missing_skills'] = overlap
+
+    matching_result, created = MatchingResult.objects.update_or_create(
+        user=user,
+        resume=resume,
+        job_description=job_description,
+        defaults={
+            'overall_score': matching_data.get('overall_score', 0),
+            'skills_score': matching_data.get('skills_score', 0),
+            'experience_score': matching_data.get('experience_score', 0),
+            'education_score': matching_data.get('education_score', 0),
+            'interview_recommendation': matching_data.get('recommendation', '')[:20],
+            'match_reasoning': json.dumps({
+                'interview_recommendation': matching_data.get('recommendation', ''),
+                'confidence_level': matching_data.get('confidence', ''),
+                'interview_priority': matching_data.get('interview_priority', ''),
+                'top_strengths': matching_data.get('strengths', []),
+                'concerns': matching_data.get('concerns', []),
+                'conversation_topics': matching_data.get('conversation_topics', []),
+                'key_questions': matching_data.get('key_questions', []),
+                'prescreened': result.get('prescreened', False)
+            }),
+            'matched_skills': json.dumps(matching_data.get('matched_skills', [])),
+            'missing_skills': json.dumps(matching_data.get('missing_skills', [])),
+            'experience_gap': (matching_data.get('experience_summary', '') or '')[:255],
+            'input_hash': result.get('input_hash', ''),
+            'created_at': timezone.now()
+        }
+    )
+    if not created:
+        # Questions pre-generated from the previous result no longer fit it
+        discard_stale_speculative_questions(matching_result)
+    return {
+        'resume_id': resume.id,
+        'candidate_name': resume.candidate_name,
+        'score': matching_data.get('overall_score', 0),
+        'recommendation': matching_data.get('recommendation', ''),
+        'created': created,
+        'prescreened': result.get('prescreened', False)
+    }
+
+
+def _unchanged_summary(resume, existing):
+    try:
+        reasoning = json.loads(existing.match_reasoning or '{}')
+    except (json.JSONDecodeError, TypeError):
+        reasoning = {}
+    return {
+        'resume_id': resume.id,
+        'candidate_name': resume.candidate_name,
+        'score': float(existing.overall_score),
+        'recommendation': reasoning.get('interview_recommendation', ''),
+        'created': False,
+        'unchanged': True
+    }
+
+
+def _save_if_owner(job, **fields):
+    """Write job fields only while this worker still owns the running job"""
+    updated = MatchingJob.objects.filter(id=job.id, status='running', worker=job.worker).update(**fields)
+    if not updated:
+        raise MatchingJobLost(f"Matching job {job.id} is no longer owned by {job.worker}")
+
+
+def _record_progress(job, results, errors):
+    job.results.extend(results)
+    job.errors.extend(errors)
+    job.done += len(results)
+    job.failed += len(errors)
+    job.heartbeat_at = timezone.now()
+    _save_if_owner(job, results=job.results, errors=job.errors, done=job.done, failed=job.failed,
+                   prescreened=job.prescreened, unchanged=job.unchanged, heartbeat_at=job.heartbeat_at)
+
+
+def run_matching_job(job, chunk_size=None):
+    """
+    Process a claimed matching job
+
+    Unchanged and pre-screened resumes are settled first without any model
+    call; the rest go to the matching service in chunks (each chunk is matched
+    concurrently by the service), and progress is saved after every chunk so
+    the progress endpoint can report done/failed counts while the job runs.
+    Every write checks that this worker still owns the job; if it was
+    re-queued and claimed elsewhere, this run stops without touching it.
+    all_jobs runs match their one resume against every job description.
+    """
+    try:
+        if job.kind == 'all_jobs':
+            _match_all_jobs(job)
+        else:
+            _match_job_description(job, chunk_size or settings.MATCHING_JOB_CHUNK_SIZE)
+        job.status = 'completed' if job.done or not job.failed else 'failed'
+    except MatchingJobLost as e:
+        # Another worker re-claimed the job after our heartbeat went stale; it owns the results now
+        logger.warning(str(e))
+        return job
+    except Exception as e:
+        logger.exception(f"Matching job {job.id} failed")
+        job.status = 'failed'
+        job.error_message = str(e)
+
+    job.finished_at = timezone.now()
+    try:
+        _save_if_owner(job, status=job.status, error_message=job.error_message, finished_at=job.finished_at)
+    except MatchingJobLost as e:
+        logger.warning(str(e))
+        return job
+    logger.info(f"Matching job {job.id} {job.status}: {job.done} done, {job.failed} failed of {job.total}")
+    return job
+
+
+def _match_job_description(job, chunk_size):
+    from .views import ensure_jd_requirements, find_unchanged_matching_results, call_fastapi_batch_matching_service
+
+    jd = job.job_description
+    # The resume IDs were scoped to the JD (or the user's talent pool) when the job was queued
+    resumes = list(Resume.objects.filter(id__in=job.resume_ids, user=job.user))
+    if len(resumes) != job.total:
+        job.total = len(resumes)
+        _save_if_owner(job, total=job.total)
+
+    # Extract the JD's structured requirements once (no-op while the description is unchanged)
+    requirements = ensure_jd_requirements(jd)
+
+    # Keep results whose inputs haven't changed since they were produced
+    unchanged = {} if job.force else find_unchanged_matching_results(jd, resumes)[0]
+    candidates = [resume for resume in resumes if resume.id not in unchanged]
+
+    # Score locally first and skip the obvious misses without a model call
+    prescreened = prescreen_resumes(candidates, requirements, settings.MATCHING_PRESCREEN_FLOOR)
+    if prescreened:
+        logger.info(f"Pre-screen skipped {len(prescreened)} of {len(resumes)} resumes for JD {jd.id}")
+
+    job.unchanged = len(unchanged)
+    job.prescreened = len(prescreened)
+    settled = [_unchanged_summary(resume, unchanged[resume.id]) for resume in resumes if resume.id in unchanged]
+    for resume in candidates:
+        if resume.id in prescreened:
+            result = {'success': True, 'data': prescreened[resume.id], 'prescreened': True}
+            settled.append(save_matching_result(job.user, jd, resume, requirements, result))
+    _record_progress(job, settled, [])
+
+    # Match the remaining resumes with the FastAPI matching service, one chunk at a time
+    remaining = [resume for resume in candidates if resume.id not in prescreened]
+    for start in range(0, len(remaining), chunk_size):
+        chunk = remaining[start:start + chunk_size]
+        batch_results = call_fastapi_batch_matching_service(jd, chunk, force=job.force)
+        results, errors = [], []
+        for resume in chunk:
+            result = batch_results.get(resume.id)
+            try:
+                if result and result.get('unchanged'):
+                    existing = MatchingResult.objects.get(resume=resume, job_description=jd)
+                    results.append(_unchanged_summary(resume, existing))
+                    job.unchanged += 1
+                elif result and result.get('success') and result.get('data'):
+                    results.append(save_matching_result(job.user, jd, resume, requirements, result))
+                else:
+                    error_msg = result.get('error', 'Unknown error') if result else 'No response from matching service'
+                    errors.append(f"{resume.candidate_name}: {error_msg}")
+            except Exception as e:
+                errors.append(f"{resume.candidate_name}: {str(e)}")
+        _record_progress(job, results, errors)
+
+
+def _match_all_jobs(job):
+    resume = Resume.objects.filter(id__in=job.resume_ids, user=job.user).first()
+    if resume is None:
+        raise ValueError('Resume not found')
+    ranked, errors = match_resume_against_jobs(job.user, resume, force=job.force)
+    job.total = len(ranked) + len(errors)
+    job.prescreened = sum(1 for role in ranked if role.get('prescreened'))
+    job.unchanged = sum(1 for role in ranked if role.get('unchanged'))
+    _save_if_owner(job, total=job.total)
+    _record_progress(job, ranked, errors)
+
+
+def match_resume_against_jobs(user, resume, force=False):
+    """
+    Match one resume against all of the user's job descriptions and rank the roles
+
+    The resume digest is built once; results whose inputs are unchanged are
+    kept, clear misses are settled by the local pre-screen against each JD's
+    structured requirements, and the remaining JDs go to the matching
+    service in one cross-job call. All MatchingResult rows are written in a
+    single transaction.
+
+    Returns:
+        tuple: (role summaries sorted by score, best first; error messages)
+    """
+    from .views import ensure_jd_requirements, get_matching_service_info, matching_input_hash, call_fastapi_cross_jd_matching_service
+
+    jobs = list(JobDescription.objects.filter(user=user).order_by('-created_at'))
+    requirements = {jd.id: ensure_jd_requirements(jd) for jd in jobs}
+    existing = {result.job_description_id: result
+                for result in MatchingResult.objects.filter(resume=resume, job_description__in=jobs)}
+
+    # A stored result is unchanged if either the per-JD or the cross-job pipeline produced it from the same inputs
+    hashes, unchanged = {}, {}
+    service_info = get_matching_service_info()
+    if service_info:
+        cross_info = {**service_info, 'prompt_version': service_info['cross_job_prompt_version']}
+        for jd in jobs:
+            hashes[jd.id] = matching_input_hash(jd, resume, cross_info)
+            result = existing.get(jd.id)
+            if not force and result and result.input_hash in (hashes[jd.id], matching_input_hash(jd, resume, service_info)):
+                unchanged[jd.id] = result
+
+    prescreened = {}
+    for jd in jobs:
+        if jd.id not in unchanged:
+            skipped = prescreen_resumes([resume], requirements[jd.id], settings.MATCHING_PRESCREEN_FLOOR)
+            if skipped:
+                prescreened[jd.id] = skipped[resume.id]
+
+    remaining = [jd for jd in jobs if jd.id not in unchanged and jd.id not in prescreened]
+    service_results = call_fastapi_cross_jd_matching_service(resume, remaining) if remaining else {}
+
+    ranked, errors = [], []
+    with transaction.atomic():
+        for jd in jobs:
+            if jd.id in unchanged:
+                summary = _unchanged_summary(resume, unchanged[jd.id])
+            elif jd.id in prescreened:
+                result = {'success': True, 'data': prescreened[jd.id], 'prescreened': True}
+                summary = save_matching_result(user, jd, resume, requirements[jd.id], result)
+            else:
+                result = service_results.get(jd.id)
+                if not (result and result.get('success') and result.get('data')):
+                    error_msg = result.get('error', 'Unknown error') if result else 'No response from matching service'
+                    errors.append(f"{jd.title}: {error_msg}")
+                    continue
+                result['input_hash'] = hashes.get(jd.id, '')
+                summary = save_matching_result(user, jd, resume, requirements[jd.id], result)
+            ranked.append({
+                **summary,
+                'job_description_id': jd.id,
+                'title': jd.title,
+                'department': jd.department,
+            })
+
+    ranked.sort(key=lambda role: role['score'], reverse=True)
+    logger.info(f"Matched resume {resume.id} against {len(jobs)} JDs: {len(unchanged)} unchanged, "
+                f"{len(prescreened)} pre-screened, {len(remaining)} sent to the service, {len(errors)} failed")
+    return ranked, errors
+
+
+def job_progress(job):
+    """JSON-ready progress of a matching job for the polling endpoint"""
+    finished = job.status in ('completed', 'failed')
+    return {
+        'job_id': job.id,
+        'status': job.status,
+        'total': job.total,
+        'done': job.done,
+        'failed': job.failed,
+        'prescreened': job.prescreened,
+        'unchanged': job.unchanged,
+        'progress': round((job.done + job.failed) * 100 / job.total) if job.total else (100 if finished else 0),
+        'finished': finished,
+        'results': job.results if finished else [],
+        'errors': job.errors,
+        'error': job.error_message,
+    }
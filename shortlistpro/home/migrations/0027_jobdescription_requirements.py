@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0026_emailverificationotp'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobdescription',
+            name='requirements',
+            field=models.JSONField(blank=True, help_text='Must-have/nice-to-have skills, seniority, minimum years and degree level', null=True),
+        ),
+        migrations.AddField(
+            model_name='jobdescription',
+            name='requirements_hash',
+            field=models.CharField(blank=True, default='', help_text='Content hash of the description the requirements were extracted from', max_length=64),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0027_jobdescription_requirements'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchingresult',
+            name='input_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
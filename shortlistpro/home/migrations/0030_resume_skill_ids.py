@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0029_resume_digest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='skill_ids',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0032_matchingjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobdescription',
+            name='question_bank',
+            field=models.JSONField(blank=True, help_text='Background, motivation and per-skill screening questions for this role', null=True),
+        ),
+        migrations.AddField(
+            model_name='jobdescription',
+            name='question_bank_hash',
+            field=models.CharField(blank=True, default='', help_text='Content hash of the job description the question bank was generated from', max_length=64),
+        ),
+    ]
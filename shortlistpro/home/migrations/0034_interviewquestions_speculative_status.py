@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0033_jobdescription_question_bank'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='interviewquestions',
+            name='status',
+            field=models.CharField(choices=[('speculative', 'Pre-generated, Not Shortlisted Yet'), ('generated', 'Questions Generated'), ('reviewed', 'Reviewed by HR'), ('used', 'Used in Interview')], default='generated', max_length=20),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0034_interviewquestions_speculative_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewevaluation',
+            name='attempts',
+            field=models.IntegerField(default=0, help_text='Number of times a worker has claimed this evaluation'),
+        ),
+        migrations.AddField(
+            model_name='interviewevaluation',
+            name='last_error',
+            field=models.TextField(blank=True, default='', help_text='Error of the most recent failed attempt'),
+        ),
+        migrations.AddField(
+            model_name='interviewevaluation',
+            name='lease_expires_at',
+            field=models.DateTimeField(blank=True, help_text="When the worker's claim lapses and the evaluation can be reclaimed", null=True),
+        ),
+        migrations.AddField(
+            model_name='interviewevaluation',
+            name='lease_owner',
+            field=models.CharField(blank=True, default='', help_text='Worker currently running the evaluation', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='interviewevaluation',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, help_text='Earliest time a failed evaluation is retried', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='interviewevaluation',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='home_interv_status_0183bc_idx'),
+        ),
+    ]
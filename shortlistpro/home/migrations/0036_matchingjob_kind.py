@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0035_interviewevaluation_lease'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchingjob',
+            name='kind',
+            field=models.CharField(choices=[('job_description', 'Resumes against one job description'), ('all_jobs', 'One resume against all job descriptions')], default='job_description', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='matchingjob',
+            name='job_description',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='matching_jobs', to='home.jobdescription'),
+        ),
+    ]
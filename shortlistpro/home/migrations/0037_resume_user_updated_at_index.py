@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0036_matchingjob_kind'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['user', 'updated_at'], name='home_resume_user_id_96fda3_idx'),
+        ),
+    ]
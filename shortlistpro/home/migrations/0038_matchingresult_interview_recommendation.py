@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:55
+
+import json
+
+from django.db import migrations, models
+
+
+def copy_interview_recommendation(apps, schema_editor):
+    """Fill the new column from the recommendation stored in match_reasoning"""
+    MatchingResult = apps.get_model('home', 'MatchingResult')
+    for result in MatchingResult.objects.exclude(match_reasoning__isnull=True).only('id', 'match_reasoning').iterator():
+        try:
+            reasoning = json.loads(result.match_reasoning or '{}')
+        except (json.JSONDecodeError, TypeError):
+            continue
+        if not isinstance(reasoning, dict):
+            continue
+        recommendation = str(reasoning.get('interview_recommendation') or '')[:20]
+        if recommendation:
+            MatchingResult.objects.filter(id=result.id).update(interview_recommendation=recommendation)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0037_resume_user_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchingresult',
+            name='interview_recommendation',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+        migrations.RunPython(copy_interview_recommendation, migrations.RunPython.noop),
+    ]
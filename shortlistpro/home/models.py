@@ -2,6 +2,10 @@ from django.contrib.auth.models import User
 from django.db import models
 from django.utils import timezone
 from datetime import timedelta
+import hashlib
+
+from .resume_digest import build_resume_digest, digest_version_tag
+from .search_index import resume_search_terms
 
 class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
@@ -65,13 +69,52 @@ class EmailVerificationOTP(models.Model):
 
 # --- Dashboard Data Models ---
 class JobDescription(models.Model):
+    # Bump when the stored requirements gain or change fields so they are extracted again
+    REQUIREMENTS_VERSION = '3'
+
+    # Bump when the question bank prompt changes so banks are generated again
+    QUESTION_BANK_VERSION = '1'
+
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     title = models.CharField(max_length=255)
     department = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+
+    # Structured requirements extracted once from the description by the matching service
+    requirements = models.JSONField(null=True, blank=True, help_text="Must-have/nice-to-have skills, seniority, minimum years and degree level")
+    requirements_hash = models.CharField(max_length=64, blank=True, default='', help_text="Content hash of the description the requirements were extracted from")
+
+    # Reusable screening questions generated once per description; candidates' questions are selected from it
+    question_bank = models.JSONField(null=True, blank=True, help_text="Background, motivation and per-skill screening questions for this role")
+    question_bank_hash = models.CharField(max_length=64, blank=True, default='', help_text="Content hash of the job description the question bank was generated from")
+
     def __str__(self):
         return f"{self.title} ({self.department})"
+
+    @property
+    def description_hash(self):
+        """SHA-256 of the description text and requirements version, used to tell when the requirements are stale"""
+        content = f"{self.REQUIREMENTS_VERSION}\n{(self.description or '').strip()}"
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    @property
+    def requirements_current(self):
+        """Whether the stored requirements were extracted from the current description"""
+        return bool(self.requirements) and self.requirements_hash == self.description_hash
+
+    @property
+    def question_bank_source_hash(self):
+        """SHA-256 of the title, department, description and bank version, used to tell when the question bank is stale"""
+        content = f"{self.QUESTION_BANK_VERSION}\n{self.title}\n{self.department}\n{(self.description or '').strip()}"
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    @property
+    def question_bank_current(self):
+        """Whether the stored question bank was generated from the current job description"""
+        return bool(self.question_bank) and self.question_bank_hash == self.question_bank_source_hash
+
+
 class Resume(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     jobdescription = models.ForeignKey(JobDescription, on_delete=models.CASCADE, related_name='resumes', null=True, blank=True)
@@ -108,6 +151,18 @@ class Resume(models.Model):
     resume_file = models.FileField(upload_to='resumes/', blank=True, null=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
     
+    # Canonical skill taxonomy IDs found by the resume parser (e.g. ["python", "aws"])
+    skill_ids = models.JSONField(default=list, blank=True)
+    
+    # Compact, token-budgeted digest shared by the matching, question and evaluation agents
+    digest_text = models.TextField(blank=True, default='')
+    digest_json = models.JSONField(default=dict, blank=True)
+    digest_version = models.CharField(max_length=32, blank=True, default='')
+    
+    # Weighted term frequencies for the talent pool search index (see search_index.py)
+    search_terms = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, null=True)
+    
     class Meta:
         # Ensure that each user can only have one resume per email address per job description
         constraints = [
@@ -117,9 +172,43 @@ class Resume(models.Model):
                 condition=~models.Q(email='no-email@example.com')  # Exclude default email from uniqueness
             )
         ]
+        indexes = [
+            models.Index(fields=['user', 'updated_at']),  # Incremental search index syncs
+        ]
     
     def __str__(self):
         return f"{self.candidate_name} - Resume ({self.user.username})"
+    
+    def refresh_digest(self):
+        """Rebuild the digest from the current resume fields"""
+        self.digest_text, self.digest_json = build_resume_digest(self)
+        self.digest_version = digest_version_tag()
+    
+    def get_digest(self):
+        """
+        Return (digest text, digest JSON), rebuilding and storing them if they
+        were produced by an older digest version
+        """
+        if self.digest_version != digest_version_tag() or not self.digest_text:
+            self.refresh_digest()
+            if self.pk:
+                Resume.objects.filter(pk=self.pk).update(
+                    digest_text=self.digest_text,
+                    digest_json=self.digest_json,
+                    digest_version=self.digest_version,
+                )
+        return self.digest_text, self.digest_json
+    
+    def save(self, *args, **kwargs):
+        """Override save to keep the digest and search terms in step with the resume data"""
+        self.refresh_digest()
+        self.search_terms = resume_search_terms(self)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {
+                'digest_text', 'digest_json', 'digest_version', 'search_terms', 'updated_at',
+            }
+        super().save(*args, **kwargs)
 
 class Shortlisted(models.Model):
     resume = models.ForeignKey(Resume, on_delete=models.CASCADE)
@@ -174,6 +263,8 @@ class MatchingResult(models.Model):
     missing_skills = models.JSONField(default=list, blank=True)  # Skills required but missing
     experience_gap = models.CharField(max_length=255, blank=True, null=True)  # Experience analysis
     match_reasoning = models.TextField(blank=True, null=True)  # AI explanation
+    interview_recommendation = models.CharField(max_length=20, blank=True, default='')  # Interview/Maybe/Skip from the reasoning, for filtering
+    input_hash = models.CharField(max_length=64, blank=True, default='')  # Hash of resume payload, JD text, prompt version and model
     
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
@@ -214,19 +305,68 @@ class MatchingResult(models.Model):
     
     @property
     def has_interview_questions(self):
-        """Safely check if interview questions exist"""
-        try:
-            return self.interview_questions is not None
-        except InterviewQuestions.DoesNotExist:
-            return False
+        """Safely check if interview questions exist (speculative ones stay hidden until shortlisting)"""
+        return self.safe_interview_questions is not None
     
     @property
     def safe_interview_questions(self):
         """Safely get interview questions or None"""
         try:
-            return self.interview_questions
+            questions = self.interview_questions
         except InterviewQuestions.DoesNotExist:
             return None
+        return None if questions.status == 'speculative' else questions
+
+
+class MatchingJob(models.Model):
+    """Queued matching run for a set of resumes, processed by the run_matching_worker command"""
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    KIND_CHOICES = [
+        ('job_description', 'Resumes against one job description'),
+        ('all_jobs', 'One resume against all job descriptions'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='matching_jobs')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default='job_description')
+    job_description = models.ForeignKey(JobDescription, on_delete=models.CASCADE, related_name='matching_jobs',
+                                        null=True, blank=True)  # Unset for all_jobs runs
+    resume_ids = models.JSONField(default=list)
+    force = models.BooleanField(default=False)  # Re-match even if the inputs are unchanged
+
+    # Progress
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    total = models.PositiveIntegerField(default=0)
+    done = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    prescreened = models.PositiveIntegerField(default=0)
+    unchanged = models.PositiveIntegerField(default=0)
+    results = models.JSONField(default=list, blank=True)  # Per-resume summaries (score, recommendation)
+    errors = models.JSONField(default=list, blank=True)
+    error_message = models.TextField(blank=True, default='')  # Why the whole job failed
+
+    # Worker bookkeeping
+    worker = models.CharField(max_length=100, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)  # Updated after every chunk while running
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        target = self.job_description.title if self.job_description else 'all job descriptions'
+        return f"Matching job {self.id} for {target} ({self.status}, {self.done + self.failed}/{self.total})"
 
 
 class InterviewQuestions(models.Model):
@@ -247,6 +387,7 @@ class InterviewQuestions(models.Model):
     
     # Status tracking
     STATUS_CHOICES = [
+        ('speculative', 'Pre-generated, Not Shortlisted Yet'),
         ('generated', 'Questions Generated'),
         ('reviewed', 'Reviewed by HR'),
         ('used', 'Used in Interview'),
@@ -628,6 +769,13 @@ class InterviewEvaluation(models.Model):
     # Raw AI response
     raw_ai_response = models.JSONField(blank=True, null=True, help_text="Raw response from AI evaluation agent")
     
+    # Evaluation worker pool: lease held while a worker runs the evaluation, retries with back-off
+    attempts = models.IntegerField(default=0, help_text="Number of times a worker has claimed this evaluation")
+    lease_owner = models.CharField(max_length=100, blank=True, default='', help_text="Worker currently running the evaluation")
+    lease_expires_at = models.DateTimeField(blank=True, null=True, help_text="When the worker's claim lapses and the evaluation can be reclaimed")
+    next_attempt_at = models.DateTimeField(blank=True, null=True, help_text="Earliest time a failed evaluation is retried")
+    last_error = models.TextField(blank=True, default='', help_text="Error of the most recent failed attempt")
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -637,6 +785,7 @@ class InterviewEvaluation(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['status']),
+            models.Index(fields=['status', 'next_attempt_at']),
             models.Index(fields=['recommendation']),
             models.Index(fields=['overall_score']),
             models.Index(fields=['hr_reviewed']),
@@ -0,0 +1,247 @@
+import re
+
+import numpy as np
+
+# Minimum degree ordering used for the education fit check
+DEGREE_RANKS = {
+    'none': 0,
+    'high school': 1,
+    'diploma': 2,
+    "bachelor's": 3,
+    "master's": 4,
+    'phd': 5,
+}
+
+# Component weights of the local pre-score (mirrors the matcher's skills > experience > education order)
+SKILLS_WEIGHT = 0.45
+EXPERIENCE_WEIGHT = 0.35
+EDUCATION_WEIGHT = 0.20
+
+# Nice-to-have skills count for half as much as must-haves
+NICE_TO_HAVE_WEIGHT = 0.5
+
+
+def normalize_skill(skill):
+    """Lowercase a skill name and collapse punctuation/whitespace so spellings compare equal"""
+    return ' '.join(re.sub(r'[^\w+#.]+', ' ', str(skill).lower()).split())
+
+
+def degree_rank(degree_level):
+    """Map a degree level string ("Bachelor's", "MSc", "PhD") to its rank; unknown levels rank 0"""
+    text = normalize_skill(degree_level)
+    if not text:
+        return 0
+    if 'phd' in text or 'doctor' in text:
+        return DEGREE_RANKS['phd']
+    if 'master' in text or text.startswith(('m.', 'ms', 'msc', 'mba')):
+        return DEGREE_RANKS["master's"]
+    if 'bachelor' in text or text.startswith(('b.', 'bs', 'bsc', 'btech', 'be')):
+        return DEGREE_RANKS["bachelor's"]
+    if 'diploma' in text or 'associate' in text:
+        return DEGREE_RANKS['diploma']
+    if 'high school' in text or 'secondary' in text:
+        return DEGREE_RANKS['high school']
+    return 0
+
+
+def candidate_skill_set(resume):
+    """Normalized skills from Resume.skills and the skills_used of every work experience entry"""
+    skills = list(resume.skills or [])
+    for job in resume.work_experience or []:
+        if isinstance(job, dict):
+            skills.extend(job.get('skills_used') or [])
+    return {normalize_skill(skill) for skill in skills if skill and normalize_skill(skill)}
+
+
+def _has_skill(candidate_skills, skill):
+    """A required skill matches an identical candidate skill or a whole-word part of one ("aws" in "aws lambda")"""
+    if skill in candidate_skills:
+        return True
+    padded = f' {skill} '
+    return any(padded in f' {candidate} ' for candidate in candidate_skills)
+
+
+def required_skills(requirements):
+    """
+    Must-have and nice-to-have skills of a JD as {key: display name} dicts
+
+    Skills the JD analysis resolved to canonical IDs are keyed by ID; skills
+    outside the taxonomy (and all skills of JDs without IDs) are keyed by
+    their normalized name.
+
+    Returns:
+        tuple: (must-have dict, nice-to-have dict, set of the keys that are skill IDs)
+    """
+    names = requirements.get('skill_names') or {}
+    must_have = {skill_id: names.get(skill_id, skill_id) for skill_id in requirements.get('must_have_skill_ids') or []}
+    nice_to_have = {skill_id: names.get(skill_id, skill_id)
+                    for skill_id in requirements.get('nice_to_have_skill_ids') or [] if skill_id not in must_have}
+    id_keys = set(must_have) | set(nice_to_have)
+    if id_keys:
+        unresolved_must_have = requirements.get('unresolved_must_have_skills')
+        unresolved_nice_to_have = requirements.get('unresolved_nice_to_have_skills')
+    else:
+        unresolved_must_have = requirements.get('must_have_skills')
+        unresolved_nice_to_have = requirements.get('nice_to_have_skills')
+
+    for key, name in _unique_skills(unresolved_must_have).items():
+        must_have.setdefault(key, name)
+    for key, name in _unique_skills(unresolved_nice_to_have).items():
+        if key not in must_have:
+            nice_to_have.setdefault(key, name)
+    return must_have, nice_to_have, id_keys
+
+
+def build_incidence_matrix(resumes, skills, id_keys=frozenset()):
+    """
+    Build the candidate x skill incidence matrix
+
+    Skill ID columns are compared with the resume's canonical skill IDs;
+    name columns, and every column for resumes parsed before the taxonomy
+    existed, are compared with the normalized skill names.
+
+    Args:
+        resumes: Resume model instances (rows)
+        skills: Required skills as {key: display name} (columns)
+        id_keys: The keys of `skills` that are canonical skill IDs
+
+    Returns:
+        np.ndarray: Boolean matrix, True where the candidate has the skill
+    """
+    matrix = np.zeros((len(resumes), len(skills)), dtype=bool)
+    for row, resume in enumerate(resumes):
+        skill_ids = set(resume.skill_ids or [])
+        candidate_skills = None
+        for col, (key, name) in enumerate(skills.items()):
+            if skill_ids and key in id_keys:
+                matrix[row, col] = key in skill_ids
+                continue
+            if candidate_skills is None:
+                candidate_skills = candidate_skill_set(resume)
+            matrix[row, col] = _has_skill(candidate_skills, normalize_skill(name))
+    return matrix
+
+
+def _unique_skills(skills):
+    """Normalize a skill list, keeping the first spelling of each skill"""
+    seen = {}
+    for skill in skills or []:
+        key = normalize_skill(skill)
+        if key and key not in seen:
+            seen[key] = skill
+    return seen
+
+
+def skill_overlap(resume, requirements):
+    """
+    Matched and missing skills of a resume, computed from canonical skill IDs
+
+    JD skills outside the taxonomy are matched by normalized name, so they
+    still count as matched or missing.
+
+    Returns:
+        tuple: (matched skill names, missing must-have skill names), or None
+               when the resume or the JD has no skill IDs to compare
+    """
+    if not requirements or not resume.skill_ids:
+        return None
+    must_have, nice_to_have, id_keys = required_skills(requirements)
+    if not id_keys:
+        return None
+    skills = {**must_have, **nice_to_have}
+    has_skill = build_incidence_matrix([resume], skills, id_keys)[0]
+    matched = [name for col, name in enumerate(skills.values()) if has_skill[col]]
+    missing = [name for col, name in enumerate(must_have.values()) if not has_skill[col]]
+    return matched, missing
+
+
+def prescreen_resumes(resumes, requirements, floor):
+    """
+    Score every resume of a JD locally and build Skip results for the clear misses
+
+    Skill overlap, experience ratio and education fit are computed for all
+    resumes in one vectorized pass against the JD's structured requirements.
+    Resumes whose weighted pre-score is below `floor` get a deterministic
+    Skip result in the same shape as the matching service's response; the
+    rest still need the model.
+
+    Args:
+        resumes: Resume model instances for one job description
+        requirements: JobDescription.requirements (structured JD requirements)
+        floor: Pre-score (0-100) below which a resume is skipped; 0 disables skipping
+
+    Returns:
+        dict: resume ID -> matching data for the skipped resumes
+    """
+    resumes = list(resumes)
+    if not resumes or not requirements or floor <= 0:
+        return {}
+
+    must_have, nice_to_have, id_keys = required_skills(requirements)
+    skills = {**must_have, **nice_to_have}
+    skill_names = list(skills.values())
+    weights = np.array([1.0] * len(must_have) + [NICE_TO_HAVE_WEIGHT] * len(nice_to_have))
+
+    # Skill overlap: weighted share of the required skills each candidate has
+    matrix = build_incidence_matrix(resumes, skills, id_keys)
+    if weights.size:
+        skills_scores = matrix @ weights / weights.sum() * 100
+    else:
+        skills_scores = np.full(len(resumes), 100.0)  # Nothing to check against
+
+    # Experience ratio: candidate years over the required minimum, capped at 100%
+    min_years = float(requirements.get('min_years_experience') or 0)
+    years = np.array([float(resume.years_of_experience or 0) for resume in resumes])
+    if min_years > 0:
+        experience_scores = np.clip(years / min_years, 0, 1) * 100
+    else:
+        experience_scores = np.full(len(resumes), 100.0)
+
+    # Education fit: highest degree rank over the required rank, capped at 100%
+    required_rank = degree_rank(requirements.get('degree_level'))
+    ranks = np.array([
+        max([degree_rank(edu.get('degree_level') or edu.get('degree_title'))
+             for edu in resume.education or [] if isinstance(edu, dict)] or [0])
+        for resume in resumes
+    ], dtype=float)
+    if required_rank > 0:
+        education_scores = np.clip(ranks / required_rank, 0, 1) * 100
+    else:
+        education_scores = np.full(len(resumes), 100.0)
+
+    overall_scores = (
+        SKILLS_WEIGHT * skills_scores
+        + EXPERIENCE_WEIGHT * experience_scores
+        + EDUCATION_WEIGHT * education_scores
+    )
+
+    skipped = {}
+    for row in np.flatnonzero(overall_scores < floor):
+        resume = resumes[row]
+        has_skill = matrix[row]
+        matched = [skill_names[col] for col in np.flatnonzero(has_skill)]
+        missing_must_have = [name for col, name in enumerate(must_have.values()) if not has_skill[col]]
+        concerns = [f"Has {int(has_skill[:len(must_have)].sum())} of {len(must_have)} required skills"]
+        if min_years > 0 and years[row] < min_years:
+            concerns.append(f"{years[row]:g} of {min_years:g} required years")
+
+        skipped[resume.id] = {
+            'overall_score': int(round(overall_scores[row])),
+            'recommendation': 'Skip',
+            'confidence': 'High',
+            'strengths': [],
+            'concerns': concerns,
+            'conversation_topics': [],
+            'skills_match': 'Weak',
+            'experience_match': 'Weak' if experience_scores[row] < 50 else 'Adequate',
+            'education_fit': "Meets requirements" if education_scores[row] >= 100 else "Doesn't Meet requirements",
+            'skills_score': int(round(skills_scores[row])),
+            'experience_score': int(round(experience_scores[row])),
+            'education_score': int(round(education_scores[row])),
+            'matched_skills': matched[:10],
+            'missing_skills': missing_must_have[:5],
+            'experience_summary': f"Auto-skipped by local pre-screen (score {overall_scores[row]:.0f} below {floor:g}).",
+            'interview_priority': 'Skip',
+            'key_questions': [],
+        }
+    return skipped
@@ -0,0 +1,193 @@
+from django.conf import settings
+
+# Bump whenever the digest layout changes so stored digests are rebuilt on next use
+DIGEST_VERSION = "1"
+
+# Same rough characters-per-token ratio the AI agents use for their budgets
+CHARS_PER_TOKEN = 4
+
+# Per-section caps applied before the token budget
+MAX_SKILLS = 30
+MAX_JOBS = 5
+MAX_JOB_SKILLS = 8
+MAX_JOB_HIGHLIGHTS = 2
+MAX_PROJECTS = 3
+MAX_CERTIFICATIONS = 5
+MAX_ACTIVITIES = 3
+MAX_SUMMARY_CHARS = 300
+MAX_ITEM_CHARS = 150
+
+
+def count_tokens(text):
+    """Estimate the number of prompt tokens for a piece of text"""
+    return -(-len(text) // CHARS_PER_TOKEN)  # Ceiling division
+
+
+def _clip(text, max_chars=MAX_ITEM_CHARS):
+    """Shorten text to max_chars at a word boundary"""
+    text = ' '.join(str(text or '').split())
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    if ' ' in cut:
+        cut = cut[:cut.rindex(' ')]
+    return cut.rstrip(' ,;:.') + '...'
+
+
+def _dicts(items):
+    """Only the dict entries of a JSON list field (older rows may hold plain strings)"""
+    return [item for item in items or [] if isinstance(item, dict)]
+
+
+def _dates(item):
+    """Format an entry's start/end dates as 'start - end'"""
+    start, end = item.get('start_date') or '', item.get('end_date') or ''
+    return f"{start} - {end}" if start or end else ''
+
+
+def build_digest_data(resume):
+    """
+    Build the structured digest: the facts the matching, question and evaluation agents use
+
+    Keeps every role's title, company, dates and skills, but only the first
+    highlights of each; projects, certifications and activities are reduced
+    to their names and technologies.
+    """
+    jobs = []
+    for job in _dicts(resume.work_experience)[:MAX_JOBS]:
+        jobs.append({
+            'title': job.get('job_title', ''),
+            'company': job.get('company_name', ''),
+            'dates': _dates(job),
+            'months': job.get('duration_months') or 0,
+            'skills': list(job.get('skills_used') or [])[:MAX_JOB_SKILLS],
+            'highlights': [_clip(item) for item in (job.get('responsibilities') or [])[:MAX_JOB_HIGHLIGHTS]],
+        })
+
+    return {
+        'name': resume.candidate_name or 'Unknown',
+        'location': resume.location or '',
+        'career_level': resume.career_level or '',
+        'years_of_experience': resume.years_of_experience or 0,
+        'summary': _clip(resume.professional_summary, MAX_SUMMARY_CHARS),
+        'skills': list(resume.skills or [])[:MAX_SKILLS],
+        'experience': jobs,
+        'education': [
+            {
+                'degree': edu.get('degree_title', ''),
+                'level': edu.get('degree_level', ''),
+                'institution': edu.get('institution_name', ''),
+                'end': edu.get('end_date', ''),
+            }
+            for edu in _dicts(resume.education)
+        ],
+        'projects': [
+            {
+                'title': project.get('title', ''),
+                'technologies': list(project.get('technologies_used') or [])[:MAX_JOB_SKILLS],
+                'description': _clip(project.get('description'), 100),
+            }
+            for project in _dicts(resume.projects)[:MAX_PROJECTS]
+        ],
+        'certifications': [
+            cert.get('name', '') for cert in _dicts(resume.certifications)[:MAX_CERTIFICATIONS] if cert.get('name')
+        ],
+        'activities': [
+            activity.get('title', '') for activity in _dicts(resume.extracurricular)[:MAX_ACTIVITIES] if activity.get('title')
+        ],
+    }
+
+
+def render_digest_text(data):
+    """Render the digest as compact prompt text with one line per fact"""
+    lines = [
+        f"Candidate: {data['name']}",
+        f"Level: {data['career_level'] or 'Unknown'}, {data['years_of_experience']} years experience"
+        + (f", {data['location']}" if data['location'] else ''),
+    ]
+    if data['summary']:
+        lines.append(f"Summary: {data['summary']}")
+    if data['skills']:
+        lines.append(f"Skills: {', '.join(data['skills'])}")
+    if data['experience']:
+        lines.append("Experience:")
+        for job in data['experience']:
+            header = f"- {job['title']} at {job['company']}"
+            if job['dates']:
+                header += f" ({job['dates']})"
+            lines.append(header)
+            if job['skills']:
+                lines.append(f"  Skills used: {', '.join(job['skills'])}")
+            lines += [f"  * {highlight}" for highlight in job['highlights']]
+    if data['education']:
+        lines.append("Education:")
+        for edu in data['education']:
+            line = f"- {edu['degree'] or edu['level']}, {edu['institution']}"
+            lines.append(line + (f" ({edu['end']})" if edu['end'] else ''))
+    if data['projects']:
+        lines.append("Projects:")
+        for project in data['projects']:
+            line = f"- {project['title']}"
+            if project['technologies']:
+                line += f" [{', '.join(project['technologies'])}]"
+            if project['description']:
+                line += f": {project['description']}"
+            lines.append(line)
+    if data['certifications']:
+        lines.append(f"Certifications: {', '.join(data['certifications'])}")
+    if data['activities']:
+        lines.append(f"Activities: {', '.join(data['activities'])}")
+    return "\n".join(lines)
+
+
+def _shrink(data):
+    """
+    Drop the least important remaining detail from the digest
+
+    Returns False once there is nothing left to drop.
+    """
+    for key in ('activities', 'certifications', 'projects'):
+        if data[key]:
+            data[key].pop()
+            return True
+    # Highlights of the oldest roles go first, then the oldest roles themselves
+    for job in reversed(data['experience']):
+        if job['highlights']:
+            job['highlights'].pop()
+            return True
+    if len(data['experience']) > 1:
+        data['experience'].pop()
+        return True
+    if len(data['skills']) > 10:
+        del data['skills'][-5:]
+        return True
+    if data['summary']:
+        data['summary'] = ''
+        return True
+    return False
+
+
+def build_resume_digest(resume, max_tokens=None):
+    """
+    Build the compact digest of a resume that every AI agent receives
+
+    Args:
+        resume: Resume model instance
+        max_tokens: Token budget of the digest text (default: settings.RESUME_DIGEST_TOKEN_BUDGET)
+
+    Returns:
+        tuple: (digest text, digest JSON data)
+    """
+    if max_tokens is None:
+        max_tokens = settings.RESUME_DIGEST_TOKEN_BUDGET
+
+    data = build_digest_data(resume)
+    text = render_digest_text(data)
+    while max_tokens > 0 and count_tokens(text) > max_tokens and _shrink(data):
+        text = render_digest_text(data)
+    return text, data
+
+
+def digest_version_tag():
+    """Version stored with each digest; changes with the layout version or the token budget"""
+    return f"{DIGEST_VERSION}:{settings.RESUME_DIGEST_TOKEN_BUDGET}"
@@ -0,0 +1,240 @@
+import heapq
+import math
+import re
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+
+# BM25 parameters (standard defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Field weights: a term counts this many times per occurrence in the field
+SKILL_WEIGHT = 3
+TITLE_WEIGHT = 2
+TEXT_WEIGHT = 1
+
+# Incremental syncs re-check resumes updated this long before the newest one already indexed,
+# so a save that committed after a later one is not missed
+SYNC_OVERLAP = timedelta(seconds=60)
+
+# Seconds between full syncs, which also drop resumes deleted by other processes
+FULL_SYNC_SECONDS = 300
+
+# Canonical skill IDs are indexed as their own terms, e.g. "skill:python"
+SKILL_TERM_PREFIX = 'skill:'
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in', 'is', 'it',
+    'its', 'of', 'on', 'or', 'our', 'that', 'the', 'their', 'this', 'to', 'was', 'we', 'were', 'will',
+    'with', 'you', 'your', 'who', 'using', 'used', 'use', 'work', 'worked', 'working', 'experience',
+    'team', 'role', 'responsible', 'strong', 'ability', 'skills', 'years', 'year', 'etc',
+}
+
+
+def tokenize(text):
+    """Lowercase word tokens without stopwords; keeps symbols that matter in skills (c++, c#, node.js)"""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(str(text or '').lower()):
+        token = token.rstrip('.')
+        if token and token not in STOPWORDS and (len(token) > 1 or token in ('c', 'r')):
+            tokens.append(token)
+    return tokens
+
+
+def _add_weighted(terms, text, weight):
+    for token in tokenize(text):
+        terms[token] += weight
+
+
+def resume_search_terms(resume):
+    """
+    Weighted term frequencies of a resume for the talent pool index
+
+    Indexes skills (and their canonical IDs), job titles, the professional
+    summary and work responsibilities.
+    """
+    terms = Counter()
+    for skill in resume.skills or []:
+        _add_weighted(terms, skill, SKILL_WEIGHT)
+    for skill_id in resume.skill_ids or []:
+        terms[SKILL_TERM_PREFIX + skill_id] += SKILL_WEIGHT
+    _add_weighted(terms, resume.professional_summary, TEXT_WEIGHT)
+    for job in resume.work_experience or []:
+        if not isinstance(job, dict):
+            continue
+        _add_weighted(terms, job.get('job_title'), TITLE_WEIGHT)
+        for skill in job.get('skills_used') or []:
+            _add_weighted(terms, skill, SKILL_WEIGHT)
+        for item in job.get('responsibilities') or []:
+            _add_weighted(terms, item, TEXT_WEIGHT)
+    return dict(terms)
+
+
+def job_description_query(job_description):
+    """Weighted query terms for a job description (title, structured requirements and description)"""
+    terms = Counter()
+    _add_weighted(terms, job_description.title, TITLE_WEIGHT)
+    requirements = job_description.requirements if job_description.requirements_current else None
+    if requirements:
+        for skill in requirements.get('must_have_skills') or []:
+            _add_weighted(terms, skill, SKILL_WEIGHT)
+        for skill in requirements.get('nice_to_have_skills') or []:
+            _add_weighted(terms, skill, TEXT_WEIGHT)
+        for skill_id in requirements.get('must_have_skill_ids') or []:
+            terms[SKILL_TERM_PREFIX + skill_id] += SKILL_WEIGHT
+        for skill_id in requirements.get('nice_to_have_skill_ids') or []:
+            terms[SKILL_TERM_PREFIX + skill_id] += TEXT_WEIGHT
+    _add_weighted(terms, job_description.description, TEXT_WEIGHT)
+    return terms
+
+
+class BM25Index:
+    """
+    In-memory inverted index over one HR user's resumes with BM25 ranking.
+
+    Documents are added, replaced and removed one at a time, so the index is
+    kept current without rebuilding. `versions` records the updated_at of the
+    resume each document was built from, which `sync` uses to catch changes
+    made by other processes.
+    """
+
+    def __init__(self):
+        self.postings = {}  # term -> {resume ID: term frequency}
+        self.doc_terms = {}  # resume ID -> {term: term frequency}
+        self.doc_lengths = {}
+        self.total_length = 0
+        self.versions = {}
+        self.synced_through = None  # Newest updated_at seen by a sync
+        self.full_synced_at = None  # time.monotonic() of the last full sync
+        self.lock = threading.Lock()
+
+    def add(self, resume_id, terms, version=None):
+        """Index a resume's terms, replacing any previous version of it"""
+        self.remove(resume_id)
+        self.doc_terms[resume_id] = terms
+        length = sum(terms.values())
+        self.doc_lengths[resume_id] = length
+        self.total_length += length
+        self.versions[resume_id] = version
+        for term, frequency in terms.items():
+            self.postings.setdefault(term, {})[resume_id] = frequency
+
+    def remove(self, resume_id):
+        """Drop a resume from the index (no-op if it isn't indexed)"""
+        terms = self.doc_terms.pop(resume_id, None)
+        if terms is None:
+            return
+        self.total_length -= self.doc_lengths.pop(resume_id)
+        self.versions.pop(resume_id, None)
+        for term in terms:
+            documents = self.postings.get(term)
+            if documents is not None:
+                documents.pop(resume_id, None)
+                if not documents:
+                    del self.postings[term]
+
+    def search(self, query_terms, top_k=20):
+        """
+        Rank the indexed resumes against weighted query terms
+
+        Returns:
+            list: (resume ID, BM25 score) pairs, best first
+        """
+        count = len(self.doc_terms)
+        if not count:
+            return []
+        average_length = self.total_length / count or 1
+        scores = {}
+        for term, query_weight in query_terms.items():
+            documents = self.postings.get(term)
+            if not documents:
+                continue
+            idf = math.log(1 + (count - len(documents) + 0.5) / (len(documents) + 0.5))
+            for resume_id, frequency in documents.items():
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[resume_id] / average_length)
+                score = idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+                scores[resume_id] = scores.get(resume_id, 0.0) + query_weight * score
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+
+    def __len__(self):
+        return len(self.doc_terms)
+
+
+# One index per HR user, built on first use and then kept up to date
+_user_indexes = {}
+_user_indexes_lock = threading.Lock()
+
+
+def _index_for(user_id):
+    with _user_indexes_lock:
+        return _user_indexes.setdefault(user_id, BM25Index())
+
+
+def sync_user_index(user_id):
+    """
+    Bring a user's index in line with the database and return it
+
+    Only resumes updated since the newest one already indexed are queried;
+    deletions in this process arrive through the post_delete signal. Every
+    FULL_SYNC_SECONDS all IDs are compared instead, which also drops resumes
+    deleted by other processes. Resumes saved before search terms were
+    stored get them computed and saved.
+    """
+    from .models import Resume
+
+    index = _index_for(user_id)
+    with index.lock:
+        resumes = Resume.objects.filter(user_id=user_id)
+        full = index.full_synced_at is None or time.monotonic() - index.full_synced_at > FULL_SYNC_SECONDS
+        if full:
+            current = dict(resumes.values_list('id', 'updated_at'))
+            for resume_id in set(index.versions) - set(current):
+                index.remove(resume_id)
+            index.full_synced_at = time.monotonic()
+        else:
+            if index.synced_through is not None:
+                resumes = resumes.filter(updated_at__gte=index.synced_through - SYNC_OVERLAP)
+            current = dict(resumes.values_list('id', 'updated_at'))
+        stale = [rid for rid, version in current.items() if rid not in index.versions or index.versions[rid] != version]
+        if stale:
+            for resume in Resume.objects.filter(id__in=stale):
+                if not resume.search_terms:
+                    resume.search_terms = resume_search_terms(resume)
+                    Resume.objects.filter(pk=resume.pk).update(search_terms=resume.search_terms)
+                index.add(resume.id, resume.search_terms, resume.updated_at)
+        versions = [version for version in current.values() if version is not None]
+        if versions:
+            index.synced_through = max([index.synced_through or versions[0], *versions])
+    return index
+
+
+def index_resume(resume):
+    """Update the owner's index after a resume is saved (only if that index is loaded in this process)"""
+    index = _user_indexes.get(resume.user_id)
+    if index is not None:
+        with index.lock:
+            index.add(resume.id, resume.search_terms or resume_search_terms(resume), resume.updated_at)
+
+
+def unindex_resume(resume):
+    """Remove a deleted resume from the owner's index, if loaded"""
+    index = _user_indexes.get(resume.user_id)
+    if index is not None:
+        with index.lock:
+            index.remove(resume.id)
+
+
+def rank_talent_pool(job_description, top_k=20):
+    """
+    Rank all of the JD owner's stored resumes against the job description
+
+    Returns:
+        list: (resume ID, BM25 score) pairs, best first
+    """
+    index = sync_user_index(job_description.user_id)
+    with index.lock:
+        return index.search(job_description_query(job_description), top_k)
@@ -1,7 +1,8 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.contrib.auth.models import User
 from django.dispatch import receiver
-from .models import Profile
+from .models import Profile, Resume
+from .search_index import index_resume, unindex_resume
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -11,3 +12,11 @@ def create_user_profile(sender, instance, created, **kwargs):
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
     instance.profile.save()
+
+@receiver(post_save, sender=Resume)
+def update_resume_search_index(sender, instance, **kwargs):
+    index_resume(instance)
+
+@receiver(post_delete, sender=Resume)
+def remove_resume_search_index(sender, instance, **kwargs):
+    unindex_resume(instance)
@@ -0,0 +1,119 @@
+import json
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import InterviewQuestions, MatchingResult
+
+logger = logging.getLogger(__name__)
+
+# Seconds before a candidate whose speculative generation failed is tried again
+RETRY_AFTER_SECONDS = 600
+
+# Only one worker thread per process generates speculative questions at a time
+_generation_lock = threading.Lock()
+_retry_after = {}
+
+
+def is_speculative_candidate(matching_result):
+    """Whether the matcher recommends interviewing this pending candidate with a configured priority"""
+    if matching_result.status != 'pending' or matching_result.interview_recommendation != 'Interview':
+        return False
+    try:
+        reasoning = json.loads(matching_result.match_reasoning or '{}')
+    except (json.JSONDecodeError, TypeError):
+        return False
+    return str(reasoning.get('interview_priority', '')).lower() in settings.SPECULATIVE_QUESTIONS_PRIORITIES
+
+
+def find_speculative_candidates(limit):
+    """
+    Pending candidates recommended for interview that have no questions yet, best matches first
+
+    Rows are narrowed in the database to recent pending results without
+    questions that are recommended for interview; the priority is checked on
+    the parsed reasoning. Results older than the TTL are left alone so
+    expired questions aren't generated again.
+    """
+    now = time.monotonic()
+    cutoff = timezone.now() - timedelta(hours=settings.SPECULATIVE_QUESTIONS_TTL_HOURS)
+    queryset = (
+        MatchingResult.objects.filter(
+            status='pending',
+            created_at__gte=cutoff,
+            interview_questions__isnull=True,
+            interview_recommendation='Interview',
+        )
+        .select_related('resume', 'job_description')
+        .order_by('-overall_score', 'id')
+    )
+    candidates = []
+    for matching_result in queryset.iterator(chunk_size=200):
+        if _retry_after.get(matching_result.id, 0) > now or not is_speculative_candidate(matching_result):
+            continue
+        candidates.append(matching_result)
+        if len(candidates) >= limit:
+            break
+    return candidates
+
+
+def generate_speculative_questions(limit=None):
+    """
+    Pre-generate interview questions for likely-interview candidates
+
+    Called by the matching worker when its queue is empty, so speculative
+    work never delays matching. Questions are stored with the 'speculative'
+    status and promoted when the candidate is shortlisted.
+
+    Returns:
+        int: Number of candidates that got speculative questions
+    """
+    from .views import generate_interview_questions
+
+    if not settings.SPECULATIVE_QUESTIONS_ENABLED or not _generation_lock.acquire(blocking=False):
+        return 0
+    try:
+        candidates = find_speculative_candidates(limit or settings.SPECULATIVE_QUESTIONS_BATCH_SIZE)
+        if not candidates:
+            return 0
+        generated, errors = generate_interview_questions(candidates, speculative=True)
+        retry_at = time.monotonic() + RETRY_AFTER_SECONDS
+        for matching_result_id in errors:
+            _retry_after[matching_result_id] = retry_at
+        return generated
+    finally:
+        _generation_lock.release()
+
+
+def discard_stale_speculative_questions(matching_result):
+    """Drop the speculative questions of a result whose matching inputs just changed"""
+    InterviewQuestions.objects.filter(matching_result=matching_result, status='speculative').delete()
+
+
+def expire_speculative_questions(matching_results=None):
+    """
+    Delete speculative questions nobody is going to use
+
+    With matching_results (instances or IDs), deletes theirs - called when
+    candidates are rejected; without,
+    sweeps the ones of rejected candidates and those older than
+    SPECULATIVE_QUESTIONS_TTL_HOURS.
+
+    Returns:
+        int: Number of rows deleted
+    """
+    speculative = InterviewQuestions.objects.filter(status='speculative')
+    if matching_results is not None:
+        speculative = speculative.filter(matching_result__in=matching_results)
+    else:
+        cutoff = timezone.now() - timedelta(hours=settings.SPECULATIVE_QUESTIONS_TTL_HOURS)
+        speculative = speculative.filter(Q(matching_result__status='rejected') | Q(generated_at__lt=cutoff))
+    count, _ = speculative.delete()
+    if count:
+        logger.info(f"Expired {count} speculative interview question set(s)")
+    return count
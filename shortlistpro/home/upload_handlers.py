@@ -0,0 +1,65 @@
+from functools import wraps
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile, StopUpload
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+
+
+class ResumeUploadLimitHandler(FileUploadHandler):
+    """
+    Enforce the resume upload size caps while the request body is being read
+
+    Oversized files are skipped as soon as they cross RESUME_MAX_FILE_MB, and a
+    request whose Content-Length is over RESUME_MAX_BATCH_MB is stopped before
+    any file is stored. The problems are recorded on request.resume_upload_errors
+    for the view to report.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.max_file_bytes = settings.RESUME_MAX_FILE_MB * 1024 * 1024
+        self.max_batch_bytes = settings.RESUME_MAX_BATCH_MB * 1024 * 1024
+        self.file_bytes = 0
+        self.batch_too_large = False
+        request.resume_upload_errors = []
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        self.batch_too_large = bool(content_length and content_length > self.max_batch_bytes)
+        return None
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.file_bytes = 0
+        if self.batch_too_large:
+            # Form fields before the first file are kept; the file data is discarded
+            self.request.resume_upload_errors.append(
+                f'Upload is larger than the {settings.RESUME_MAX_BATCH_MB} MB batch limit.'
+            )
+            raise StopUpload(connection_reset=False)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.file_bytes += len(raw_data)
+        if self.file_bytes > self.max_file_bytes:
+            self.request.resume_upload_errors.append(
+                f'{self.file_name} is larger than the {settings.RESUME_MAX_FILE_MB} MB file limit.'
+            )
+            raise SkipFile()
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+
+def limit_resume_uploads(view):
+    """
+    Install ResumeUploadLimitHandler for a view that receives resume files
+
+    Upload handlers can only be changed before the body is parsed, and the CSRF
+    middleware parses it before the view runs, so CSRF is checked here instead.
+    """
+    @csrf_exempt
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        request.upload_handlers.insert(0, ResumeUploadLimitHandler(request))
+        return csrf_protect(view)(request, *args, **kwargs)
+    return wrapped
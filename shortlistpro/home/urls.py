@@ -12,7 +12,10 @@ urlpatterns = [
     path('dashboard/', views.dashboard_home, name='dashboard_home'),
     path('dashboard/jobs/', views.job_descriptions, name='job_descriptions'),
     path('dashboard/resumes/', views.resumes, name='resumes'),
+    path('dashboard/resumes/stream-upload/', views.resumes_stream, name='resumes_stream'),
+    path('dashboard/resumes/<int:resume_id>/match-all-jobs/', views.match_resume_all_jobs, name='match_resume_all_jobs'),
     path('dashboard/matching/', views.matching, name='matching'),
+    path('dashboard/matching/jobs/<int:job_id>/', views.matching_job_status, name='matching_job_status'),
     path('dashboard/shortlisted/', views.shortlisted, name='shortlisted'),
     path('dashboard/shortlist-candidate/', views.shortlist_candidate, name='shortlist_candidate'),
     path('dashboard/reject-candidate/', views.reject_candidate, name='reject_candidate'),
@@ -60,4 +60,33 @@ def validate_otp_format(otp_code):
     if len(otp_code) != 6:
         return False, "OTP must be exactly 6 digits"
     
-    return True, "Valid format"
\ No newline at end of file
+    return True, "Valid format"
+
+
+def stream_multipart_files(files, field_name='files', chunk_size=64 * 1024):
+    """
+    Build a multipart/form-data body that streams uploaded files in chunks
+    
+    Lets requests send a bulk upload to the parser service without reading
+    every file into memory first (the body goes out with chunked encoding).
+    
+    Returns:
+        tuple: (body generator, Content-Type header value)
+    """
+    boundary = secrets.token_hex(16)
+    
+    def body():
+        for f in files:
+            filename = f.name.replace('"', '%22').replace('\r', '').replace('\n', '')
+            content_type = f.content_type or 'application/octet-stream'
+            yield (
+                f'--{boundary}\r\n'
+                f'Content-Disposition: form-data; name="{field_name}"; filename="{filename}"\r\n'
+                f'Content-Type: {content_type}\r\n\r\n'
+            ).encode('utf-8')
+            for chunk in f.chunks(chunk_size):
+                yield chunk
+            yield b'\r\n'
+        yield f'--{boundary}--\r\n'.encode('utf-8')
+    
+    return body(), f'multipart/form-data; boundary={boundary}'
@@ -24,34 +24,52 @@ import requests
 import os
 import json
 import logging
+import hashlib
+import time
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.contrib.auth.forms import PasswordChangeForm
 from django.contrib.auth import update_session_auth_hash, login
 from django.shortcuts import redirect, get_object_or_404
-from django.http import JsonResponse
+from django.urls import reverse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.http import require_http_methods, require_POST
 from django.views.decorators.csrf import csrf_exempt
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from .forms import UserForm, ProfileForm, JobDescriptionForm, ResumeForm, CustomRegistrationForm
-from .models import Resume, Shortlisted, Interview, JobDescription, MatchingResult, InterviewQuestions, InterviewSession, InterviewRecording, InterviewMessage, InterviewStage, CandidatePipeline, EmailVerificationOTP
+from .models import Resume, Shortlisted, Interview, JobDescription, MatchingResult, MatchingJob, InterviewQuestions, InterviewSession, InterviewRecording, InterviewMessage, InterviewStage, CandidatePipeline, EmailVerificationOTP
 from django.utils import timezone
 from datetime import timedelta
 from django.utils import timezone
 from datetime import timedelta
 import json
 import logging
-from .utils import generate_otp, can_resend_otp, validate_otp_format
+from .utils import generate_otp, can_resend_otp, validate_otp_format, stream_multipart_files
+from .upload_handlers import limit_resume_uploads
+from .evaluation_worker import requeue_evaluation
+from .matching_jobs import enqueue_all_jobs_matching, enqueue_matching_job, job_progress
+from .speculative_questions import expire_speculative_questions
+from .search_index import rank_talent_pool
 from django.conf import settings
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # FastAPI service configurations
-FASTAPI_MATCHING_URL = "http://localhost:8005/match-resume"
-FASTAPI_INTERVIEW_QUESTIONS_URL = "http://localhost:8004/generate-questions"
+FASTAPI_PARSER_BATCH_URL = "http://127.0.0.1:8001/parse-resumes/batch"
+FASTAPI_PARSER_STREAM_URL = "http://127.0.0.1:8001/parse-resumes/stream"
+FASTAPI_BATCH_MATCHING_URL = "http://localhost:8005/match-resumes"
+FASTAPI_CROSS_JD_MATCHING_URL = "http://localhost:8005/match-resume/jobs"
+FASTAPI_JD_ANALYSIS_URL = "http://localhost:8005/analyze-jd"
+FASTAPI_MATCHING_HEALTH_URL = "http://localhost:8005/health"
+FASTAPI_INTERVIEW_QUESTIONS_BATCH_URL = "http://localhost:8004/generate-questions/batch"
+FASTAPI_QUESTION_BANK_URL = "http://localhost:8004/generate-question-bank"
 FASTAPI_INTERVIEW_EVALUATION_URL = "http://localhost:8002/evaluate-interview"
 FASTAPI_TIMEOUT = 60  # Increased timeout for AI processing
+FASTAPI_BATCH_TIMEOUT = 600  # Batch calls cover many candidates at once
+
+# Upper bound on top_k for talent pool ranking
+TALENT_POOL_MAX_RESULTS = 200
 
 
 # OTP Email Verification Views
@@ -207,143 +225,352 @@ def resend_otp_view(request, user_id):
     return redirect('verify_otp', user_id=user_id)
 
 
-def call_fastapi_interview_questions_service(matching_result):
+def call_fastapi_jd_analysis_service(job_description):
     """
-    Call the FastAPI interview questions generation service
+    Call the FastAPI job description analysis service
     
     Args:
-        matching_result: MatchingResult model instance
+        job_description: JobDescription model instance
         
     Returns:
-        dict: API response with generated questions or error info
+        dict: Structured requirements, or None if the analysis failed
     """
     try:
-        # Prepare resume data as string
-        resume_info = f"""
-Candidate: {matching_result.resume.candidate_name}
-Email: {matching_result.resume.email}
-Phone: {matching_result.resume.phone or 'Not provided'}
-Location: {matching_result.resume.location or 'Not provided'}
-Career Level: {matching_result.resume.career_level}
-Years of Experience: {matching_result.resume.years_of_experience}
-
-Professional Summary:
-{matching_result.resume.professional_summary or 'Not provided'}
-
-Skills: {', '.join(matching_result.resume.skills or [])}
-
-Work Experience:
-{json.dumps(matching_result.resume.work_experience or [], indent=2)}
-
-Education:
-{json.dumps(matching_result.resume.education or [], indent=2)}
-
-Projects:
-{json.dumps(matching_result.resume.projects or [], indent=2)}
-
-Certifications:
-{json.dumps(matching_result.resume.certifications or [], indent=2)}
-        """.strip()
-        
-        # Prepare job description as string
-        job_desc = f"""
-Title: {matching_result.job_description.title}
-Department: {matching_result.job_description.department}
-Description: {matching_result.job_description.description}
-        """.strip()
-        
-        # Prepare matching results
-        matching_data = {
-            "overall_score": float(matching_result.overall_score),
-            "skills_score": float(matching_result.skills_score),
-            "experience_score": float(matching_result.experience_score),
-            "education_score": float(matching_result.education_score),
-            "matched_skills": matching_result.matched_skills or [],
-            "missing_skills": matching_result.missing_skills or [],
-            "experience_gap": matching_result.experience_gap or ""
+        logger.info(f"Calling JD analysis service for job description {job_description.id}")
+        response = requests.post(
+            FASTAPI_JD_ANALYSIS_URL,
+            json={"job_description": job_description.description},
+            headers={"Content-Type": "application/json"},
+            timeout=FASTAPI_TIMEOUT
+        )
+        
+        if response.status_code != 200:
+            logger.error(f"JD analysis service returned status {response.status_code}: {response.text}")
+            return None
+        
+        result = response.json()
+        if not result.get('success'):
+            logger.error(f"JD analysis failed for job description {job_description.id}: {result.get('error')}")
+            return None
+        return result.get('data')
+        
+    except requests.RequestException as e:
+        logger.error(f"Failed to call JD analysis service: {str(e)}")
+        return None
+
+
+def ensure_jd_requirements(job_description):
+    """
+    Make sure a job description has structured requirements for its current text
+    
+    The analysis runs once per description: the requirements are stored with
+    the description's content hash and only re-extracted after the text changes.
+    
+    Args:
+        job_description: JobDescription model instance
+        
+    Returns:
+        dict: The stored requirements, or None if they are unavailable
+    """
+    if job_description.requirements_current:
+        return job_description.requirements
+    if not (job_description.description or '').strip():
+        return None
+    
+    requirements = call_fastapi_jd_analysis_service(job_description)
+    if not requirements:
+        return None
+    
+    job_description.requirements = requirements
+    job_description.requirements_hash = job_description.description_hash
+    job_description.save(update_fields=['requirements', 'requirements_hash'])
+    logger.info(f"Stored structured requirements for job description {job_description.id}")
+    return requirements
+
+
+def format_job_description(job_description):
+    """
+    Build the job description text sent to the AI services
+    
+    Uses the compact structured requirements when they are current and falls
+    back to the full description otherwise, so prompts never go without a JD.
+    
+    Args:
+        job_description: JobDescription model instance
+        
+    Returns:
+        str: Job description text for the prompt
+    """
+    lines = [
+        f"Title: {job_description.title}",
+        f"Department: {job_description.department}",
+    ]
+    
+    if not job_description.requirements_current:
+        lines.append(f"Description: {job_description.description}")
+        return "\n".join(lines)
+    
+    requirements = job_description.requirements
+    if requirements.get('role_summary'):
+        lines.append(f"Role: {requirements['role_summary']}")
+    lines += [
+        f"Seniority: {requirements.get('seniority') or 'Not specified'}",
+        f"Minimum Experience: {requirements.get('min_years_experience') or 0:g} years",
+        f"Minimum Degree: {requirements.get('degree_level') or 'None'}",
+        f"Must-Have Skills: {', '.join(requirements.get('must_have_skills') or []) or 'None listed'}",
+        f"Nice-to-Have Skills: {', '.join(requirements.get('nice_to_have_skills') or []) or 'None listed'}",
+    ]
+    responsibilities = requirements.get('key_responsibilities') or []
+    if responsibilities:
+        lines.append("Key Responsibilities:")
+        lines += [f"- {item}" for item in responsibilities]
+    return "\n".join(lines)
+
+
+def _json_list(value):
+    """MatchingResult skill lists are stored as JSON text by the matching views; accept either form"""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            return []
+    return value or []
+
+
+def build_questions_matching_data(matching_result):
+    """Matching results sent to the interview questions service"""
+    return {
+        "overall_score": float(matching_result.overall_score),
+        "skills_score": float(matching_result.skills_score),
+        "experience_score": float(matching_result.experience_score),
+        "education_score": float(matching_result.education_score),
+        "matched_skills": _json_list(matching_result.matched_skills),
+        "missing_skills": _json_list(matching_result.missing_skills),
+        "experience_gap": matching_result.experience_gap or ""
+    }
+
+
+def format_questions_response(response_data):
+    """Reshape an InterviewQuestionsResult from the questions service into questions + metadata"""
+    return {
+        "success": True,
+        "questions": [
+            {
+                "question": q["question"],
+                "category": q["category"],
+                "purpose": q["purpose"],
+                "priority": q.get("priority", "medium")
+            } for q in response_data["questions"]
+        ],
+        "metadata": {
+            "total_questions": response_data["total_questions"],
+            "estimated_duration": response_data["estimated_duration"],
+            "complexity_level": response_data["complexity_level"],
+            "focus_areas": response_data["focus_areas"],
+            "question_distribution": response_data["question_distribution"]
         }
+    }
+
+
+def ensure_question_bank(job_description):
+    """
+    Make sure a job description has a question bank for its current text
+    
+    The bank is generated once per job description and reused for every
+    shortlisted candidate; it is only regenerated after the title,
+    department or description change.
+    
+    Args:
+        job_description: JobDescription model instance
+        
+    Returns:
+        dict: The stored question bank, or None if it is unavailable
+    """
+    if job_description.question_bank_current:
+        return job_description.question_bank
+    
+    try:
+        logger.info(f"Generating question bank for job description {job_description.id}")
+        response = requests.post(
+            FASTAPI_QUESTION_BANK_URL,
+            json={"job_description": format_job_description(job_description)},
+            headers={"Content-Type": "application/json"},
+            timeout=FASTAPI_TIMEOUT
+        )
+        
+        if response.status_code != 200:
+            logger.error(f"Question bank service returned status {response.status_code}: {response.text}")
+            return None
+        
+        result = response.json()
+        if not result.get('success') or not result.get('data'):
+            logger.error(f"Question bank generation failed for job description {job_description.id}: {result.get('error')}")
+            return None
         
+    except requests.RequestException as e:
+        logger.error(f"Failed to call question bank service: {str(e)}")
+        return None
+    
+    job_description.question_bank = result['data']
+    job_description.question_bank_hash = job_description.question_bank_source_hash
+    job_description.save(update_fields=['question_bank', 'question_bank_hash'])
+    logger.info(f"Stored question bank with {len(result['data'].get('questions', []))} questions for job description {job_description.id}")
+    return job_description.question_bank
+
+
+def call_fastapi_batch_interview_questions_service(job_description, matching_results):
+    """
+    Generate interview questions for many candidates of one JD with a single FastAPI call
+    
+    When the JD's question bank is available the service selects each
+    candidate's questions from it and only calls the model for short
+    follow-ups on skill gaps the bank doesn't cover.
+    
+    Args:
+        job_description: JobDescription model instance
+        matching_results: MatchingResult model instances for that job description
+        
+    Returns:
+        dict: matching result ID -> {"success": True, "questions": [{"question", "category",
+              "purpose", "priority"}], "metadata": {"total_questions", "estimated_duration",
+              "complexity_level", "focus_areas", "question_distribution"}} (see format_questions_response),
+              or {"success": False, "error", "details"} for candidates that failed
+    """
+    matching_results = list(matching_results)
+    
+    def error_for_all(error, details=''):
+        return {mr.id: {"success": False, "error": error, "details": details} for mr in matching_results}
+    
+    try:
+        ensure_jd_requirements(job_description)
         payload = {
-            "resume_data": resume_info,
-            "job_description": job_desc,
-            "matching_results": matching_data
+            "job_description": format_job_description(job_description),
+            "candidates": [
+                {
+                    "candidate_id": str(mr.id),
+                    "resume_data": mr.resume.get_digest()[0],
+                    "matching_results": build_questions_matching_data(mr)
+                } for mr in matching_results
+            ]
         }
+        question_bank = ensure_question_bank(job_description)
+        if question_bank:
+            payload["question_bank"] = question_bank
         
-        logger.info(f"Calling interview questions service for matching result {matching_result.id}")
-        logger.info(f"Resume data length: {len(resume_info)} chars")
-        logger.info(f"Job description length: {len(job_desc)} chars")
-        
+        logger.info(f"Calling batch interview questions service for {len(matching_results)} candidates of JD {job_description.id}")
         response = requests.post(
-            FASTAPI_INTERVIEW_QUESTIONS_URL,
+            FASTAPI_INTERVIEW_QUESTIONS_BATCH_URL,
             json=payload,
-            timeout=FASTAPI_TIMEOUT
+            timeout=FASTAPI_BATCH_TIMEOUT
         )
         
-        logger.info(f"Interview questions service response status: {response.status_code}")
+        if response.status_code != 200:
+            logger.error(f"Interview questions service error: {response.status_code} - {response.text}")
+            return error_for_all(f"Service returned status {response.status_code}", response.text)
         
-        if response.status_code == 200:
-            logger.info(f"Interview questions generated successfully for matching result {matching_result.id}")
-            response_data = response.json()
-            
-            # Format response to match expected structure
-            return {
-                "success": True,
-                "questions": [
-                    {
-                        "question": q["question"],
-                        "category": q["category"],
-                        "purpose": q["purpose"],
-                        "priority": q.get("priority", "medium")
-                    } for q in response_data["questions"]
-                ],
-                "metadata": {
-                    "total_questions": response_data["total_questions"],
-                    "estimated_duration": response_data["estimated_duration"],
-                    "complexity_level": response_data["complexity_level"],
-                    "focus_areas": response_data["focus_areas"],
-                    "question_distribution": response_data["question_distribution"]
+        results = {}
+        for item in response.json().get('results', []):
+            if item.get('success') and item.get('data'):
+                results[int(item['candidate_id'])] = format_questions_response(item['data'])
+            else:
+                results[int(item['candidate_id'])] = {
+                    "success": False,
+                    "error": item.get('error') or 'Failed to generate questions'
                 }
-            }
-        else:
-            logger.error(f"Interview questions service error: {response.status_code} - {response.text}")
-            return {
-                "success": False,
-                "error": f"Service returned status {response.status_code}",
-                "details": response.text
-            }
-            
+        return results
+        
     except requests.exceptions.Timeout:
-        logger.error(f"Interview questions service timeout for matching result {matching_result.id}")
-        return {
-            "success": False,
-            "error": "Interview questions service timeout",
-            "details": "The service took too long to respond"
-        }
+        logger.error(f"Batch interview questions service timeout for JD {job_description.id}")
+        return error_for_all("Interview questions service timeout", "The service took too long to respond")
     except requests.exceptions.RequestException as e:
         logger.error(f"Interview questions service request error: {str(e)}")
-        return {
-            "success": False,
-            "error": "Failed to connect to interview questions service",
-            "details": str(e)
-        }
+        return error_for_all("Failed to connect to interview questions service", str(e))
     except Exception as e:
         logger.error(f"Unexpected error calling interview questions service: {str(e)}")
-        return {
-            "success": False,
-            "error": "Unexpected error occurred",
-            "details": str(e)
-        }
+        return error_for_all("Unexpected error occurred", str(e))
+
+
+def generate_interview_questions(matching_results, speculative=False):
+    """
+    Generate and store interview questions for shortlisted candidates that don't have them yet
+    
+    Candidates are grouped by job description, each group is sent to the
+    questions service in one batch call, and all new InterviewQuestions rows
+    are created in a single transaction. Questions pre-generated speculatively
+    are promoted instead of generated again.
+    
+    Args:
+        matching_results: MatchingResult model instances
+        speculative: Store new questions as 'speculative' for candidates who aren't shortlisted yet
+        
+    Returns:
+        tuple: (number of candidates that got questions, matching result ID -> error message)
+    """
+    matching_results = list(matching_results)
+    existing = dict(InterviewQuestions.objects.filter(
+        matching_result__in=matching_results
+    ).values_list('matching_result_id', 'status'))
+    
+    promoted = 0
+    if not speculative:
+        promoted = InterviewQuestions.objects.filter(
+            matching_result__in=matching_results, status='speculative'
+        ).update(status='generated', updated_at=timezone.now())
+        if promoted:
+            logger.info(f"Promoted speculative interview questions for {promoted} candidate(s)")
+    
+    by_jd = {}
+    for mr in matching_results:
+        if mr.id not in existing:
+            by_jd.setdefault(mr.job_description_id, []).append(mr)
+    
+    to_create = []
+    errors = {}
+    for group in by_jd.values():
+        responses = call_fastapi_batch_interview_questions_service(group[0].job_description, group)
+        for mr in group:
+            questions_response = responses.get(mr.id) or {"success": False, "error": "No response from questions service"}
+            if not questions_response.get('success'):
+                errors[mr.id] = questions_response.get('error', 'Failed to generate questions')
+                logger.warning(f"Failed to generate questions for {mr.resume.candidate_name}: {errors[mr.id]}")
+                continue
+            questions_data = questions_response.get('questions', [])
+            metadata = questions_response.get('metadata', {})
+            to_create.append(InterviewQuestions(
+                matching_result=mr,
+                questions=questions_data,
+                total_questions=len(questions_data),
+                estimated_duration=metadata.get('estimated_duration', '30-45 minutes'),
+                complexity_level=metadata.get('complexity_level', 'mid'),
+                focus_areas=metadata.get('focus_areas', []),
+                question_distribution=metadata.get('question_distribution', {}),
+                status='speculative' if speculative else 'generated'
+            ))
+    
+    with transaction.atomic():
+        # Rows stored meanwhile by a concurrent shortlist or speculative run are kept
+        InterviewQuestions.objects.bulk_create(to_create, ignore_conflicts=True)
+        if not speculative and to_create:
+            # A speculative row that won the race is promoted like the ones found above
+            InterviewQuestions.objects.filter(
+                matching_result__in=[questions.matching_result for questions in to_create], status='speculative'
+            ).update(status='generated', updated_at=timezone.now())
+    logger.info(f"Generated {'speculative ' if speculative else ''}interview questions for {len(to_create)} candidate(s), {len(errors)} failed")
+    return len(to_create) + promoted, errors
 
 
 def call_fastapi_interview_evaluation_service(interview_recording):
     """
     Call the FastAPI interview evaluation service to analyze interview transcripts
     
+    Nothing is stored here: the evaluation worker saves the results only if
+    it still holds the evaluation's lease.
+    
     Args:
         interview_recording: InterviewRecording model instance
         
     Returns:
-        dict: API response with evaluation results or error info
+        dict: {"success": True, "data": evaluation data, "response": full service response} or error info
     """
     try:
         # Validate that we have the necessary data
@@ -354,45 +581,15 @@ def call_fastapi_interview_evaluation_service(interview_recording):
                 "error": "No matching result found for interview recording"
             }
         
-        # Prepare resume data as structured string
+        # Prepare resume data (the resume's compact digest)
         resume = interview_recording.matching_result.resume
         job_desc = interview_recording.matching_result.job_description
         
-        resume_data = f"""
-Candidate: {resume.candidate_name}
-Email: {resume.email}
-Phone: {resume.phone or 'Not provided'}
-Location: {resume.location or 'Not provided'}
-Career Level: {resume.career_level}
-Years of Experience: {resume.years_of_experience}
-
-Professional Summary:
-{resume.professional_summary or 'Not provided'}
-
-Skills: {', '.join(resume.skills or [])}
-
-Work Experience:
-{json.dumps(resume.work_experience or [], indent=2)}
-
-Education:
-{json.dumps(resume.education or [], indent=2)}
-
-Projects:
-{json.dumps(resume.projects or [], indent=2)}
-
-Certifications:
-{json.dumps(resume.certifications or [], indent=2)}
-
-Extracurricular Activities:
-{json.dumps(resume.extracurricular or [], indent=2)}
-        """.strip()
+        resume_data = resume.get_digest()[0]
         
-        # Prepare job description
-        job_description = f"""
-Title: {job_desc.title}
-Department: {job_desc.department}
-Description: {job_desc.description}
-        """.strip()
+        # Prepare job description (structured requirements when available)
+        ensure_jd_requirements(job_desc)
+        job_description = format_job_description(job_desc)
         
         # Prepare interview transcript
         transcript_messages = []
@@ -466,7 +663,7 @@ Description: {job_desc.description}
         response = requests.post(
             FASTAPI_INTERVIEW_EVALUATION_URL,
             json=payload,
-            timeout=FASTAPI_TIMEOUT
+            timeout=settings.EVALUATION_SERVICE_TIMEOUT  # Long transcripts take several model calls
         )
         
         logger.info(f"Interview evaluation service response status: {response.status_code}")
@@ -475,64 +672,18 @@ Description: {job_desc.description}
             logger.info(f"Interview evaluation completed successfully for recording {interview_recording.id}")
             response_data = response.json()
             
-            # Save the evaluation results to the database
             if response_data.get('success') and response_data.get('data'):
-                try:
-                    from .models import InterviewEvaluation
-                    
-                    evaluation_data = response_data['data']
-                    
-                    # Create or update the evaluation
-                    evaluation, created = InterviewEvaluation.objects.update_or_create(
-                        interview_recording=interview_recording,
-                        defaults={
-                            # Simplified criteria (new fields)
-                            'communication_clarity': evaluation_data.get('communication_clarity', 0),
-                            'relevant_experience': evaluation_data.get('relevant_experience', 0),
-                            'role_interest_fit': evaluation_data.get('role_interest_fit', 0),
-                            'overall_score': evaluation_data.get('overall_score', 0),
-                            'recommendation': evaluation_data.get('recommendation', 'INSUFFICIENT'),
-                            
-                            # Legacy fields (for backward compatibility)
-                            'communication_score': evaluation_data.get('communication_clarity', 0) * 10,  # Convert to 0-100 scale
-                            'technical_knowledge_score': evaluation_data.get('relevant_experience', 0) * 10,
-                            'problem_solving_score': evaluation_data.get('role_interest_fit', 0) * 10,
-                            'cultural_fit_score': evaluation_data.get('overall_score', 0) * 10,
-                            'enthusiasm_score': evaluation_data.get('overall_score', 0) * 10,
-                            
-                            # Text fields
-                            'strengths': evaluation_data.get('strengths', ''),
-                            'areas_of_concern': evaluation_data.get('concerns', ''),
-                            'key_insights': evaluation_data.get('insights', ''),
-                            'next_steps': evaluation_data.get('next_steps', ''),
-                        }
-                    )
-                    
-                    action = "created" if created else "updated"
-                    logger.info(f"Evaluation {action} successfully for recording {interview_recording.id}")
-                    
-                    return {
-                        "success": True,
-                        "evaluation_id": evaluation.id,
-                        "action": action,
-                        "message": f"Evaluation {action} successfully"
-                    }
-                    
-                except Exception as db_error:
-                    logger.error(f"Error saving evaluation to database: {str(db_error)}")
-                    return {
-                        "success": False,
-                        "error": "Failed to save evaluation to database",
-                        "details": str(db_error)
-                    }
-            else:
-                logger.error("Invalid response data from evaluation service")
                 return {
-                    "success": False,
-                    "error": "Invalid response from evaluation service"
+                    "success": True,
+                    "data": response_data['data'],
+                    "response": response_data
                 }
             
-            return response_data
+            logger.error("Invalid response data from evaluation service")
+            return {
+                "success": False,
+                "error": "Invalid response from evaluation service"
+            }
         else:
             logger.error(f"Interview evaluation service error: {response.status_code} - {response.text}")
             return {
@@ -564,79 +715,211 @@ Description: {job_desc.description}
         }
 
 
-def call_fastapi_matching_service(job_description, resume):
+def build_matching_resume_data(resume):
+    """Build the candidate JSON sent to the FastAPI matching service (the resume's digest)"""
+    return resume.get_digest()[1]
+
+
+# Model name and prompt version reported by the matching service, refreshed every few minutes
+MATCHING_SERVICE_INFO_TTL = 300
+_matching_service_info = {'info': None, 'fetched_at': 0.0}
+
+
+def get_matching_service_info():
+    """
+    Get the model name and prompt version the matching service currently uses
+    
+    Returns:
+        dict: {'model': ..., 'prompt_version': ...}, or None if the service can't be reached
     """
-    Call the FastAPI resume matching service
+    now = time.monotonic()
+    if _matching_service_info['info'] and now - _matching_service_info['fetched_at'] < MATCHING_SERVICE_INFO_TTL:
+        return _matching_service_info['info']
+    
+    try:
+        response = requests.get(FASTAPI_MATCHING_HEALTH_URL, timeout=5)
+        response.raise_for_status()
+        health = response.json()
+    except (requests.RequestException, ValueError) as e:
+        logger.warning(f"Could not read matching service version: {str(e)}")
+        return None
+    
+    if not health.get('model') or not health.get('prompt_version'):
+        return None
+    _matching_service_info['info'] = {
+        'model': health['model'],
+        'prompt_version': health['prompt_version'],
+        # Results of one resume against several JDs come from their own prompt
+        'cross_job_prompt_version': health.get('cross_job_prompt_version') or health['prompt_version'],
+    }
+    _matching_service_info['fetched_at'] = now
+    return _matching_service_info['info']
+
+
+def matching_input_hash(job_description, resume, service_info):
+    """
+    Hash everything that determines a matching result
+    
+    Covers the serialized resume payload, the job description text sent to the
+    service, and the service's prompt version and model name.
+    """
+    inputs = {
+        'resume': build_matching_resume_data(resume),
+        'job_description': format_job_description(job_description),
+        'prompt_version': service_info['prompt_version'],
+        'model': service_info['model'],
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def find_unchanged_matching_results(job_description, resumes):
+    """
+    Work out which resumes already have a matching result for identical inputs
     
     Args:
         job_description: JobDescription model instance
-        resume: Resume model instance
+        resumes: Iterable of Resume model instances
         
     Returns:
-        dict: Response from FastAPI service or None if failed
+        tuple: (resume ID -> unchanged MatchingResult, resume ID -> current input hash);
+               both are empty when the matching service version is unknown
     """
+    service_info = get_matching_service_info()
+    if not service_info:
+        return {}, {}
+    
+    hashes = {resume.id: matching_input_hash(job_description, resume, service_info) for resume in resumes}
+    existing = MatchingResult.objects.filter(job_description=job_description, resume_id__in=hashes.keys())
+    unchanged = {
+        result.resume_id: result for result in existing
+        if result.input_hash and result.input_hash == hashes[result.resume_id]
+    }
+    return unchanged, hashes
+
+
+def call_fastapi_batch_matching_service(job_description, resumes, force=False):
+    """
+    Match many resumes against one job description with a single FastAPI call
+    
+    The matching service scores the candidates concurrently, so the request
+    takes roughly as long as the slowest few candidates rather than the sum.
+    Resumes whose stored result came from identical inputs are not sent and
+    get an 'unchanged' entry instead.
+    
+    Args:
+        job_description: JobDescription model instance
+        resumes: Iterable of Resume model instances
+        force: Send every resume even if its inputs are unchanged
+        
+    Returns:
+        dict: resume ID -> per-candidate response ({'success', 'data', 'error', 'input_hash'}
+              or {'success', 'unchanged'})
+    """
+    unchanged, hashes = find_unchanged_matching_results(job_description, resumes)
+    if force:
+        unchanged = {}
+    skipped = {
+        resume_id: {'success': True, 'unchanged': True, 'data': None, 'input_hash': hashes[resume_id]}
+        for resume_id in unchanged
+    }
+    resumes = [resume for resume in resumes if resume.id not in unchanged]
+    if skipped:
+        logger.info(f"Skipping {len(skipped)} resume(s) with unchanged matching inputs")
+    if not resumes:
+        return skipped
+    
+    payload = {
+        "job_description": format_job_description(job_description),
+        "candidates": [
+            {"candidate_id": str(resume.id), "candidate_resume_json": json.dumps(build_matching_resume_data(resume))}
+            for resume in resumes
+        ]
+    }
+    
+    def error_for_all(error):
+        return {**skipped, **{resume.id: {'success': False, 'error': error} for resume in resumes}}
+    
     try:
-        # Prepare resume data as JSON string
-        resume_data = {
-            "candidate_name": resume.candidate_name or "Unknown",
-            "email": resume.email or "",
-            "phone": resume.phone or "",
-            "years_of_experience": resume.years_of_experience or 0,
-            "career_level": resume.career_level or "",
-            "experience": resume.work_experience or [],
-            "education": resume.education or [],
-            "skills": resume.skills or [],
-            "certifications": resume.certifications or [],
-            "projects": resume.projects or [],
-            "extracurricular_activities": resume.extracurricular or [],
-            "summary": resume.professional_summary or "",
-            "languages": getattr(resume, 'languages', []) or []
-        }
+        logger.info(f"Calling FastAPI batch matching service for {len(resumes)} resumes")
+        response = requests.post(
+            FASTAPI_BATCH_MATCHING_URL,
+            json=payload,
+            headers={"Content-Type": "application/json"},
+            timeout=FASTAPI_BATCH_TIMEOUT
+        )
         
-        # Prepare request payload
-        payload = {
-            "job_description": job_description.description,
-            "candidate_resume_json": json.dumps(resume_data)
-        }
+        if response.status_code != 200:
+            logger.error(f"FastAPI service returned status {response.status_code}: {response.text}")
+            return error_for_all(f"Service error: {response.status_code}")
+        
+        results = {int(item['candidate_id']): item for item in response.json().get('results', [])}
+        logger.info(f"Batch matching finished: {len(results)} results for {len(resumes)} resumes")
+        for resume_id, item in results.items():
+            item['input_hash'] = hashes.get(resume_id, '')
+        results.update(skipped)
+        return results
+        
+    except requests.exceptions.ConnectionError:
+        logger.error("Cannot connect to FastAPI matching service")
+        return error_for_all("Matching service is not available. Please ensure the AI service is running.")
+    except requests.exceptions.Timeout:
+        logger.error("FastAPI batch matching service timeout")
+        return error_for_all("Matching service timeout. Please try again.")
+    except Exception as e:
+        logger.error(f"Error calling FastAPI service: {str(e)}")
+        return error_for_all(f"Unexpected error: {str(e)}")
+
+
+def call_fastapi_cross_jd_matching_service(resume, job_descriptions):
+    """
+    Match one resume against many job descriptions with a single FastAPI call
+    
+    The resume digest is serialized once and the service packs the job
+    descriptions into as few prompts as its token budget allows.
+    
+    Args:
+        resume: Resume model instance
+        job_descriptions: Iterable of JobDescription model instances
         
-        # Make the API call
-        logger.info(f"Calling FastAPI matching service for resume {resume.id}")
+    Returns:
+        dict: job description ID -> per-job response ({'success', 'data', 'error'})
+    """
+    job_descriptions = list(job_descriptions)
+    payload = {
+        "candidate_resume_json": json.dumps(build_matching_resume_data(resume)),
+        "jobs": [
+            {"job_id": str(jd.id), "job_description": format_job_description(jd)}
+            for jd in job_descriptions
+        ]
+    }
+    
+    def error_for_all(error):
+        return {jd.id: {'success': False, 'error': error} for jd in job_descriptions}
+    
+    try:
+        logger.info(f"Calling FastAPI cross-JD matching service for resume {resume.id} and {len(job_descriptions)} JDs")
         response = requests.post(
-            FASTAPI_MATCHING_URL,
+            FASTAPI_CROSS_JD_MATCHING_URL,
             json=payload,
             headers={"Content-Type": "application/json"},
-            timeout=FASTAPI_TIMEOUT
+            timeout=FASTAPI_BATCH_TIMEOUT
         )
         
-        if response.status_code == 200:
-            result = response.json()
-            logger.info(f"Successfully processed resume {resume.id}")
-            return result
-        else:
+        if response.status_code != 200:
             logger.error(f"FastAPI service returned status {response.status_code}: {response.text}")
-            return {
-                'success': False,
-                'error': f"Service error: {response.status_code}"
-            }
-            
+            return error_for_all(f"Service error: {response.status_code}")
+        
+        return {int(item['job_id']): item for item in response.json().get('results', [])}
+        
     except requests.exceptions.ConnectionError:
         logger.error("Cannot connect to FastAPI matching service")
-        return {
-            'success': False,
-            'error': "Matching service is not available. Please ensure the AI service is running."
-        }
+        return error_for_all("Matching service is not available. Please ensure the AI service is running.")
     except requests.exceptions.Timeout:
-        logger.error("FastAPI matching service timeout")
-        return {
-            'success': False,
-            'error': "Matching service timeout. Please try again."
-        }
+        logger.error("FastAPI cross-JD matching service timeout")
+        return error_for_all("Matching service timeout. Please try again.")
     except Exception as e:
         logger.error(f"Error calling FastAPI service: {str(e)}")
-        return {
-            'success': False,
-            'error': f"Unexpected error: {str(e)}"
-        }
+        return error_for_all(f"Unexpected error: {str(e)}")
 
 
 def get_notifications(user):
@@ -1023,7 +1306,54 @@ def job_descriptions(request):
         'notifications_count': len(notifications),
     })
 
+def save_parsed_resume(user, jd, data):
+    """
+    Create or update the Resume for a candidate from the resume parser's structured data
+    
+    Candidates are identified by email within a job description, so the same
+    candidate can apply to several JDs.
+    
+    Returns:
+        tuple: (resume, created)
+    """
+    basic_info = data.get('basic_info') or {}
+    professional_summary = data.get('professional_summary') or {}
+    additional_info = data.get('additional_info') or {}
+    
+    return Resume.objects.update_or_create(
+        user=user,
+        email=basic_info.get('email', 'no-email@example.com'),
+        jobdescription=jd,  # Include JD in lookup to allow same candidate for multiple JDs
+        defaults={
+            # Basic Info
+            'candidate_name': basic_info.get('full_name', 'Unknown'),
+            'phone': basic_info.get('phone', ''),
+            'location': basic_info.get('location', ''),
+            'linkedin_url': basic_info.get('linkedin_url', ''),
+            'github_url': basic_info.get('github_url', ''),
+            'portfolio_url': basic_info.get('portfolio_url', ''),
+            # Professional Summary
+            'professional_summary': professional_summary.get('summary', ''),
+            'career_level': professional_summary.get('career_level', 'Entry-level'),
+            'years_of_experience': professional_summary.get('years_of_experience', 0),
+            # Structured Data (JSON)
+            'skills': data.get('skills', []),
+            'skill_ids': data.get('skill_ids', []),
+            'work_experience': data.get('work_experience', []),
+            'education': data.get('education', []),
+            'projects': data.get('projects', []),
+            'certifications': data.get('certifications', []),
+            'extracurricular': data.get('extracurricular', []),
+            # Additional Info
+            'availability': additional_info.get('availability', ''),
+            'willing_to_relocate': additional_info.get('willing_to_relocate', ''),
+            'salary_expectations': additional_info.get('salary_expectations', ''),
+            'preferred_work_mode': additional_info.get('preferred_work_mode', ''),
+        }
+    )
+
 @login_required
+@limit_resume_uploads
 def resumes(request):
     """
     Enhanced view to handle resume uploads with FastAPI parsing integration
@@ -1039,6 +1369,13 @@ def resumes(request):
             jd = JobDescription.objects.filter(id=jd_id, user=request.user).first()
             files = request.FILES.getlist('resume_files')
             
+            if request.resume_upload_errors:
+                error_msg = ' '.join(request.resume_upload_errors)
+                if is_ajax:
+                    return JsonResponse({'success': False, 'error': error_msg})
+                messages.error(request, error_msg)
+                return redirect('resumes')
+            
             if not jd:
                 error_msg = 'Please select a valid job description.'
                 if is_ajax:
@@ -1068,64 +1405,58 @@ def resumes(request):
                 messages.error(request, error_msg)
                 return redirect('resumes')
             
-            # Send files to FastAPI for parsing (one by one)
-            fastapi_url = 'http://127.0.0.1:8001/parse-resumes'
+            # Send all files to FastAPI in one request; the parser works through them concurrently
             parsed_data = []
             
-            for f in files:
-                try:
-                    # Reset file pointer for each file
-                    f.seek(0)
-                    files_payload = {'file': (f.name, f.read(), f.content_type)}
-                    
-                    response = requests.post(fastapi_url, files=files_payload)
-                    response.raise_for_status()
-                    api_response = response.json()
-                    
-                    # Convert FastAPI response to expected format
-                    if api_response.get('success'):
-                        data = api_response.get('data', {})
-                        basic_info = data.get('basic_info', {})
-                        professional_summary = data.get('professional_summary', {})
-                        additional_info = data.get('additional_info', {})
-                        
-                        result = {
-                            'status': 'success',
-                            'filename': api_response.get('filename'),
-                            'full_data': data,  # Store the complete data
-                            'basic_info': basic_info,
-                            'professional_summary': professional_summary,
-                            'additional_info': additional_info,
-                            # Flattened for backward compatibility
-                            'full_name': basic_info.get('full_name', 'Unknown'),
-                            'email': basic_info.get('email', 'no-email@example.com'),
-                            'phone': basic_info.get('phone', ''),
-                            'skills': data.get('skills', []),
-                            'education': data.get('education', []),
-                            'work_experience': data.get('work_experience', []),
-                            'certifications': data.get('certifications', []),
-                            'extracurricular': data.get('extracurricular', []),
-                        }
-                    else:
-                        result = {
-                            'status': 'error',
-                            'filename': api_response.get('filename'),
-                            'message': api_response.get('error')
-                        }
-                    parsed_data.append(result)
+            try:
+                # File bodies are streamed to the parser in chunks instead of being read into memory
+                body, content_type = stream_multipart_files(files, chunk_size=settings.RESUME_UPLOAD_CHUNK_SIZE)
+                response = requests.post(FASTAPI_PARSER_BATCH_URL, data=body, headers={'Content-Type': content_type})
+                response.raise_for_status()
+                api_results = response.json().get('results', [])
+            except requests.exceptions.ConnectionError:
+                api_results = [
+                    {'success': False, 'filename': f.name, 'error': 'Cannot connect to resume parser service'}
+                    for f in files
+                ]
+            except Exception as e:
+                api_results = [
+                    {'success': False, 'filename': f.name, 'error': str(e)}
+                    for f in files
+                ]
+            
+            for api_response in api_results:
+                # Convert FastAPI response to expected format
+                if api_response.get('success'):
+                    data = api_response.get('data', {})
+                    basic_info = data.get('basic_info', {})
+                    professional_summary = data.get('professional_summary', {})
+                    additional_info = data.get('additional_info', {})
                     
-                except requests.exceptions.ConnectionError:
-                    parsed_data.append({
-                        'status': 'error',
-                        'filename': f.name,
-                        'message': 'Cannot connect to resume parser service'
-                    })
-                except Exception as e:
-                    parsed_data.append({
+                    result = {
+                        'status': 'success',
+                        'filename': api_response.get('filename'),
+                        'full_data': data,  # Store the complete data
+                        'basic_info': basic_info,
+                        'professional_summary': professional_summary,
+                        'additional_info': additional_info,
+                        # Flattened for backward compatibility
+                        'full_name': basic_info.get('full_name', 'Unknown'),
+                        'email': basic_info.get('email', 'no-email@example.com'),
+                        'phone': basic_info.get('phone', ''),
+                        'skills': data.get('skills', []),
+                        'education': data.get('education', []),
+                        'work_experience': data.get('work_experience', []),
+                        'certifications': data.get('certifications', []),
+                        'extracurricular': data.get('extracurricular', []),
+                    }
+                else:
+                    result = {
                         'status': 'error',
-                        'filename': f.name,
-                        'message': str(e)
-                    })
+                        'filename': api_response.get('filename'),
+                        'message': api_response.get('error')
+                    }
+                parsed_data.append(result)
             
             try:
                 
@@ -1136,41 +1467,7 @@ def resumes(request):
                         try:
                             # Use data from the current result
                             basic_info = result.get('basic_info', {})
-                            professional_summary = result.get('professional_summary', {})
-                            additional_info = result.get('additional_info', {})
-                            data = result.get('full_data', {})
-                            
-                            # Update or create Resume object with full structured data
-                            resume, created = Resume.objects.update_or_create(
-                                user=request.user,
-                                email=basic_info.get('email', 'no-email@example.com'),
-                                jobdescription=jd,  # Include JD in lookup to allow same candidate for multiple JDs
-                                defaults={
-                                    # Basic Info
-                                    'candidate_name': basic_info.get('full_name', 'Unknown'),
-                                    'phone': basic_info.get('phone', ''),
-                                    'location': basic_info.get('location', ''),
-                                    'linkedin_url': basic_info.get('linkedin_url', ''),
-                                    'github_url': basic_info.get('github_url', ''),
-                                    'portfolio_url': basic_info.get('portfolio_url', ''),
-                                    # Professional Summary
-                                    'professional_summary': professional_summary.get('summary', ''),
-                                    'career_level': professional_summary.get('career_level', 'Entry-level'),
-                                    'years_of_experience': professional_summary.get('years_of_experience', 0),
-                                    # Structured Data (JSON)
-                                    'skills': data.get('skills', []),
-                                    'work_experience': data.get('work_experience', []),
-                                    'education': data.get('education', []),
-                                    'projects': data.get('projects', []),
-                                    'certifications': data.get('certifications', []),
-                                    'extracurricular': data.get('extracurricular', []),
-                                    # Additional Info
-                                    'availability': additional_info.get('availability', ''),
-                                    'willing_to_relocate': additional_info.get('willing_to_relocate', ''),
-                                    'salary_expectations': additional_info.get('salary_expectations', ''),
-                                    'preferred_work_mode': additional_info.get('preferred_work_mode', ''),
-                                }
-                            )
+                            resume, created = save_parsed_resume(request.user, jd, result.get('full_data', {}))
                             successful_saves += 1
                             
                             # Optional: Add different messages for create vs update
@@ -1287,6 +1584,102 @@ def resumes(request):
         'recent_uploads_count': recent_uploads_count,
     })
 
+@login_required
+@require_POST
+@limit_resume_uploads
+def resumes_stream(request):
+    """
+    Bulk upload resumes and stream progress back as NDJSON
+    
+    Files are sent to the parser's streaming endpoint; each Resume is saved as
+    soon as its parse result arrives and a progress line is forwarded to the
+    browser, followed by a final summary line.
+    """
+    jd = JobDescription.objects.filter(id=request.POST.get('jd_id'), user=request.user).first()
+    files = request.FILES.getlist('resume_files')
+    
+    if request.resume_upload_errors:
+        return JsonResponse({'success': False, 'error': ' '.join(request.resume_upload_errors)}, status=413)
+    if not jd:
+        return JsonResponse({'success': False, 'error': 'Please select a valid job description.'}, status=400)
+    if not files:
+        return JsonResponse({'success': False, 'error': 'Please select at least one resume file.'}, status=400)
+    
+    supported_extensions = ['.pdf', '.doc', '.docx']
+    invalid_files = [
+        f.name for f in files
+        if ('.' + f.name.split('.')[-1].lower() if '.' in f.name else '') not in supported_extensions
+    ]
+    if invalid_files:
+        return JsonResponse({
+            'success': False,
+            'error': f"Unsupported file format: {', '.join(invalid_files)}. Only PDF, DOC, and DOCX files are allowed."
+        }, status=400)
+    
+    # File bodies are streamed to the parser in chunks instead of being read into memory
+    body, content_type = stream_multipart_files(files, chunk_size=settings.RESUME_UPLOAD_CHUNK_SIZE)
+    total = len(files)
+    user = request.user
+    
+    def progress_lines():
+        saved = 0
+        failed_files = []
+        completed = 0
+        
+        try:
+            with requests.post(FASTAPI_PARSER_STREAM_URL, data=body, headers={'Content-Type': content_type}, stream=True) as response:
+                response.raise_for_status()
+                for raw_line in response.iter_lines():
+                    if not raw_line:
+                        continue
+                    api_response = json.loads(raw_line)
+                    completed += 1
+                    filename = api_response.get('filename') or 'unknown file'
+                    line = {'type': 'progress', 'filename': filename, 'completed': completed, 'total': total}
+                    
+                    if api_response.get('success'):
+                        try:
+                            resume, created = save_parsed_resume(user, jd, api_response.get('data') or {})
+                            saved += 1
+                            line.update({'success': True, 'resume_id': resume.id, 'candidate_name': resume.candidate_name})
+                        except Exception as e:
+                            logger.error(f"Parsed {filename} but failed to save: {str(e)}")
+                            failed_files.append(filename)
+                            line.update({'success': False, 'error': f'Parsed but failed to save: {str(e)}'})
+                    else:
+                        failed_files.append(filename)
+                        line.update({'success': False, 'error': api_response.get('error', 'Unknown error')})
+                    
+                    yield json.dumps(line) + '\n'
+        except requests.exceptions.ConnectionError:
+            yield json.dumps({'type': 'error', 'error': 'Cannot connect to resume parser service'}) + '\n'
+        except Exception as e:
+            logger.error(f"Streaming resume upload failed: {str(e)}")
+            yield json.dumps({'type': 'error', 'error': str(e)}) + '\n'
+        
+        # Files the parser never reported on (e.g. the stream broke) count as failed
+        failed_count = len(failed_files) + (total - completed)
+        if saved and not failed_count:
+            alert_type, message = 'success', f'Successfully processed and saved {saved} resume(s) for {jd.title}!'
+        elif saved:
+            alert_type, message = 'warning', f'Successfully processed {saved} resume(s) for {jd.title}. Failed to parse {failed_count} file(s): {", ".join(failed_files)}'
+        else:
+            alert_type, message = 'error', 'Failed to parse files. Please ensure files are valid and not corrupted.'
+        
+        yield json.dumps({
+            'type': 'done',
+            'success': saved > 0,
+            'saved': saved,
+            'failed': failed_count,
+            'alert_type': alert_type,
+            'message': message,
+        }) + '\n'
+    
+    response = StreamingHttpResponse(progress_lines(), content_type='application/x-ndjson')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Stop nginx from buffering the progress lines
+    return response
+
 @login_required
 def matching(request):
     """
@@ -1311,7 +1704,12 @@ def matching(request):
                     job_description=jd
                 ).values_list('resume_id', flat=True)
                 
-                unmatched_resumes = all_resumes.exclude(id__in=matched_resume_ids)
+                # Already matched resumes are listed too when re-matching is requested
+                if request.POST.get('include_matched') == '1':
+                    unmatched_resumes = all_resumes
+                else:
+                    unmatched_resumes = all_resumes.exclude(id__in=matched_resume_ids)
+                matched_ids = set(matched_resume_ids)
                 
                 resume_data = []
                 for resume in unmatched_resumes:
@@ -1321,7 +1719,8 @@ def matching(request):
                         'email': resume.email,
                         'years_of_experience': resume.years_of_experience,
                         'career_level': resume.career_level,
-                        'uploaded_at': resume.uploaded_at.strftime('%Y-%m-%d')
+                        'uploaded_at': resume.uploaded_at.strftime('%Y-%m-%d'),
+                        'matched': resume.id in matched_ids
                     })
                 
                 return JsonResponse({
@@ -1335,98 +1734,89 @@ def matching(request):
                     'success': False,
                     'error': 'Invalid job description selected'
                 })
-        
+
+        elif 'rank_talent_pool' in request.POST:
+            # Rank every stored resume of this user (across all JDs) against the selected JD
+            jd_id = request.POST.get('jd_id')
+            try:
+                top_k = min(max(int(request.POST.get('top_k', 20)), 1), TALENT_POOL_MAX_RESULTS)
+            except ValueError:
+                top_k = 20
+
+            try:
+                jd = JobDescription.objects.get(id=jd_id, user=request.user)
+            except JobDescription.DoesNotExist:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Invalid job description selected'
+                })
+
+            start_time = time.perf_counter()
+            # Over-fetch so candidates who applied to several JDs still fill top_k after de-duplication
+            ranked = rank_talent_pool(jd, top_k * 3)
+            resumes_by_id = Resume.objects.in_bulk([resume_id for resume_id, _ in ranked])
+
+            results = []
+            seen_emails = set()
+            for resume_id, score in ranked:
+                resume = resumes_by_id.get(resume_id)
+                if resume is None:
+                    continue
+                if resume.email and resume.email != 'no-email@example.com':
+                    if resume.email in seen_emails:
+                        continue
+                    seen_emails.add(resume.email)
+                results.append({
+                    'resume_id': resume.id,
+                    'candidate_name': resume.candidate_name,
+                    'email': resume.email,
+                    'career_level': resume.career_level,
+                    'years_of_experience': resume.years_of_experience,
+                    'jobdescription_id': resume.jobdescription_id,
+                    'score': round(score, 3),
+                })
+                if len(results) >= top_k:
+                    break
+
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            logger.info(f"Ranked talent pool for JD {jd.id}: {len(results)} results in {elapsed_ms:.1f} ms")
+            return JsonResponse({
+                'success': True,
+                'results': results,
+                'total_count': len(results),
+                'elapsed_ms': round(elapsed_ms, 1)
+            })
+
         elif 'run_matching' in request.POST:
-            # Run AI matching for selected resumes
+            # Queue AI matching for the selected resumes; a run_matching_worker process does the work
             jd_id = request.POST.get('jd_id')
             resume_ids = request.POST.getlist('resume_ids')
+            force = request.POST.get('force') == '1'  # Re-match even if the inputs are unchanged
+            # Talent pool matches (e.g. the rank_talent_pool top-K) may use resumes uploaded for any JD
+            talent_pool = request.POST.get('talent_pool') == '1'
             
             try:
                 jd = JobDescription.objects.get(id=jd_id, user=request.user)
-                resumes = Resume.objects.filter(
-                    id__in=resume_ids, 
-                    user=request.user, 
-                    jobdescription=jd
-                )
+                valid_resumes = Resume.objects.filter(id__in=resume_ids, user=request.user)
+                if not talent_pool:
+                    valid_resumes = valid_resumes.filter(jobdescription=jd)
+                valid_ids = list(valid_resumes.values_list('id', flat=True))
                 
-                if not resumes.exists():
+                if not valid_ids:
                     return JsonResponse({
                         'success': False,
                         'error': 'No valid resumes selected for matching'
                     })
                 
-                # Process each resume through the FastAPI matching service
-                results = []
-                errors = []
-                
-                for resume in resumes:
-                    try:
-                        # Call the FastAPI matching service
-                        result = call_fastapi_matching_service(jd, resume)
-                        
-                        if result and result.get('success'):
-                            # Save the matching result to database
-                            matching_data = result.get('data')
-                            if matching_data:
-                                # Create or update matching result
-                                matching_result, created = MatchingResult.objects.update_or_create(
-                                    user=request.user,
-                                    resume=resume,
-                                    job_description=jd,
-                                    defaults={
-                                        'overall_score': matching_data.get('overall_score', 0),
-                                        'skills_score': matching_data.get('skills_score', 0),
-                                        'experience_score': matching_data.get('experience_score', 0),
-                                        'education_score': matching_data.get('education_score', 0),
-                                        'match_reasoning': json.dumps({
-                                            'interview_recommendation': matching_data.get('recommendation', ''),
-                                            'confidence_level': matching_data.get('confidence', ''),
-                                            'interview_priority': matching_data.get('interview_priority', ''),
-                                            'top_strengths': matching_data.get('strengths', []),
-                                            'concerns': matching_data.get('concerns', []),
-                                            'conversation_topics': matching_data.get('conversation_topics', []),
-                                            'key_questions': matching_data.get('key_questions', [])
-                                        }),
-                                        'matched_skills': json.dumps(matching_data.get('matched_skills', [])),
-                                        'missing_skills': json.dumps(matching_data.get('missing_skills', [])),
-                                        'experience_gap': (matching_data.get('experience_summary', '') or '')[:255],
-                                        'created_at': timezone.now()
-                                    }
-                                )
-                                results.append({
-                                    'resume_id': resume.id,
-                                    'candidate_name': resume.candidate_name,
-                                    'score': matching_data.get('overall_score', 0),
-                                    'recommendation': matching_data.get('recommendation', ''),
-                                    'created': created
-                                })
-                        else:
-                            error_msg = result.get('error', 'Unknown error') if result else 'No response from matching service'
-                            errors.append(f"{resume.candidate_name}: {error_msg}")
-                            
-                    except Exception as e:
-                        errors.append(f"{resume.candidate_name}: {str(e)}")
-                
-                # Return results
-                if results:
-                    success_msg = f'Successfully processed {len(results)} resume(s)'
-                    if errors:
-                        success_msg += f' ({len(errors)} failed)'
-                    
-                    return JsonResponse({
-                        'success': True,
-                        'message': success_msg,
-                        'results': results,
-                        'errors': errors,
-                        'total_processed': len(results),
-                        'total_errors': len(errors)
-                    })
-                else:
-                    return JsonResponse({
-                        'success': False,
-                        'error': 'Failed to process any resumes',
-                        'errors': errors
-                    })
+                job = enqueue_matching_job(request.user, jd, valid_ids, force=force)
+                logger.info(f"Queued matching job {job.id} for {len(valid_ids)} resumes (JD {jd.id})")
+                return JsonResponse({
+                    'success': True,
+                    'job_id': job.id,
+                    'status_url': reverse('matching_job_status', args=[job.id]),
+                    'total': job.total,
+                    'message': f'Matching queued for {job.total} resume(s)'
+                })
                 
             except JobDescription.DoesNotExist:
                 return JsonResponse({
@@ -1448,11 +1838,9 @@ def matching(request):
                     status='pending'  # Only shortlist pending candidates
                 )
                 
+                matching_results = list(matching_results.select_related('resume', 'job_description'))
                 shortlisted_candidates = []
-                questions_generated = 0
-                questions_failed = 0
                 
-                # Process each candidate individually for interview questions
                 for matching_result in matching_results:
                     # Update status to shortlisted
                     matching_result.status = 'shortlisted'
@@ -1463,40 +1851,14 @@ def matching(request):
                     Shortlisted.objects.get_or_create(resume=matching_result.resume)
                     
                     shortlisted_candidates.append(matching_result.resume.candidate_name)
-                    
-                    # Generate interview questions for each candidate
-                    try:
-                        if not hasattr(matching_result, 'interview_questions'):
-                            logger.info(f"Generating questions for {matching_result.resume.candidate_name}")
-                            
-                            questions_response = call_fastapi_interview_questions_service(matching_result)
-                            
-                            if questions_response.get('success'):
-                                questions_data = questions_response.get('questions', [])
-                                metadata = questions_response.get('metadata', {})
-                                
-                                InterviewQuestions.objects.create(
-                                    matching_result=matching_result,
-                                    questions=questions_data,
-                                    total_questions=len(questions_data),
-                                    estimated_duration=metadata.get('estimated_duration', '30-45 minutes'),
-                                    complexity_level=metadata.get('complexity_level', 'mid'),
-                                    focus_areas=metadata.get('focus_areas', []),
-                                    question_distribution=metadata.get('question_distribution', {}),
-                                    status='generated'
-                                )
-                                
-                                questions_generated += 1
-                                logger.info(f"Generated questions for {matching_result.resume.candidate_name}")
-                            else:
-                                questions_failed += 1
-                                logger.warning(f"Failed to generate questions for {matching_result.resume.candidate_name}")
-                        else:
-                            logger.info(f"Questions already exist for {matching_result.resume.candidate_name}")
-                            
-                    except Exception as e:
-                        questions_failed += 1
-                        logger.error(f"Error generating questions for {matching_result.resume.candidate_name}: {str(e)}")
+                
+                # Generate interview questions for all candidates with one batch call per JD
+                try:
+                    questions_generated, question_errors = generate_interview_questions(matching_results)
+                    questions_failed = len(question_errors)
+                except Exception as e:
+                    questions_generated, questions_failed = 0, len(matching_results)
+                    logger.error(f"Error generating interview questions: {str(e)}")
                 
                 # Prepare response message
                 message = f'Successfully shortlisted {len(shortlisted_candidates)} candidate(s)'
@@ -1534,12 +1896,14 @@ def matching(request):
                     user=request.user,
                     status='pending'  # Only reject pending candidates
                 )
+                rejected_ids = list(matching_results.values_list('id', flat=True))
                 
                 # Update status to rejected
                 updated_count = matching_results.update(
                     status='rejected',
                     updated_at=timezone.now()
                 )
+                expire_speculative_questions(rejected_ids)
                 
                 return JsonResponse({
                     'success': True,
@@ -1682,39 +2046,17 @@ def shortlist_candidate(request):
             try:
                 logger.info(f"Processing shortlist for matching result {result_id}")
                 
-                # Check if interview questions already exist
-                if not hasattr(matching_result, 'interview_questions'):
+                # Check if interview questions already exist (speculative ones are promoted below)
+                if not matching_result.has_interview_questions:
                     logger.info(f"No existing questions found, generating new ones for {matching_result.resume.candidate_name}")
                     
-                    # Call the interview questions generation service
-                    questions_response = call_fastapi_interview_questions_service(matching_result)
-                    
-                    logger.info(f"Questions service response: {questions_response.get('success', False)}")
-                    
-                    if questions_response.get('success'):
-                        # Save the generated questions to database
-                        questions_data = questions_response.get('questions', [])
-                        metadata = questions_response.get('metadata', {})
-                        
-                        logger.info(f"Saving {len(questions_data)} questions to database")
-                        
-                        interview_questions = InterviewQuestions.objects.create(
-                            matching_result=matching_result,
-                            questions=questions_data,
-                            total_questions=len(questions_data),
-                            estimated_duration=metadata.get('estimated_duration', '30-45 minutes'),
-                            complexity_level=metadata.get('complexity_level', 'mid'),
-                            focus_areas=metadata.get('focus_areas', []),
-                            question_distribution=metadata.get('question_distribution', {}),
-                            status='generated'
-                        )
-                        
-                        logger.info(f"Generated {len(questions_data)} interview questions for {matching_result.resume.candidate_name}")
-                        questions_result = f"Generated {len(questions_data)} interview questions"
+                    generated, question_errors = generate_interview_questions([matching_result])
+                    if generated:
+                        total_questions = InterviewQuestions.objects.get(matching_result=matching_result).total_questions
+                        questions_result = f"Generated {total_questions} interview questions"
                     else:
-                        questions_error = questions_response.get('error', 'Failed to generate questions')
+                        questions_error = question_errors.get(matching_result.id, 'Failed to generate questions')
                         logger.warning(f"Failed to generate interview questions: {questions_error}")
-                        logger.warning(f"Full response: {questions_response}")
                 else:
                     questions_result = "Interview questions already exist"
                     logger.info(f"Interview questions already exist for {matching_result.resume.candidate_name}")
@@ -1768,6 +2110,7 @@ def reject_candidate(request):
             # Update status to rejected
             matching_result.status = 'rejected'
             matching_result.save()
+            expire_speculative_questions([matching_result])
             
             return JsonResponse({
                 'success': True,
@@ -1788,6 +2131,39 @@ def reject_candidate(request):
     return JsonResponse({'success': False, 'error': 'Invalid request'})
 
 
+@login_required
+@require_POST
+def match_resume_all_jobs(request, resume_id):
+    """Queue the match of one resume against all of the user's job descriptions (roles ranked in the job results)"""
+    try:
+        resume = Resume.objects.get(id=resume_id, user=request.user)
+    except Resume.DoesNotExist:
+        return JsonResponse({'success': False, 'error': 'Resume not found'}, status=404)
+    
+    force = request.POST.get('force') == '1'  # Re-match even if the inputs are unchanged
+    # The cross-job call takes minutes; a run_matching_worker process does it and the page polls the job
+    job = enqueue_all_jobs_matching(request.user, resume, force=force)
+    logger.info(f"Queued matching job {job.id} for resume {resume.id} against all job descriptions")
+    return JsonResponse({
+        'success': True,
+        'job_id': job.id,
+        'status_url': reverse('matching_job_status', args=[job.id]),
+        'candidate_name': resume.candidate_name,
+        'total': job.total,
+        'message': f'Matching queued against {job.total} job description(s)'
+    })
+
+
+@login_required
+def matching_job_status(request, job_id):
+    """Progress of a queued matching job (polled by the matching page)"""
+    try:
+        job = MatchingJob.objects.get(id=job_id, user=request.user)
+    except MatchingJob.DoesNotExist:
+        return JsonResponse({'success': False, 'error': 'Matching job not found'}, status=404)
+    return JsonResponse({'success': True, **job_progress(job)})
+
+
 @login_required
 def delete_matching_result(request):
     """Delete a matching result"""
@@ -3065,34 +3441,19 @@ def retry_evaluation(request, recording_id):
                 'message': 'Can only retry evaluation for completed interviews'
             })
         
-        # Check if there's already an evaluation
-        from .models import InterviewEvaluation
-        existing_evaluation = InterviewEvaluation.objects.filter(
-            interview_recording=recording
-        ).first()
-        
-        # Call the evaluation service
-        result = call_fastapi_interview_evaluation_service(recording)
-        
-        if result.get('success'):
-            if existing_evaluation:
-                messages.success(request, f'Evaluation updated successfully for {recording.matching_result.resume.candidate_name}')
-            else:
-                messages.success(request, f'Evaluation created successfully for {recording.matching_result.resume.candidate_name}')
-            
-            return JsonResponse({
-                'success': True,
-                'message': 'Evaluation retry successful',
-                'redirect_url': f'/dashboard/interviews/'
-            })
-        else:
-            error_msg = result.get('error', 'Unknown evaluation error')
-            logger.error(f"Evaluation retry failed for recording {recording_id}: {error_msg}")
-            
+        # Re-queue the evaluation; a worker runs it under a lease like any other
+        if not requeue_evaluation(recording):
             return JsonResponse({
                 'success': False,
-                'message': f'Evaluation failed: {error_msg}'
+                'message': 'The evaluation is already running'
             })
+        
+        messages.success(request, f'Evaluation queued for {recording.matching_result.resume.candidate_name}')
+        return JsonResponse({
+            'success': True,
+            'message': 'Evaluation queued; the results appear once it completes',
+            'redirect_url': f'/dashboard/interviews/'
+        })
     
     except Exception as e:
         logger.error(f"Error in evaluation retry for recording {recording_id}: {str(e)}")
@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'shortlistpro.settings')
 
 application = get_asgi_application()
+
+# Web servers opt into running queued interview evaluations in-process
+if settings.EVALUATION_IN_PROCESS_WORKERS:
+    from home.evaluation_worker import enable_in_process_pool
+    enable_in_process_pool()
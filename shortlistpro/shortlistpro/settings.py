@@ -163,8 +163,54 @@ AUTHENTICATION_BACKENDS = [
 ELEVENLABS_API_KEY = os.getenv('ELEVENLABS_API_KEY')
 ELEVENLABS_AGENT_ID = os.getenv('ELEVENLABS_AGENT_ID')
 
+# Resume upload limits - bulk uploads are streamed to the parser service in chunks
+RESUME_MAX_FILE_MB = int(os.getenv('RESUME_MAX_FILE_MB', '10'))
+RESUME_MAX_BATCH_MB = int(os.getenv('RESUME_MAX_BATCH_MB', '500'))
+RESUME_UPLOAD_CHUNK_SIZE = 64 * 1024
+# Spool uploads over 256 KB to temporary files so large batches don't sit in memory
+FILE_UPLOAD_MAX_MEMORY_SIZE = 256 * 1024
+DATA_UPLOAD_MAX_NUMBER_FILES = int(os.getenv('RESUME_MAX_BATCH_FILES', '500'))
+
 
 
 STATICFILES_DIRS = [
     BASE_DIR / "static",
-]
\ No newline at end of file
+]
+
+# Local pre-screen before AI matching - resumes scoring below this (0-100) are marked Skip
+# without a model call; 0 sends every resume to the matching service
+MATCHING_PRESCREEN_FLOOR = float(os.getenv('MATCHING_PRESCREEN_FLOOR', '30'))
+
+# Background matching jobs (python manage.py run_matching_worker): resumes sent to the
+# matching service per call (progress is saved after each), and seconds without a
+# heartbeat after which a running job is handed to another worker
+MATCHING_JOB_CHUNK_SIZE = int(os.getenv('MATCHING_JOB_CHUNK_SIZE', '10'))
+MATCHING_JOB_STALE_SECONDS = int(os.getenv('MATCHING_JOB_STALE_SECONDS', '900'))
+
+# Speculative interview questions (opt-in): while idle, the matching worker generates questions
+# for pending candidates the matcher recommends for interview with one of these priorities,
+# so shortlisting them is instant. Unused speculative questions expire after the TTL.
+SPECULATIVE_QUESTIONS_ENABLED = os.getenv('SPECULATIVE_QUESTIONS_ENABLED', 'False').lower() == 'true'
+SPECULATIVE_QUESTIONS_PRIORITIES = [p.strip().lower() for p in os.getenv('SPECULATIVE_QUESTIONS_PRIORITIES', 'High').split(',') if p.strip()]
+SPECULATIVE_QUESTIONS_BATCH_SIZE = int(os.getenv('SPECULATIVE_QUESTIONS_BATCH_SIZE', '20'))
+SPECULATIVE_QUESTIONS_TTL_HOURS = int(os.getenv('SPECULATIVE_QUESTIONS_TTL_HOURS', '72'))
+
+# Interview evaluation worker pool: a fixed number of threads per process claim queued
+# evaluations on a lease (python manage.py run_evaluation_worker, or in-process in the web
+# server, whose WSGI/ASGI entrypoint starts the pool when EVALUATION_IN_PROCESS_WORKERS is set;
+# management commands, tests and scripts never do). At most EVALUATION_MAX_IN_FLIGHT
+# evaluations run at once across all processes; failed attempts are retried with exponential
+# back-off up to EVALUATION_MAX_ATTEMPTS.
+EVALUATION_IN_PROCESS_WORKERS = os.getenv('EVALUATION_IN_PROCESS_WORKERS', 'True').lower() == 'true'
+EVALUATION_WORKERS = int(os.getenv('EVALUATION_WORKERS', '2'))
+EVALUATION_MAX_IN_FLIGHT = int(os.getenv('EVALUATION_MAX_IN_FLIGHT', '4'))
+EVALUATION_LEASE_SECONDS = int(os.getenv('EVALUATION_LEASE_SECONDS', '600'))
+# Timeout of one call to the evaluation agent (a long transcript takes several model calls);
+# kept below the lease so a slow call fails before another worker reclaims the evaluation
+EVALUATION_SERVICE_TIMEOUT = min(int(os.getenv('EVALUATION_SERVICE_TIMEOUT', '480')), EVALUATION_LEASE_SECONDS - 30)
+EVALUATION_MAX_ATTEMPTS = int(os.getenv('EVALUATION_MAX_ATTEMPTS', '4'))
+EVALUATION_RETRY_BACKOFF_SECONDS = int(os.getenv('EVALUATION_RETRY_BACKOFF_SECONDS', '60'))
+EVALUATION_POLL_INTERVAL = float(os.getenv('EVALUATION_POLL_INTERVAL', '5'))
+
+# Token budget of the resume digest sent to the matching, question and evaluation agents
+RESUME_DIGEST_TOKEN_BUDGET = int(os.getenv('RESUME_DIGEST_TOKEN_BUDGET', '700'))
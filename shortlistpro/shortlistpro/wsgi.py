@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'shortlistpro.settings')
 
 application = get_wsgi_application()
+
+# Web servers opt into running queued interview evaluations in-process
+if settings.EVALUATION_IN_PROCESS_WORKERS:
+    from home.evaluation_worker import enable_in_process_pool
+    enable_in_process_pool()